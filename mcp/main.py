@@ -1,35 +1,111 @@
 from fastmcp import FastMCP
 
+from utils.aio import to_async
+from utils.cache import apply_policy
+from utils.metrics import instrument
+from utils import tracing
+
 # FastMCP 인스턴스 생성
 mcp = FastMCP("k8s-aws-copilot")
 
+# 읽기 전용 도구 응답 캐시 정책: {도구 이름: (TTL 초, 응답이 의존하는 리소스)}
+# 로그 분석(incremental 커서 갱신), 인벤토리(자체 캐시), 감사 로그/추세 조회는 캐시하지 않음
+CACHE_POLICIES = {
+  "list_pods": (5, ("pods",)),
+  "describe_pod": (5, ("pods",)),
+  "list_deployments": (10, ("deployments", "pods")),
+  "describe_deployment": (10, ("deployments", "pods")),
+  "get_deployment_health": (10, ("deployments", "pods")),
+  "list_hpa": (15, ("hpa",)),
+  "list_statefulsets": (10, ("statefulsets",)),
+  "list_ec2_instances": (30, ("ec2",)),
+  "describe_ec2_instance": (30, ("ec2",)),
+  "get_cluster_metrics": (15, ("nodes", "metrics")),
+  "get_node_health": (15, ("nodes", "metrics")),
+  "get_pod_metrics": (15, ("pods", "metrics")),
+  "get_namespace_resource_summary": (15, ("pods", "metrics")),
+  "get_resource_events": (10, ("events",)),
+}
+
+# 변경 도구: 실행 후 해당 네임스페이스(인자의 namespace)의 관련 캐시 항목을 무효화
+CACHE_MUTATIONS = {
+  "create_pod": ("pods",),
+  "delete_pod": ("pods",),
+  "apply_yaml": ("pods", "deployments", "statefulsets", "hpa", "events"),
+  "create_deployment": ("deployments", "pods"),
+  "update_deployment": ("deployments", "pods"),
+  "delete_deployment": ("deployments", "pods"),
+  "create_canary_deployment": ("deployments", "pods"),
+  "start_progressive_canary": ("deployments", "pods"),
+  "abort_canary": ("deployments", "pods"),
+  "create_hpa": ("hpa",),
+  "create_statefulset": ("statefulsets", "pods"),
+  "start_ec2_instance": ("ec2",),
+  "stop_ec2_instance": ("ec2",),
+  "start_ec2_instances": ("ec2",),
+  "stop_ec2_instances": ("ec2",),
+}
+
+# 도구 등록: 동기 도구를 코루틴으로 감싸 스레드 풀에서 실행 (이벤트 루프 비차단)
+# cache=False: 승인 요청만 만드는 래퍼처럼 캐시 정책을 적용하지 않을 도구
+def register_tool(fn, cache: bool = True):
+  if cache:
+    fn = apply_policy(fn, CACHE_POLICIES, CACHE_MUTATIONS)
+  # 계측/추적은 가장 바깥에서: 지연에 스레드 풀 대기와 캐시 적중이 모두 반영됨
+  return mcp.tool()(instrument(tracing.trace_tool(to_async(fn))))
+
 # 승인/알림 워크플로우 import
-from workflows.slack_approval import (
-  send_approval_request_with_button,
-  send_action_log,
-  send_result_notification
-)
+from workflows.slack_approval import send_action_log
+from workflows.approval_store import approval_store
+from workflows.approval_batcher import approval_batcher
 import functools
 
+# 승인 후 실행할 작업: {함수 이름: 승인 워크플로우가 적용되기 전 함수}
+# 실제 변경은 승인 후에 일어나므로 캐시 무효화도 이 함수에 적용
+approval_actions = {}
+
 # 승인 워크플로우 데코레이터 (버튼 메시지용)
-def approval_required(action_name, impact_message, resource_type_getter, resource_name_getter, namespace_getter=lambda *a, **k: "default"):
+# prepare: 승인 요청 전에 인자를 확정하는 함수 (kwargs -> kwargs, 실패하면 예외로 요청하지 않음)
+def approval_required(action_name, impact_message, resource_type_getter, resource_name_getter, namespace_getter=lambda *a, **k: "default",
+                      prepare=None):
   def decorator(func):
+    approval_actions[func.__name__] = apply_policy(func, CACHE_POLICIES, CACHE_MUTATIONS)
+
     @functools.wraps(func)
     def wrapper(*args, **kwargs):
+      if prepare is not None:
+        try:
+          kwargs = prepare(**kwargs)
+        except Exception as e:
+          return {"status": "error", "message": str(e)}
       user = kwargs.get("user", "unknown")
       resource_type = resource_type_getter(*args, **kwargs)
       resource_name = resource_name_getter(*args, **kwargs)
       namespace = namespace_getter(*args, **kwargs)
-      send_approval_request_with_button(
-        user=user,
-        action=action_name,
-        impact=impact_message,
-        resource_type=resource_type,
-        resource_name=resource_name,
-        namespace=namespace
+      # 호출 인자를 저장해 두고 버튼에는 승인 id만 전달 (session_id는 묶음 키로만 쓰고 저장하지 않음)
+      session = kwargs.pop("session_id", None) or "default"
+      # 승인 후 콜백에서 실행되는 작업을 같은 trace로 잇기 위해 traceparent를 함께 저장
+      trace_context = tracing.traceparent()
+      approval_id = approval_store.create(
+        func.__name__, args=args, kwargs=kwargs, requester=user,
+        resource_type=resource_type, resource_name=resource_name,
+        namespace=namespace, action_name=action_name, trace_context=trace_context
       )
-      send_action_log(user, f"{action_name}({resource_name})", "대기(관리자 승인)")
-      return {"status": "waiting_for_approval", "message": "관리자 승인 대기 중"}
+      # 같은 요청자/세션의 요청은 짧은 시간 동안 모아 한 메시지로 전송
+      approval_batcher.submit(user, session, {
+        "approval_id": approval_id,
+        "action": action_name,
+        "impact": impact_message,
+        "resource_type": resource_type,
+        "resource_name": resource_name,
+        "namespace": namespace,
+        "trace_context": trace_context
+      })
+      send_action_log(user, f"{action_name}({resource_name})", "대기(관리자 승인)",
+                      resource_type=resource_type, resource_name=resource_name, namespace=namespace,
+                      approval_id=approval_id)
+      return {"status": "waiting_for_approval", "message": "관리자 승인 대기 중", "approval_id": approval_id,
+              "expires_in": approval_store.ttl}
     return wrapper
   return decorator
 
@@ -38,16 +114,16 @@ from tools.kubernetes.pods import (
   list_pods,
   describe_pod,
   create_pod,
-  apply_yaml,
   delete_pod as real_delete_pod,
 )
+from tools.kubernetes.manifests import apply_yaml
 for fn in [
   list_pods, 
   describe_pod, 
   create_pod, 
   apply_yaml
 ]:
-  mcp.tool()(fn)
+  register_tool(fn)
 
 # Kubernetes Deployments
 from tools.kubernetes.deployments import (
@@ -57,13 +133,15 @@ from tools.kubernetes.deployments import (
   update_deployment,
   delete_deployment as real_delete_deployment,
 )
+from tools.kubernetes.rollout import get_rollout_status
 for fn in [
   list_deployments,
   describe_deployment,
   create_deployment,
   update_deployment,
+  get_rollout_status,
 ]:
-  mcp.tool()(fn)
+  register_tool(fn)
 
 # Kubernetes Advanced
 from tools.kubernetes.advanced import (
@@ -84,13 +162,18 @@ for fn in [
   create_canary_deployment,
   create_pod_disruption_budget,
 ]:
-  mcp.tool()(fn)
+  register_tool(fn)
 
 from tools.aws.ec2 import (
   list_ec2_instances,
   describe_ec2_instance,
   start_ec2_instance,
   stop_ec2_instance as real_stop_ec2_instance,
+  start_ec2_instances,
+  stop_ec2_instances as real_stop_ec2_instances,
+  format_selector,
+  resolve_targets,
+  EC2_WAIT_TIMEOUT,
 )
 
 # 민감 작업 래핑 (승인 워크플로우 적용, 버튼 메시지)
@@ -101,12 +184,42 @@ from tools.aws.ec2 import (
   resource_name_getter=lambda *a, **k: k.get("instance_id", "unknown"),
   namespace_getter=lambda *a, **k: k.get("region", "default")
 )
-def stop_ec2_instance(*args, **kwargs):
-  result = real_stop_ec2_instance(*args, **kwargs)
-  user = kwargs.get("user", "unknown")
-  instance_id = kwargs.get("instance_id", "unknown")
-  send_action_log(user, f"EC2 인스턴스 중지({instance_id})", "실행됨")
-  send_result_notification(f"EC2 인스턴스 중지({instance_id})", "관리자")
+def stop_ec2_instance(instance_id: str, region: str = None, user: str = "unknown", session_id: str = "default"):
+  """
+  지정된 EC2 인스턴스를 중지합니다 (관리자 승인 필요).
+  user/session_id: 요청자와 세션 (같은 요청자/세션의 승인 요청은 한 메시지로 묶여 전송)
+  """
+  result = real_stop_ec2_instance(instance_id=instance_id, region=region)
+  send_action_log(user, f"EC2 인스턴스 중지({instance_id})", "실행됨", resource_type="ec2", resource_name=instance_id)
+  return result
+
+def _resolve_stop_targets(**kwargs):
+  # 태그 셀렉터는 승인 요청 전에 id 목록으로 확정: 관리자가 본 목록만 중지 (승인 후 새로 태그된 인스턴스 제외)
+  ids = resolve_targets(kwargs.pop("instance_ids", None), kwargs.pop("tags", None), kwargs.get("region"))
+  if not ids:
+    raise ValueError("대상 인스턴스가 없습니다 (instance_ids 또는 tags 지정)")
+  return {**kwargs, "instance_ids": ids}
+
+# 일괄 중지는 대상 전체를 하나의 승인 요청으로 처리
+@approval_required(
+  "EC2 인스턴스 일괄 중지",
+  "이 작업은 선택된 모든 EC2 인스턴스가 중지되어 서비스가 중단될 수 있습니다.",
+  resource_type_getter=lambda *a, **k: "ec2-batch",
+  resource_name_getter=lambda *a, **k: format_selector(k.get("instance_ids"), limit=10),
+  namespace_getter=lambda *a, **k: k.get("region") or "default",
+  prepare=_resolve_stop_targets
+)
+def stop_ec2_instances(instance_ids: list = None, tags: dict = None, region: str = None, wait: bool = False,
+                       timeout: float = EC2_WAIT_TIMEOUT, user: str = "unknown", session_id: str = "default"):
+  """
+  여러 EC2 인스턴스를 한 번에 중지합니다 (관리자 승인 필요).
+  instance_ids 목록 또는 tags 셀렉터({키: 값})로 대상을 지정하며, 태그는 승인 요청 시점의 인스턴스 id로 확정됩니다.
+  wait=True면 모든 인스턴스가 stopped가 되거나 timeout(초)까지 기다립니다.
+  user/session_id: 요청자와 세션 (같은 요청자/세션의 승인 요청은 한 메시지로 묶여 전송)
+  """
+  result = real_stop_ec2_instances(instance_ids=instance_ids, tags=tags, region=region, wait=wait, timeout=timeout)
+  selector = format_selector(instance_ids, tags, limit=10)
+  send_action_log(user, f"EC2 인스턴스 일괄 중지({selector})", "실행됨", resource_type="ec2-batch", resource_name=selector)
   return result
 
 @approval_required(
@@ -116,11 +229,14 @@ def stop_ec2_instance(*args, **kwargs):
   resource_name_getter=lambda *a, **k: k.get("pod_name", "unknown"),
   namespace_getter=lambda *a, **k: k.get("namespace", "default")
 )
-def delete_pod(namespace: str = "default", pod_name: str = "", **kwargs):
+def delete_pod(namespace: str = "default", pod_name: str = "", user: str = "unknown", session_id: str = "default"):
+  """
+  특정 네임스페이스의 지정된 파드를 삭제합니다 (관리자 승인 필요).
+  user/session_id: 요청자와 세션 (같은 요청자/세션의 승인 요청은 한 메시지로 묶여 전송)
+  """
   result = real_delete_pod(namespace=namespace, pod_name=pod_name)
-  user = kwargs.get("user", "unknown")
-  send_action_log(user, f"파드 삭제({pod_name})", "실행됨")
-  send_result_notification(f"파드 삭제({pod_name})", "관리자")
+  send_action_log(user, f"파드 삭제({pod_name})", "실행됨",
+                  resource_type="pod", resource_name=pod_name, namespace=namespace)
   return result
 
 @approval_required(
@@ -130,33 +246,43 @@ def delete_pod(namespace: str = "default", pod_name: str = "", **kwargs):
   resource_name_getter=lambda *a, **k: k.get("name", "unknown"),
   namespace_getter=lambda *a, **k: k.get("namespace", "default")
 )
-def delete_deployment(namespace: str = "default", name: str = "", **kwargs):
+def delete_deployment(namespace: str = "default", name: str = "", user: str = "unknown", session_id: str = "default"):
+  """
+  특정 네임스페이스의 지정된 Deployment를 삭제합니다 (관리자 승인 필요).
+  user/session_id: 요청자와 세션 (같은 요청자/세션의 승인 요청은 한 메시지로 묶여 전송)
+  """
   result = real_delete_deployment(namespace=namespace, name=name)
-  user = kwargs.get("user", "unknown")
-  send_action_log(user, f"디플로이먼트 삭제({name})", "실행됨")
-  send_result_notification(f"디플로이먼트 삭제({name})", "관리자")
+  send_action_log(user, f"디플로이먼트 삭제({name})", "실행됨",
+                  resource_type="deployment", resource_name=name, namespace=namespace)
   return result
 
 # 승인 워크플로우가 적용된 민감 작업만 별도로 등록
 for fn in [
   stop_ec2_instance,
+  stop_ec2_instances,
   delete_pod,
   delete_deployment,
 ]:
-  mcp.tool()(fn)
+  register_tool(fn, cache=False)
 
 # 나머지 EC2 툴 등록
 for fn in [
   list_ec2_instances, 
   describe_ec2_instance, 
   start_ec2_instance,
+  start_ec2_instances,
 ]:
-  mcp.tool()(fn)
+  register_tool(fn)
+
+# 멀티 리전 EC2 인벤토리 (TTL 캐시 스냅샷, describe_ec2_instance도 이 캐시를 사용)
+from tools.aws.inventory import get_ec2_inventory
+register_tool(get_ec2_inventory)
 
 # Kubernetes Monitoring
 from tools.kubernetes.monitoring import (
   get_cluster_metrics,
   get_pod_metrics,
+  get_namespace_resource_summary,
   get_node_health,
   get_deployment_health,
   get_pod_logs_analysis,
@@ -167,21 +293,103 @@ from tools.kubernetes.monitoring import (
 for fn in [
   get_cluster_metrics,
   get_pod_metrics,
+  get_namespace_resource_summary,
   get_node_health,
   get_deployment_health,
   get_pod_logs_analysis,
   get_resource_events,
 ]:
-  mcp.tool()(fn)
+  register_tool(fn)
+
+# 점진적 카나리 (단계별 관찰 후 자동 승격/롤백, 백그라운드 컨트롤러)
+from tools.kubernetes.canary import (
+  start_progressive_canary,
+  get_canary_status,
+  abort_canary,
+)
+for fn in [
+  start_progressive_canary,
+  get_canary_status,
+  abort_canary,
+]:
+  register_tool(fn)
+
+# 메트릭 추세 (링 버퍼 샘플러, METRICS_SAMPLER=true 면 시작 시 수집 시작)
+from tools.kubernetes.metrics_history import (
+  METRICS_SAMPLER_ENABLED,
+  sampler as metrics_sampler,
+  get_metrics_trend,
+)
+register_tool(get_metrics_trend)
+if METRICS_SAMPLER_ENABLED:
+  metrics_sampler.start()
+
+# 인포머 캐시 시작 (K8S_INFORMERS=true 일 때만 LIST 대신 메모리 캐시 사용)
+from tools.kubernetes.informers import INFORMERS_ENABLED, start_informers
+if INFORMERS_ENABLED:
+  start_informers()
+
+# 감사 로그 조회 (sqlite 색인 저장소, AUDIT_DB)
+from utils.audit_store import query_audit_log
+register_tool(query_audit_log)
+
+# 업스트림 계측과 stats 수집기 (METRICS=false면 모두 생략)
+from utils import metrics
+if metrics.METRICS_ENABLED:
+  from tools.kubernetes.helpers import registry as k8s_registry, pool_stats
+  from tools.kubernetes.informers import informer_stats
+  from tools.kubernetes.manifests import mapper as k8s_mapper
+  from tools.aws.clients import cache as aws_clients, client_stats
+  from utils.cache import response_cache
+  from utils.logger import audit
+  from workflows.slack_delivery import delivery_stats
+  k8s_registry.add_build_hook(metrics.instrument_kubernetes)
+  for event, handler in metrics.AWS_EVENT_HANDLERS:
+    aws_clients.register_event(event, handler)
+  for name, collector in [
+    ("k8s_client", pool_stats),
+    ("k8s_informers", informer_stats),
+    ("k8s_discovery", k8s_mapper.stats),
+    ("aws_client", client_stats),
+    ("response_cache", response_cache.stats),
+    ("audit", audit.stats),
+    ("slack_delivery", delivery_stats),
+    ("approval_batcher", lambda: {"batches": approval_batcher.batches, "singles": approval_batcher.singles}),
+  ]:
+    metrics.register_collector(name, collector)
+
+# 추적 (TRACING=file|otlp일 때만, 꺼져 있으면 어떤 것도 감싸지 않음)
+if tracing.TRACING_ENABLED:
+  from tools.kubernetes.helpers import registry as k8s_registry
+  from tools.aws.clients import cache as aws_clients
+  tracing.trace_kubeconfig_load(k8s_registry)
+  k8s_registry.add_build_hook(tracing.instrument_kubernetes)
+  for event, handler in tracing.AWS_EVENT_HANDLERS:
+    aws_clients.register_event(event, handler)
+  if metrics.METRICS_ENABLED:
+    metrics.register_collector("tracing", tracing.stats)
 
 # FastMCP SSE 앱 생성
 app = mcp.sse_app()
 
+# Slack 승인 콜백은 별도 포트의 앱으로 분리 (MCP 클라이언트가 받은 approval_id로 스스로 승인하지 못하도록)
+# 같은 프로세스에서 실행되므로 승인된 작업도 도구 스레드 풀과 클라이언트 풀을 공유
+from workflows.slack_server import SLACK_CALLBACK_PORT, approval_app
+callback_app = approval_app(approval_actions)
+
+# Prometheus 스크레이프 엔드포인트 (GET /metrics)
+metrics.mount_metrics_route(app)
+
 if __name__ == "__main__":
+  import asyncio
   import uvicorn
-  uvicorn.run(
-    "main:app",
-    host="0.0.0.0",
-    port=8080,
-    log_level="info",
-  )
\ No newline at end of file
+
+  async def serve():
+    # MCP SSE(8080)와 Slack 콜백(SLACK_CALLBACK_PORT)을 한 이벤트 루프의 두 리스너로 실행
+    servers = [
+      uvicorn.Server(uvicorn.Config(app, host="0.0.0.0", port=8080, log_level="info")),
+      uvicorn.Server(uvicorn.Config(callback_app, host="0.0.0.0", port=SLACK_CALLBACK_PORT, log_level="info")),
+    ]
+    await asyncio.gather(*(server.serve() for server in servers))
+
+  asyncio.run(serve())
\ No newline at end of file
@@ -0,0 +1,113 @@
+# tools/aws/clients.py
+"""
+프로세스 전역 boto3 클라이언트 캐시.
+
+boto3.client()는 호출마다 자격 증명 탐색과 엔드포인트 설정을 반복하므로,
+(서비스, 리전, 프로파일)별로 클라이언트를 한 번만 만들고 재사용합니다.
+boto3 클라이언트는 스레드 안전하지만 기본 Session 생성은 그렇지 않으므로
+프로파일별 Session을 잠금 안에서 만들고, 클라이언트 생성도 잠금으로 직렬화합니다.
+"""
+import os
+import threading
+
+import boto3
+from botocore.config import Config
+
+# urllib3 커넥션 풀 크기 (동시 툴 호출 수에 맞춰 조정)
+AWS_POOL_MAXSIZE = int(os.getenv("AWS_POOL_MAXSIZE", "32"))
+AWS_MAX_ATTEMPTS = int(os.getenv("AWS_MAX_ATTEMPTS", "8"))
+AWS_CONNECT_TIMEOUT = float(os.getenv("AWS_CONNECT_TIMEOUT", "5"))
+AWS_READ_TIMEOUT = float(os.getenv("AWS_READ_TIMEOUT", "30"))
+
+
+def _client_config() -> Config:
+    """
+    커넥션 풀과 adaptive 재시도(클라이언트 측 레이트 리미팅 포함)를 설정합니다.
+    """
+    return Config(
+        max_pool_connections=AWS_POOL_MAXSIZE,
+        retries={"mode": "adaptive", "max_attempts": AWS_MAX_ATTEMPTS},
+        connect_timeout=AWS_CONNECT_TIMEOUT,
+        read_timeout=AWS_READ_TIMEOUT,
+        tcp_keepalive=True,
+    )
+
+
+class ClientCache:
+    """
+    (서비스, 리전, 프로파일) -> boto3 클라이언트 캐시.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._sessions = {}
+        self._clients = {}
+        self._config = _client_config()
+        self._event_handlers = []
+        self.hits = 0
+        self.misses = 0
+
+    def _session(self, profile: str):
+        session = self._sessions.get(profile)
+        if session is None:
+            session = boto3.session.Session(profile_name=profile) if profile else boto3.session.Session()
+            for event, handler in self._event_handlers:
+                session.events.register(event, handler)
+            self._sessions[profile] = session
+        return session
+
+    def client(self, service: str, region: str = None, profile: str = None):
+        key = (service, region, profile)
+        cached = self._clients.get(key)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        with self._lock:
+            cached = self._clients.get(key)
+            if cached is None:
+                self.misses += 1
+                cached = self._session(profile).client(service, region_name=region, config=self._config)
+                self._clients[key] = cached
+            return cached
+
+    def register_event(self, event: str, handler):
+        """
+        모든 세션/클라이언트에 botocore 이벤트 핸들러를 등록합니다 (계측 등).
+        """
+        with self._lock:
+            self._event_handlers.append((event, handler))
+            for session in self._sessions.values():
+                session.events.register(event, handler)
+            for cached in self._clients.values():
+                cached.meta.events.register(event, handler)
+
+    def clear(self):
+        """
+        자격 증명 교체 등으로 클라이언트를 다시 만들어야 할 때 캐시를 비웁니다.
+        """
+        with self._lock:
+            self._clients = {}
+            self._sessions = {}
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "clients": len(self._clients),
+                "pool_maxsize": AWS_POOL_MAXSIZE,
+            }
+
+
+cache = ClientCache()
+
+
+def ec2_client(region: str = None, profile: str = None):
+    return cache.client("ec2", region, profile)
+
+
+def client_stats() -> dict:
+    """
+    클라이언트 캐시의 재사용(hit)/생성(miss) 카운터를 반환합니다.
+    """
+    return cache.stats()
@@ -1,37 +1,131 @@
 # tools/aws/ec2.py
-import boto3
+import os
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 
-def list_ec2_instances(region: str = None) -> dict:
+from .clients import ec2_client
+from .inventory import inventory
+
+# Start/StopInstances 한 번에 보낼 InstanceIds 수
+EC2_BULK_CHUNK_SIZE = int(os.getenv("EC2_BULK_CHUNK_SIZE", "1000"))
+EC2_BULK_WORKERS = int(os.getenv("EC2_BULK_WORKERS", "8"))
+EC2_WAIT_TIMEOUT = float(os.getenv("EC2_WAIT_TIMEOUT", "300"))
+EC2_POLL_MAX_INTERVAL = float(os.getenv("EC2_POLL_MAX_INTERVAL", "15"))
+# 상태 폴링은 instance-id 필터로 조회 (없는 id가 섞여도 호출 전체가 실패하지 않음), 필터 값 상한
+_FILTER_VALUES_MAX = 200
+
+# 청크 전체를 거부하면서 원인 id를 메시지에 담아 주는 오류: 해당 id만 빼고 나머지를 다시 보냄
+_REJECTED_ID_CODES = ("InvalidInstanceID.NotFound", "InvalidInstanceID.Malformed", "IncorrectInstanceState")
+_INSTANCE_ID = re.compile(r"i-[0-9a-zA-Z]+")
+
+# describe_instances MaxResults 허용 범위
+_MIN_PAGE_SIZE = 5
+_MAX_PAGE_SIZE = 1000
+
+
+def _name_tag(inst: dict) -> str:
+    return next((t["Value"] for t in inst.get("Tags", []) if t["Key"]=="Name"), "Unnamed")
+
+
+def _summary(inst: dict) -> dict:
+    return {
+        "instance_id": inst["InstanceId"],
+        "name": _name_tag(inst),
+        "state": inst["State"]["Name"],
+        "instance_type": inst.get("InstanceType", ""),
+        "private_ip": inst.get("PrivateIpAddress", ""),
+        "public_ip": inst.get("PublicIpAddress", "")
+    }
+
+
+def build_filters(state=None, tags: dict = None, instance_type=None, filters: list = None) -> list:
+    """
+    상태/태그/인스턴스 타입 조건을 describe_instances의 서버 측 Filters로 변환합니다.
+    state, instance_type은 문자열 또는 목록, tags는 {키: 값 또는 값 목록}.
+    """
+    def values(v):
+        return [v] if isinstance(v, str) else list(v)
+
+    result = list(filters or [])
+    if state:
+        result.append({"Name": "instance-state-name", "Values": values(state)})
+    if instance_type:
+        result.append({"Name": "instance-type", "Values": values(instance_type)})
+    for key, value in (tags or {}).items():
+        if value in (None, "", "*"):
+            result.append({"Name": "tag-key", "Values": [key]})
+        else:
+            result.append({"Name": f"tag:{key}", "Values": values(value)})
+    return result
+
+
+def iter_instances(region: str = None, filters: list = None, profile: str = None,
+                   page_size: int = _MAX_PAGE_SIZE):
+    """
+    paginator로 페이지를 따라가며 원본 인스턴스 dict를 하나씩 yield합니다.
+    전체 목록을 메모리에 모으지 않고 처리할 때 사용합니다.
+    """
+    paginator = ec2_client(region, profile).get_paginator("describe_instances")
+    pages = paginator.paginate(Filters=filters or [], PaginationConfig={"PageSize": page_size})
+    for page in pages:
+        for res in page.get("Reservations", []):
+            yield from res.get("Instances", [])
+
+
+def iter_ec2_instances(region: str = None, state=None, tags: dict = None, instance_type=None,
+                       filters: list = None, profile: str = None):
+    """
+    조건에 맞는 인스턴스 요약을 스트리밍(generator)으로 반환합니다.
+    """
+    for inst in iter_instances(region, build_filters(state, tags, instance_type, filters), profile):
+        yield _summary(inst)
+
+
+def list_ec2_instances(region: str = None, state=None, tags: dict = None, instance_type=None,
+                       filters: list = None, page_size: int = None, next_token: str = None,
+                       profile: str = None) -> dict:
     """
     지정된(region) 또는 기본 리전의 EC2 인스턴스 목록과 상태를 조회합니다.
+    state/tags/instance_type/filters는 서버 측 Filters로 전달되며,
+    page_size를 지정하면 한 페이지만 반환하고 다음 호출에 쓸 next_token을 함께 돌려줍니다.
     """
     try:
-        ec2 = boto3.client("ec2", region_name=region) if region else boto3.client("ec2")
-        data = []
-        for res in ec2.describe_instances().get("Reservations", []):
-            for inst in res.get("Instances", []):
-                name = next((t["Value"] for t in inst.get("Tags", []) if t["Key"]=="Name"), "Unnamed")
-                data.append({
-                    "instance_id": inst["InstanceId"],
-                    "name": name,
-                    "state": inst["State"]["Name"],
-                    "instance_type": inst.get("InstanceType", ""),
-                    "private_ip": inst.get("PrivateIpAddress", ""),
-                    "public_ip": inst.get("PublicIpAddress", "")
-                })
+        query = build_filters(state, tags, instance_type, filters)
+        if page_size or next_token:
+            params = {"Filters": query, "MaxResults": min(max(page_size or _MAX_PAGE_SIZE, _MIN_PAGE_SIZE), _MAX_PAGE_SIZE)}
+            if next_token:
+                params["NextToken"] = next_token
+            resp = ec2_client(region, profile).describe_instances(**params)
+            data = [_summary(inst) for res in resp.get("Reservations", []) for inst in res.get("Instances", [])]
+            return {"status": "success", "instances": data, "next_token": resp.get("NextToken")}
+        data = [_summary(inst) for inst in iter_instances(region, query, profile)]
         return {"status": "success", "instances": data}
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-def describe_ec2_instance(instance_id: str, region: str = None) -> dict:
+def describe_ec2_instance(instance_id: str, region: str = None, profile: str = None,
+                          force_refresh: bool = False) -> dict:
     """
     특정 인스턴스(instance_id)의 상세 정보를 반환합니다.
+    인벤토리 스냅샷이 유효하면 API 호출 없이 답하고, force_refresh=True면 직접 조회합니다.
     """
     try:
-        ec2 = boto3.client("ec2", region_name=region) if region else boto3.client("ec2")
+        snapshot = None if (force_refresh or profile) else inventory.fresh()
+        rec = snapshot.by_id.get(instance_id) if snapshot else None
+        if rec and (not region or rec["region"] == region):
+            return {
+                "status": "success",
+                "details": {k: rec[k] for k in (
+                    "instance_id", "name", "state", "launch_time", "instance_type",
+                    "private_ip", "public_ip", "region", "vpc_id"
+                )},
+                "cached_age_seconds": round(snapshot.age, 1)
+            }
+        ec2 = ec2_client(region, profile)
         resp = ec2.describe_instances(InstanceIds=[instance_id])
         inst = resp["Reservations"][0]["Instances"][0]
-        name = next((t["Value"] for t in inst.get("Tags", []) if t["Key"]=="Name"), "Unnamed")
+        name = _name_tag(inst)
         return {
             "status": "success",
             "details": {
@@ -47,13 +141,14 @@ def describe_ec2_instance(instance_id: str, region: str = None) -> dict:
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-def start_ec2_instance(instance_id: str, region: str = None) -> dict:
+def start_ec2_instance(instance_id: str, region: str = None, profile: str = None) -> dict:
     """
     지정된 인스턴스를 시작(start)합니다.
     """
     try:
-        ec2 = boto3.client("ec2", region_name=region) if region else boto3.client("ec2")
+        ec2 = ec2_client(region, profile)
         resp = ec2.start_instances(InstanceIds=[instance_id])
+        inventory.invalidate()
         st = resp["StartingInstances"][0]
         return {
             "status": "success",
@@ -63,13 +158,14 @@ def start_ec2_instance(instance_id: str, region: str = None) -> dict:
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-def stop_ec2_instance(instance_id: str, region: str = None) -> dict:
+def stop_ec2_instance(instance_id: str, region: str = None, profile: str = None) -> dict:
     """
     지정된 인스턴스를 중지(stop)합니다.
     """
     try:
-        ec2 = boto3.client("ec2", region_name=region) if region else boto3.client("ec2")
+        ec2 = ec2_client(region, profile)
         resp = ec2.stop_instances(InstanceIds=[instance_id])
+        inventory.invalidate()
         st = resp["StoppingInstances"][0]
         return {
             "status": "success",
@@ -78,3 +174,182 @@ def stop_ec2_instance(instance_id: str, region: str = None) -> dict:
         }
     except Exception as e:
         return {"status": "error", "message": str(e)}
+
+
+def _chunks(items: list, size: int):
+    for i in range(0, len(items), size):
+        yield items[i:i + size]
+
+
+def resolve_targets(instance_ids: list = None, tags: dict = None, region: str = None, profile: str = None) -> list:
+    """
+    id 목록과 태그 셀렉터를 합쳐 중복 없는 대상 id 목록을 만듭니다 (종료된 인스턴스 제외).
+    승인 워크플로우는 승인 요청 전에 이 목록을 확정해, 승인 후 태그가 바뀌어도 대상이 달라지지 않게 합니다.
+    """
+    ids = list(instance_ids or [])
+    if tags:
+        query = build_filters(tags=tags, filters=[{
+            "Name": "instance-state-name",
+            "Values": ["pending", "running", "stopping", "stopped"]
+        }])
+        ids.extend(inst["InstanceId"] for inst in iter_instances(region, query, profile))
+    return list(dict.fromkeys(ids))
+
+
+def _rejected_ids(error: Exception, chunk: list) -> list:
+    """
+    Start/StopInstances 오류(botocore ClientError)가 지목한 청크 안의 id 목록. 다른 오류면 빈 목록.
+    """
+    info = (getattr(error, "response", None) or {}).get("Error") or {}
+    if info.get("Code") not in _REJECTED_ID_CODES:
+        return []
+    named = set(_INSTANCE_ID.findall(info.get("Message") or ""))
+    return [i for i in chunk if i in named]
+
+
+def _poll_states(ec2, ids: list, pool) -> dict:
+    def describe(chunk):
+        found = {}
+        pages = ec2.get_paginator("describe_instances").paginate(
+            Filters=[{"Name": "instance-id", "Values": chunk}])
+        for page in pages:
+            for res in page.get("Reservations", []):
+                for inst in res.get("Instances", []):
+                    found[inst["InstanceId"]] = inst["State"]["Name"]
+        return found
+
+    states = {}
+    for found in pool.map(describe, list(_chunks(ids, _FILTER_VALUES_MAX))):
+        states.update(found)
+    return states
+
+
+def _wait_for_state(ec2, results: dict, target: str, timeout: float, pool):
+    """
+    대상 상태에 도달하지 않은 인스턴스만 지수 백오프(1초부터 EC2_POLL_MAX_INTERVAL까지)로 재조회합니다.
+    """
+    pending = [i for i, r in results.items() if "error" not in r and r["current_state"] != target]
+    deadline = time.monotonic() + timeout
+    delay = 1.0
+    while pending and time.monotonic() < deadline:
+        time.sleep(min(delay, max(0.0, deadline - time.monotonic())))
+        delay = min(delay * 2, EC2_POLL_MAX_INTERVAL)
+        states = _poll_states(ec2, pending, pool)
+        for instance_id in pending:
+            if instance_id in states:
+                results[instance_id]["current_state"] = states[instance_id]
+        # terminated는 더 기다려도 대상 상태가 될 수 없음
+        pending = [i for i in pending if results[i]["current_state"] not in (target, "terminated")]
+    for instance_id, r in results.items():
+        if "error" not in r:
+            r["reached_target"] = r["current_state"] == target
+    return pending
+
+
+def _bulk_state_change(action: str, target: str, instance_ids: list, tags: dict, region: str,
+                       wait: bool, timeout: float, profile: str) -> dict:
+    ec2 = ec2_client(region, profile)
+    ids = resolve_targets(instance_ids, tags, region, profile)
+    if not ids:
+        return {"status": "error", "message": "대상 인스턴스가 없습니다 (instance_ids 또는 tags 지정)"}
+
+    call = ec2.start_instances if action == "start" else ec2.stop_instances
+    result_key = "StartingInstances" if action == "start" else "StoppingInstances"
+
+    def submit(chunk):
+        # 없는/종료된 id 하나가 청크 전체를 거부시키므로, 오류가 지목한 id만 실패로 빼고 나머지를 다시 보냄
+        rejected, calls = {}, 0
+        while chunk:
+            calls += 1
+            try:
+                return chunk, call(InstanceIds=chunk).get(result_key, []), None, rejected, calls
+            except Exception as e:
+                bad = _rejected_ids(e, chunk)
+                if not bad:
+                    return chunk, None, str(e), rejected, calls
+                rejected.update((i, str(e)) for i in bad)
+                chunk = [i for i in chunk if i not in rejected]
+        return chunk, [], None, rejected, calls
+
+    results = {}
+    started = time.monotonic()
+    chunks = list(_chunks(ids, EC2_BULK_CHUNK_SIZE))
+    # 제출(EC2_BULK_CHUNK_SIZE)과 폴링(_FILTER_VALUES_MAX) 청크가 같은 풀을 공유
+    workers = max(1, min(EC2_BULK_WORKERS, -(-len(ids) // _FILTER_VALUES_MAX)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ec2-bulk") as pool:
+        submitted = list(pool.map(submit, chunks))
+        # 일부 청크만 성공했어도 상태가 바뀌었으므로 인벤토리 스냅샷을 버림
+        inventory.invalidate()
+        api_calls = 0
+        for chunk, changes, error, rejected, calls in submitted:
+            api_calls += calls
+            for instance_id, message in rejected.items():
+                results[instance_id] = {"error": message}
+            if error:
+                for instance_id in chunk:
+                    results[instance_id] = {"error": error}
+                continue
+            for st in changes:
+                results[st["InstanceId"]] = {
+                    "previous_state": st["PreviousState"]["Name"],
+                    "current_state": st["CurrentState"]["Name"]
+                }
+        timed_out = []
+        if wait:
+            timed_out = _wait_for_state(ec2, results, target, timeout, pool)
+            # 대기 중에 다른 조회가 중간 상태(stopping 등)로 스냅샷을 다시 만들었을 수 있음
+            inventory.invalidate()
+
+    failed = [i for i, r in results.items() if "error" in r or (wait and not r["reached_target"])]
+    if not failed:
+        status = "success"
+    else:
+        status = "partial" if len(failed) < len(results) else "error"
+    return {
+        "status": status,
+        "target_state": target,
+        "requested": len(ids),
+        "api_calls": api_calls,
+        "elapsed_seconds": round(time.monotonic() - started, 1),
+        "timed_out": timed_out,
+        "instances": results
+    }
+
+
+def start_ec2_instances(instance_ids: list = None, tags: dict = None, region: str = None,
+                        wait: bool = True, timeout: float = EC2_WAIT_TIMEOUT,
+                        profile: str = None) -> dict:
+    """
+    여러 인스턴스를 한 번에 시작합니다. instance_ids 목록 또는 tags 셀렉터({키: 값})로 대상을 지정합니다.
+    wait=True면 모든 인스턴스가 running이 되거나 timeout(초)까지 기다린 뒤 인스턴스별 결과를 반환합니다.
+    """
+    try:
+        return _bulk_state_change("start", "running", instance_ids, tags, region, wait, timeout, profile)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def stop_ec2_instances(instance_ids: list = None, tags: dict = None, region: str = None,
+                       wait: bool = True, timeout: float = EC2_WAIT_TIMEOUT,
+                       profile: str = None) -> dict:
+    """
+    여러 인스턴스를 한 번에 중지합니다. instance_ids 목록 또는 tags 셀렉터({키: 값})로 대상을 지정합니다.
+    wait=True면 모든 인스턴스가 stopped가 되거나 timeout(초)까지 기다린 뒤 인스턴스별 결과를 반환합니다.
+    """
+    try:
+        return _bulk_state_change("stop", "stopped", instance_ids, tags, region, wait, timeout, profile)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def format_selector(instance_ids: list = None, tags: dict = None, limit: int = None) -> str:
+    """
+    승인 요청에 실을 대상 표기: "i-1,i-2,tag:team=web"
+    limit을 지정하면 앞의 limit개만 보이고 나머지는 "외 N개"로 줄입니다 (Slack 메시지 길이 제한).
+    """
+    parts = list(instance_ids or [])
+    parts.extend(f"tag:{k}={v}" for k, v in (tags or {}).items())
+    if limit and len(parts) > limit:
+        return ",".join(parts[:limit]) + f" 외 {len(parts) - limit}개 (총 {len(parts)}개)"
+    return ",".join(parts)
+
@@ -0,0 +1,224 @@
+# tools/aws/inventory.py
+"""
+여러 리전의 EC2 인스턴스를 병렬로 조회해 하나의 색인된 스냅샷으로 합치는 인벤토리.
+
+스냅샷은 AWS_INVENTORY_TTL초 동안 캐시되며 id, Name 태그, 상태, VPC, 사설 IP로
+바로 찾을 수 있도록 색인을 함께 만듭니다. 갱신은 한 번에 하나만 수행되어
+동시에 들어온 요청이 같은 describe_instances 호출을 반복하지 않습니다.
+인스턴스 시작/중지 도구는 호출 후 invalidate()로 스냅샷을 버려, 다음 조회가 바뀐 상태를 보게 합니다.
+대상 리전은 AWS_INVENTORY_REGIONS(쉼표 구분)로 지정하며, 없으면 describe_regions로 찾습니다.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .clients import ec2_client
+
+AWS_INVENTORY_REGIONS = [r.strip() for r in os.getenv("AWS_INVENTORY_REGIONS", "").split(",") if r.strip()]
+AWS_INVENTORY_TTL = float(os.getenv("AWS_INVENTORY_TTL", "60"))
+AWS_INVENTORY_WORKERS = int(os.getenv("AWS_INVENTORY_WORKERS", "8"))
+
+
+def _record(inst: dict, region: str) -> dict:
+    tags = {t["Key"]: t["Value"] for t in inst.get("Tags", [])}
+    launch_time = inst.get("LaunchTime")
+    return {
+        "instance_id": inst["InstanceId"],
+        "name": tags.get("Name", "Unnamed"),
+        "state": inst["State"]["Name"],
+        "instance_type": inst.get("InstanceType", ""),
+        "private_ip": inst.get("PrivateIpAddress", ""),
+        "public_ip": inst.get("PublicIpAddress", ""),
+        "region": region,
+        "vpc_id": inst.get("VpcId", ""),
+        "subnet_id": inst.get("SubnetId", ""),
+        "launch_time": launch_time.isoformat() if launch_time else None,
+        "tags": tags,
+    }
+
+
+class Snapshot:
+    """
+    한 시점의 인스턴스 목록과 색인. 생성 후에는 변경하지 않습니다.
+    """
+
+    def __init__(self, records: list, regions: list, errors: dict, timings: dict):
+        self.records = records
+        self.regions = regions
+        self.errors = errors
+        self.timings = timings
+        self.taken_at = time.time()
+        self.by_id = {}
+        self.by_name = {}
+        self.by_state = {}
+        self.by_vpc = {}
+        self.by_private_ip = {}
+        for rec in records:
+            self.by_id[rec["instance_id"]] = rec
+            self.by_name.setdefault(rec["name"], []).append(rec)
+            self.by_state.setdefault(rec["state"], []).append(rec)
+            if rec["vpc_id"]:
+                self.by_vpc.setdefault(rec["vpc_id"], []).append(rec)
+            if rec["private_ip"]:
+                # 사설 IP는 VPC/리전 간에 겹칠 수 있음
+                self.by_private_ip.setdefault(rec["private_ip"], []).append(rec)
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.taken_at
+
+    def find(self, name: str = None, state: str = None, vpc_id: str = None,
+             private_ip: str = None, region: str = None) -> list:
+        """
+        가장 좁은 색인에서 시작해 나머지 조건으로 거릅니다.
+        """
+        if private_ip:
+            candidates = self.by_private_ip.get(private_ip, [])
+        elif name:
+            candidates = self.by_name.get(name, [])
+        elif vpc_id:
+            candidates = self.by_vpc.get(vpc_id, [])
+        elif state:
+            candidates = self.by_state.get(state, [])
+        else:
+            candidates = self.records
+        return [
+            rec for rec in candidates
+            if (not name or rec["name"] == name)
+            and (not state or rec["state"] == state)
+            and (not vpc_id or rec["vpc_id"] == vpc_id)
+            and (not private_ip or rec["private_ip"] == private_ip)
+            and (not region or rec["region"] == region)
+        ]
+
+    def stats(self) -> dict:
+        return {
+            "instances": len(self.records),
+            "regions": self.regions,
+            "age_seconds": round(self.age, 1),
+            "timings_ms": self.timings,
+            "errors": self.errors,
+        }
+
+
+class Inventory:
+    """
+    TTL 캐시된 멀티 리전 스냅샷.
+    """
+
+    def __init__(self, regions: list = None, ttl: float = AWS_INVENTORY_TTL,
+                 max_workers: int = AWS_INVENTORY_WORKERS):
+        self._regions = regions or []
+        self.ttl = ttl
+        self._max_workers = max_workers
+        self._snapshot = None
+        self._refresh_lock = threading.Lock()
+        # invalidate()마다 증가: 무효화 전에 시작한 갱신 결과는 저장하지 않음
+        self._generation = 0
+        self.refreshes = 0
+        self.invalidations = 0
+
+    def regions(self, profile: str = None) -> list:
+        if self._regions:
+            return list(self._regions)
+        resp = ec2_client(None, profile).describe_regions()
+        self._regions = sorted(r["RegionName"] for r in resp.get("Regions", []))
+        return list(self._regions)
+
+    def _collect(self, region: str, profile: str):
+        started = time.perf_counter()
+        paginator = ec2_client(region, profile).get_paginator("describe_instances")
+        records = [
+            _record(inst, region)
+            for page in paginator.paginate(PaginationConfig={"PageSize": 1000})
+            for res in page.get("Reservations", [])
+            for inst in res.get("Instances", [])
+        ]
+        return records, round((time.perf_counter() - started) * 1000, 1)
+
+    def refresh(self, regions: list = None, profile: str = None) -> Snapshot:
+        regions = regions or self.regions(profile)
+        records, errors, timings = [], {}, {}
+
+        def run(region):
+            try:
+                return region, self._collect(region, profile), None
+            except Exception as e:
+                return region, None, str(e)
+
+        workers = max(1, min(self._max_workers, len(regions)))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ec2-inventory") as pool:
+            for region, collected, error in pool.map(run, regions):
+                if error:
+                    errors[region] = error
+                    continue
+                region_records, ms = collected
+                records.extend(region_records)
+                timings[region] = ms
+        self.refreshes += 1
+        return Snapshot(records, regions, errors, timings)
+
+    def invalidate(self):
+        """
+        인스턴스 상태를 바꾼 뒤 호출합니다. 다음 조회는 API를 직접 호출하거나 스냅샷을 새로 만듭니다.
+        """
+        self._generation += 1
+        self._snapshot = None
+        self.invalidations += 1
+
+    def fresh(self, max_age: float = None):
+        """
+        max_age(기본 TTL) 이내의 스냅샷이 있으면 반환, 없으면 None.
+        """
+        snapshot = self._snapshot
+        max_age = self.ttl if max_age is None else max_age
+        if snapshot is not None and snapshot.age <= max_age:
+            return snapshot
+        return None
+
+    def get(self, force_refresh: bool = False, regions: list = None, profile: str = None) -> Snapshot:
+        """
+        캐시된 스냅샷을 반환하고, 만료됐거나 force_refresh면 갱신합니다.
+        regions/profile을 지정한 조회는 기본 스냅샷을 덮어쓰지 않습니다.
+        """
+        if regions or profile:
+            return self.refresh(regions, profile)
+        if not force_refresh:
+            snapshot = self.fresh()
+            if snapshot is not None:
+                return snapshot
+        requested_at = time.time()
+        with self._refresh_lock:
+            # 잠금을 기다리는 동안 다른 요청이 갱신했으면 그 결과를 사용
+            snapshot = self._snapshot
+            if snapshot is not None and snapshot.taken_at >= requested_at:
+                return snapshot
+            if not force_refresh and self.fresh() is not None:
+                return self._snapshot
+            generation = self._generation
+            snapshot = self.refresh()
+            if generation == self._generation:
+                self._snapshot = snapshot
+            return snapshot
+
+
+inventory = Inventory(AWS_INVENTORY_REGIONS)
+
+
+def get_ec2_inventory(regions: list = None, name: str = None, state: str = None,
+                      vpc_id: str = None, private_ip: str = None, region: str = None,
+                      force_refresh: bool = False, profile: str = None) -> dict:
+    """
+    여러 리전의 EC2 인스턴스를 병렬 조회한 스냅샷에서 인스턴스를 찾습니다.
+    name(Name 태그)/state/vpc_id/private_ip/region으로 거를 수 있으며,
+    캐시(AWS_INVENTORY_TTL초)를 무시하려면 force_refresh=True를 지정합니다.
+    """
+    try:
+        snapshot = inventory.get(force_refresh, regions, profile)
+        instances = snapshot.find(name=name, state=state, vpc_id=vpc_id,
+                                  private_ip=private_ip, region=region)
+        status = "partial" if snapshot.errors else "success"
+        return {"status": status, "instances": instances, "inventory": snapshot.stats()}
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
@@ -1,29 +1,37 @@
 # tools/kubernetes/advanced.py
 
 from kubernetes import client
-from .helpers import load_kube_config
+from .helpers import apps_v1, autoscaling_v2, batch_v1, policy_v1
+from .listing import HPA_FIELDS, STATEFULSET_FIELDS, list_page, project
+from .fanout import cluster_scoped, fan_out, paged_by_namespace
+from .rollout import FAILED, NOT_FOUND, ROLLOUT_WAIT_TIMEOUT, TIMEOUT, wait_for_rollout
+from concurrent.futures import ThreadPoolExecutor
 
-def list_hpa(namespace: str = "default") -> dict:
+def list_hpa(namespace: str = "default", label_selector: str = None, field_selector: str = None,
+             limit: int = None, continue_token: str = None,
+             namespaces: list = None, all_namespaces: bool = False) -> dict:
     """
     지정된 네임스페이스의 HorizontalPodAutoscaler 목록을 조회합니다.
+    limit/continue_token으로 페이지 단위 조회, label_selector/field_selector로 서버 측 필터링을 지원합니다.
+    all_namespaces=True면 클러스터 범위 LIST(페이지 단위)로, namespaces=[...]면 병렬로 조회해 병합합니다.
     """
-    load_kube_config()
-    api = client.AutoscalingV2Api()
-    hpas = api.list_namespaced_horizontal_pod_autoscaler(namespace)
-    return {
+    if namespaces:
+        return fan_out(list_hpa, namespaces, label_selector=label_selector, field_selector=field_selector)
+    if all_namespaces:
+        return cluster_scoped(lambda: paged_by_namespace(
+            autoscaling_v2().list_horizontal_pod_autoscaler_for_all_namespaces, HPA_FIELDS, "hpas",
+            label_selector=label_selector, field_selector=field_selector))
+    api = autoscaling_v2()
+    page = list_page(api.list_namespaced_horizontal_pod_autoscaler, namespace, limit=limit,
+                     continue_token=continue_token, label_selector=label_selector,
+                     field_selector=field_selector)
+    result = {
         "status": "success",
-        "hpas": [
-            {
-                "name": hpa.metadata.name,
-                "target_kind": hpa.spec.scale_target_ref.kind,
-                "target_name": hpa.spec.scale_target_ref.name,
-                "min_replicas": hpa.spec.min_replicas,
-                "max_replicas": hpa.spec.max_replicas,
-                "current_replicas": hpa.status.current_replicas
-            }
-            for hpa in hpas.items
-        ]
+        "hpas": [project(hpa, HPA_FIELDS) for hpa in page["items"]]
     }
+    if page["continue"]:
+        result["continue"] = page["continue"]
+    return result
 
 def create_hpa(name: str, target_kind: str, target_name: str, 
             namespace: str = "default", min_replicas: int = 1, 
@@ -31,8 +39,7 @@ def create_hpa(name: str, target_kind: str, target_name: str,
     """
     CPU 사용률 기반 HorizontalPodAutoscaler를 생성합니다.
     """
-    load_kube_config()
-    api = client.AutoscalingV2Api()
+    api = autoscaling_v2()
     
     target = client.V2CrossVersionObjectReference(
         api_version="apps/v1",
@@ -78,33 +85,38 @@ def create_hpa(name: str, target_kind: str, target_name: str,
         }
     }
 
-def list_statefulsets(namespace: str = "default") -> dict:
+def list_statefulsets(namespace: str = "default", label_selector: str = None, field_selector: str = None,
+                      limit: int = None, continue_token: str = None,
+                      namespaces: list = None, all_namespaces: bool = False) -> dict:
     """
     지정된 네임스페이스의 StatefulSet 목록을 조회합니다.
+    limit/continue_token으로 페이지 단위 조회, label_selector/field_selector로 서버 측 필터링을 지원합니다.
+    all_namespaces=True면 클러스터 범위 LIST(페이지 단위)로, namespaces=[...]면 병렬로 조회해 병합합니다.
     """
-    load_kube_config()
-    api = client.AppsV1Api()
-    statefulsets = api.list_namespaced_stateful_set(namespace)
-    return {
+    if namespaces:
+        return fan_out(list_statefulsets, namespaces, label_selector=label_selector, field_selector=field_selector)
+    if all_namespaces:
+        return cluster_scoped(lambda: paged_by_namespace(
+            apps_v1().list_stateful_set_for_all_namespaces, STATEFULSET_FIELDS, "statefulsets",
+            label_selector=label_selector, field_selector=field_selector))
+    api = apps_v1()
+    page = list_page(api.list_namespaced_stateful_set, namespace, limit=limit,
+                     continue_token=continue_token, label_selector=label_selector,
+                     field_selector=field_selector)
+    result = {
         "status": "success",
-        "statefulsets": [
-            {
-                "name": ss.metadata.name,
-                "ready": ss.status.ready_replicas or 0,
-                "current": ss.status.current_replicas or 0,
-                "desired": ss.spec.replicas
-            }
-            for ss in statefulsets.items
-        ]
+        "statefulsets": [project(ss, STATEFULSET_FIELDS) for ss in page["items"]]
     }
+    if page["continue"]:
+        result["continue"] = page["continue"]
+    return result
 
 def create_statefulset(name: str, image: str, namespace: str = "default", 
                     replicas: int = 1, storage_size: str = "1Gi") -> dict:
     """
     이름, 이미지, 복제 수, 스토리지 크기를 이용해 StatefulSet을 생성합니다.
     """
-    load_kube_config()
-    api = client.AppsV1Api()
+    api = apps_v1()
     
     labels = {"app": name}
     
@@ -167,8 +179,7 @@ def create_cronjob(name: str, schedule: str, image: str,
     """
     이름, 일정, 이미지, 명령어를 이용해 CronJob을 생성합니다.
     """
-    load_kube_config()
-    api = client.BatchV1Api()
+    api = batch_v1()
     
     if command is None:
         command = ["/bin/sh", "-c", "echo Hello from CronJob"]
@@ -211,12 +222,14 @@ def create_cronjob(name: str, schedule: str, image: str,
     }
 
 def create_canary_deployment(name: str, namespace: str = "default", new_image: str = None,
-                        canary_replicas: int = 1, total_replicas: int = 10) -> dict:
+                        canary_replicas: int = 1, total_replicas: int = 10,
+                        wait: bool = False, timeout: int = ROLLOUT_WAIT_TIMEOUT) -> dict:
     """
     카나리 배포를 생성합니다. 새 버전을 일부 사용자에게만 적용하는 방식입니다.
+    wait=True면 카나리 생성과 기존 디플로이먼트 축소가 끝날 때까지 함께 기다립니다 (timeout 초).
+    롤아웃이 실패하면 status가 error, 기한 안에 끝나지 않으면 timeout입니다.
     """
-    load_kube_config()
-    api = client.AppsV1Api()
+    api = apps_v1()
     
     try:
         # 기존 디플로이먼트 정보 가져오기
@@ -268,7 +281,7 @@ def create_canary_deployment(name: str, namespace: str = "default", new_image: s
         )
         
         # 기존 디플로이먼트 축소
-        api.patch_namespaced_deployment(
+        scaled = api.patch_namespaced_deployment(
             name=name,
             namespace=namespace,
             body={"spec": {"replicas": total_replicas - canary_replicas}}
@@ -280,12 +293,25 @@ def create_canary_deployment(name: str, namespace: str = "default", new_image: s
             body=canary_deploy
         )
         
-        return {
+        result = {
             "status": "success",
             "message": f"카나리 배포 시작: {canary_replicas}/{total_replicas}개의 레플리카가 {new_image} 이미지 사용",
             "canary_deployment": canary_name,
             "original_deployment": name
         }
+        if wait:
+            # 두 디플로이먼트를 각각 WATCH 하나로 동시에 대기
+            with ThreadPoolExecutor(max_workers=2, thread_name_prefix="rollout-wait") as pool:
+                canary = pool.submit(wait_for_rollout, namespace, canary_name, timeout, resp.metadata.generation)
+                original = pool.submit(wait_for_rollout, namespace, name, timeout, scaled.metadata.generation)
+                result["rollout"] = {"canary": canary.result(), "original": original.result()}
+            # 패치는 성공해도 롤아웃이 끝나지 않았으면 성공으로 보고하지 않음
+            states = {r["rollout"] for r in result["rollout"].values()}
+            if states & {FAILED, NOT_FOUND}:
+                result["status"] = "error"
+            elif TIMEOUT in states:
+                result["status"] = "timeout"
+        return result
     except client.exceptions.ApiException as e:
         return {
             "status": "error",
@@ -297,8 +323,7 @@ def create_pod_disruption_budget(name: str, app_selector: str, min_available: st
     """
     애플리케이션에 대한 PodDisruptionBudget을 생성하여 워크로드 가용성을 유지합니다.
     """
-    load_kube_config()
-    api = client.PolicyV1Api()
+    api = policy_v1()
     
     pdb = client.V1PodDisruptionBudget(
         api_version="policy/v1",
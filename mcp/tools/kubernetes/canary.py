@@ -0,0 +1,401 @@
+# tools/kubernetes/canary.py
+"""
+점진적 카나리 컨트롤러.
+
+create_canary_deployment로 만든 <name>-canary를 단계별 비율(CANARY_STEPS, %)로 늘려 가며
+각 단계마다 일정 시간(CANARY_STEP_INTERVAL) 관찰한 뒤 카나리/안정 트랙을 비교합니다.
+- 에러 로그 비율: get_pod_logs_analysis와 같은 로그 분석(_analyze_pods)으로 관찰 구간만 집계
+- CPU/메모리: metrics.k8s.io 파드 메트릭의 트랙별 파드당 평균
+네 가지 조회(트랙 2개 x 로그/메트릭)는 동시에 실행합니다.
+데이터가 없으면 통과로 보지 않습니다: 카나리 파드가 준비되지 않았거나 롤아웃이 기한 안에 끝나지 않으면 실패,
+로그 줄/메트릭이 부족하면 같은 단계를 CANARY_MAX_HOLDS번까지 다시 관찰한 뒤에도 부족하면 롤백합니다.
+기준을 넘으면 자동 롤백(카나리 삭제, 안정 버전 복구), 마지막 단계까지 통과하면
+안정 Deployment에 새 이미지를 적용하고 카나리를 삭제(승격)합니다.
+
+트래픽 비율은 서비스 메시 없이 레플리카 수 비율(같은 Service 셀렉터)로 조정합니다.
+진행 상태는 프로세스 메모리에만 보관하며 get_canary_status 도구로 조회합니다.
+"""
+import logging
+import math
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from kubernetes import client
+
+from .helpers import apps_v1, core_v1, custom_objects
+from .advanced import create_canary_deployment
+from .monitoring import _analyze_pods, _metrics_by_pod
+from .rollout import COMPLETE, wait_for_rollout
+
+logger = logging.getLogger(__name__)
+
+CANARY_STEPS = [int(s) for s in os.getenv("CANARY_STEPS", "10,25,50").split(",") if s.strip()]
+CANARY_STEP_INTERVAL = float(os.getenv("CANARY_STEP_INTERVAL", "120"))
+# 카나리 에러 로그 비율(에러/전체 줄)이 안정 트랙보다 이만큼 넘게 높으면 롤백
+CANARY_MAX_ERROR_RATE_DELTA = float(os.getenv("CANARY_MAX_ERROR_RATE_DELTA", "0.01"))
+# 카나리 파드당 평균 CPU/메모리가 안정 트랙의 이 배수를 넘으면 롤백
+CANARY_MAX_CPU_RATIO = float(os.getenv("CANARY_MAX_CPU_RATIO", "1.5"))
+CANARY_MAX_MEMORY_RATIO = float(os.getenv("CANARY_MAX_MEMORY_RATIO", "1.5"))
+# 판정에 필요한 카나리 관찰 구간 최소 로그 줄 수, 부족할 때 같은 단계를 다시 관찰하는 최대 횟수
+CANARY_MIN_LOG_LINES = max(1, int(os.getenv("CANARY_MIN_LOG_LINES", "1")))
+CANARY_MAX_HOLDS = int(os.getenv("CANARY_MAX_HOLDS", "2"))
+# 단계별 로그 분석 시 파드당 읽기 상한
+_LOG_MAX_BYTES = 4 * 1024 * 1024
+_LOG_MAX_LINES = 50000
+_MAX_HISTORY = 20
+
+RUNNING = "running"
+PROMOTED = "promoted"
+ROLLED_BACK = "rolled_back"
+FAILED = "failed"
+
+
+def _selector(labels: dict, extra: str = None) -> str:
+    terms = [f"{k}={v}" for k, v in sorted((labels or {}).items())]
+    if extra:
+        terms.append(extra)
+    return ",".join(terms)
+
+
+def _ready(pod) -> bool:
+    conditions = (pod.status.conditions if pod.status else None) or []
+    return any(c.type == "Ready" and c.status == "True" for c in conditions)
+
+
+def _track_logs(namespace: str, selector: str, window: float) -> dict:
+    """
+    트랙 파드의 관찰 구간 로그에서 에러(error/critical) 줄 비율을 계산합니다.
+    """
+    pods = core_v1().list_namespaced_pod(namespace, label_selector=selector).items
+    analysis = _analyze_pods(pods, container_name=None, hours=window / 3600, parallelism=4,
+                             max_bytes_per_pod=_LOG_MAX_BYTES, max_lines_per_pod=_LOG_MAX_LINES,
+                             incremental=False, rules=None, top_n=3).get(namespace, {})
+    lines = errors = 0
+    signatures = []
+    for containers in analysis.values():
+        for result in containers.values():
+            if "error" in result and len(result) == 1:
+                continue
+            severity = result.get("severity_counts") or {}
+            lines += result.get("lines_read", 0)
+            errors += severity.get("error", 0) + severity.get("critical", 0)
+            signatures.extend(result.get("top_signatures") or [])
+    return {
+        "pods": len(pods),
+        "ready": sum(1 for p in pods if _ready(p)),
+        "lines": lines,
+        "errors": errors,
+        "error_rate": errors / lines if lines else 0.0,
+        "top_signatures": sorted(signatures, key=lambda s: s["count"], reverse=True)[:3],
+    }
+
+
+def _track_usage(namespace: str, selector: str) -> dict:
+    """
+    트랙 파드의 파드당 평균 CPU(코어)/메모리(Ki).
+    """
+    items = custom_objects().list_namespaced_custom_object(
+        group="metrics.k8s.io", version="v1beta1", namespace=namespace, plural="pods",
+        label_selector=selector
+    )["items"]
+    pods = _metrics_by_pod(items)
+    if not pods:
+        return {"pods": 0, "cpu": None, "memory": None}
+    return {
+        "pods": len(pods),
+        "cpu": sum(p["total"]["cpu_usage"] for p in pods.values()) / len(pods),
+        "memory": sum(p["total"]["memory_usage"] for p in pods.values()) / len(pods),
+    }
+
+
+def _ratio(canary, stable):
+    if canary is None or not stable:
+        return None
+    return canary / stable
+
+
+def evaluate(logs: dict, usage: dict) -> tuple:
+    """
+    트랙 비교 결과에서 (롤백 사유 목록, 데이터 부족 항목 목록)을 만듭니다. 둘 다 비어 있어야 통과입니다.
+    카나리 파드가 준비되지 않았으면 롤백 사유, 로그 줄이나 메트릭을 얻지 못했으면 데이터 부족입니다.
+    """
+    reasons, missing = [], []
+    canary_logs, stable_logs = logs.get("canary"), logs.get("stable")
+    if canary_logs is None:
+        missing.append("카나리 로그 조회 실패")
+    elif not canary_logs["pods"] or canary_logs["ready"] < canary_logs["pods"]:
+        reasons.append(f"카나리 파드 준비 안 됨 ({canary_logs['ready']}/{canary_logs['pods']})")
+    elif canary_logs["lines"] < CANARY_MIN_LOG_LINES:
+        missing.append(f"카나리 로그 {canary_logs['lines']}줄 (최소 {CANARY_MIN_LOG_LINES}줄)")
+    else:
+        # 안정 트랙 로그가 없으면 에러 비율 0을 기준으로 비교
+        stable_rate = stable_logs["error_rate"] if stable_logs else 0.0
+        delta = canary_logs["error_rate"] - stable_rate
+        if delta > CANARY_MAX_ERROR_RATE_DELTA:
+            reasons.append(f"에러 로그 비율 {canary_logs['error_rate']:.2%} (안정 {stable_rate:.2%})")
+    canary_usage, stable_usage = usage.get("canary"), usage.get("stable")
+    if not canary_usage or canary_usage["cpu"] is None:
+        missing.append("카나리 CPU/메모리 메트릭 없음")
+    elif not stable_usage or stable_usage["cpu"] is None:
+        missing.append("안정 CPU/메모리 메트릭 없음")
+    else:
+        for metric, limit in (("cpu", CANARY_MAX_CPU_RATIO), ("memory", CANARY_MAX_MEMORY_RATIO)):
+            ratio = _ratio(canary_usage[metric], stable_usage[metric])
+            if ratio is not None and ratio > limit:
+                reasons.append(f"{metric} 사용량 {ratio:.2f}배 (허용 {limit}배)")
+    return reasons, missing
+
+
+class CanaryRun:
+    """
+    Deployment 하나의 점진적 카나리 진행 (전용 daemon 스레드).
+    """
+
+    def __init__(self, name: str, namespace: str, new_image: str, total_replicas: int,
+                 steps: list, interval: float, stable_labels: dict, container: str):
+        self.name = name
+        self.namespace = namespace
+        self.canary_name = f"{name}-canary"
+        self.new_image = new_image
+        self.total_replicas = total_replicas
+        self.steps = steps
+        self.interval = interval
+        self.container = container
+        self.stable_selector = _selector(stable_labels, "track!=canary")
+        self.canary_selector = _selector({"app": name, "track": "canary"})
+        self.phase = RUNNING
+        self.step = 0
+        self.weight = 0
+        self.reason = None
+        self.history = []
+        self.started_at = time.time()
+        self.updated_at = self.started_at
+        self._stop = threading.Event()
+        self._thread = None
+
+    def _set(self, **fields):
+        for k, v in fields.items():
+            setattr(self, k, v)
+        self.updated_at = time.time()
+
+    def _canary_replicas(self, weight: int) -> int:
+        return min(self.total_replicas - 1, max(1, math.ceil(self.total_replicas * weight / 100)))
+
+    def _scale(self, canary: int):
+        api = apps_v1()
+        api.patch_namespaced_deployment_scale(self.canary_name, self.namespace, {"spec": {"replicas": canary}})
+        api.patch_namespaced_deployment_scale(self.name, self.namespace,
+                                              {"spec": {"replicas": self.total_replicas - canary}})
+        with ThreadPoolExecutor(max_workers=2, thread_name_prefix="canary-wait") as pool:
+            waits = [pool.submit(wait_for_rollout, self.namespace, n, self.interval)
+                     for n in (self.canary_name, self.name)]
+            return [w.result() for w in waits]
+
+    def analyze(self) -> dict:
+        """
+        트랙별 로그/메트릭을 동시에 조회해 비교합니다.
+        """
+        with ThreadPoolExecutor(max_workers=4, thread_name_prefix="canary-analysis") as pool:
+            jobs = {
+                ("logs", "canary"): pool.submit(_track_logs, self.namespace, self.canary_selector, self.interval),
+                ("logs", "stable"): pool.submit(_track_logs, self.namespace, self.stable_selector, self.interval),
+                ("usage", "canary"): pool.submit(_track_usage, self.namespace, self.canary_selector),
+                ("usage", "stable"): pool.submit(_track_usage, self.namespace, self.stable_selector),
+            }
+            results = {"logs": {}, "usage": {}}
+            errors = {}
+            for (kind, track), job in jobs.items():
+                try:
+                    results[kind][track] = job.result()
+                except Exception as e:
+                    errors[f"{kind}.{track}"] = str(e)
+        reasons, missing = evaluate(results["logs"], results["usage"])
+        return {**results, "errors": errors, "reasons": reasons, "missing": missing,
+                "passed": not reasons and not missing}
+
+    def _promote(self):
+        api = apps_v1()
+        resp = api.patch_namespaced_deployment(self.name, self.namespace, {"spec": {
+            "replicas": self.total_replicas,
+            "template": {"spec": {"containers": [{"name": self.container, "image": self.new_image}]}},
+        }})
+        rollout = wait_for_rollout(self.namespace, self.name, max(self.interval, 300),
+                                   min_generation=resp.metadata.generation)
+        # 기한 초과도 실패: 카나리를 지우지 않고 FAILED로 남겨 운영자가 확인하도록 함
+        if rollout["rollout"] != COMPLETE:
+            raise RuntimeError(f"안정 버전 롤아웃 미완료({rollout['rollout']}): {rollout['message']}")
+        api.delete_namespaced_deployment(self.canary_name, self.namespace, body=client.V1DeleteOptions())
+
+    def _rollback(self):
+        api = apps_v1()
+        api.patch_namespaced_deployment_scale(self.name, self.namespace, {"spec": {"replicas": self.total_replicas}})
+        try:
+            api.delete_namespaced_deployment(self.canary_name, self.namespace, body=client.V1DeleteOptions())
+        except client.exceptions.ApiException as e:
+            if e.status != 404:
+                raise
+
+    def _observe(self, index: int, weight: int, canary: int):
+        """
+        관찰 구간 동안 대기 후 분석합니다. 데이터가 부족하면 CANARY_MAX_HOLDS번까지 다시 관찰합니다.
+        중단 요청 시 None.
+        """
+        for hold in range(CANARY_MAX_HOLDS + 1):
+            if self._stop.wait(self.interval):
+                return None
+            analysis = self.analyze()
+            self.history.append({"step": index + 1, "weight": weight, "canary_replicas": canary,
+                                 "hold": hold, "at": time.time(), **analysis})
+            del self.history[:-_MAX_HISTORY]
+            if analysis["reasons"] or not analysis["missing"]:
+                return analysis
+        return analysis
+
+    def _run(self):
+        try:
+            for index, weight in enumerate(self.steps):
+                if self._stop.is_set():
+                    break
+                canary = self._canary_replicas(weight)
+                rollouts = self._scale(canary)
+                self._set(step=index + 1, weight=weight)
+                # 기한 안에 끝나지 않은 롤아웃(ImagePullBackOff 등)도 실패로 처리
+                failed = [r for r in rollouts if r["rollout"] != COMPLETE]
+                if failed:
+                    self._set(reason=f"롤아웃 미완료({failed[0]['rollout']}): {failed[0]['message']}")
+                    break
+                analysis = self._observe(index, weight, canary)
+                if analysis is None:
+                    break
+                if not analysis["passed"]:
+                    self._set(reason="; ".join(analysis["reasons"] or
+                                               [f"데이터 부족: {', '.join(analysis['missing'])}"]))
+                    break
+            else:
+                self._promote()
+                self._set(phase=PROMOTED, weight=100, reason="모든 단계 통과")
+                return
+            if self._stop.is_set() and not self.reason:
+                self._set(reason="중단 요청")
+            self._rollback()
+            self._set(phase=ROLLED_BACK)
+        except Exception as e:
+            logger.error("canary %s/%s failed: %s", self.namespace, self.name, e)
+            self._set(phase=FAILED, reason=str(e))
+
+    def start(self):
+        self._thread = threading.Thread(target=self._run, name=f"canary-{self.name}", daemon=True)
+        self._thread.start()
+
+    def abort(self):
+        self._stop.set()
+
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "namespace": self.namespace,
+            "canary_deployment": self.canary_name,
+            "new_image": self.new_image,
+            "phase": self.phase,
+            "step": self.step,
+            "steps": self.steps,
+            "weight": self.weight,
+            "total_replicas": self.total_replicas,
+            "interval_seconds": self.interval,
+            "reason": self.reason,
+            "started_at": self.started_at,
+            "updated_at": self.updated_at,
+            "history": self.history,
+        }
+
+
+class CanaryController:
+    """
+    (namespace, name) -> 진행 중/완료된 카나리. 같은 Deployment에는 한 번에 하나만 진행합니다.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs = {}
+        # 시작 준비 중(API 호출 중)인 키: 잠금 밖에서 I/O를 하는 동안 중복 시작을 막음
+        self._starting = set()
+
+    def start(self, name: str, namespace: str, new_image: str, total_replicas: int = None,
+              steps: list = None, interval: float = None) -> dict:
+        key = (namespace, name)
+        with self._lock:
+            current = self._runs.get(key)
+            if key in self._starting or (current is not None and current.phase == RUNNING):
+                return {"status": "error", "message": f"{namespace}/{name} 카나리가 이미 진행 중입니다"}
+            self._starting.add(key)
+        run = None
+        try:
+            steps = sorted({int(s) for s in (steps or CANARY_STEPS) if 0 < int(s) < 100})
+            if not steps:
+                return {"status": "error", "message": "steps에는 1~99 사이의 비율(%)이 필요합니다"}
+            deployment = apps_v1().read_namespaced_deployment(name, namespace)
+            total = total_replicas or deployment.spec.replicas or 1
+            if total < 2:
+                return {"status": "error", "message": "카나리에는 레플리카가 2개 이상 필요합니다"}
+            candidate = CanaryRun(name, namespace, new_image, total, steps, interval or CANARY_STEP_INTERVAL,
+                                  deployment.spec.selector.match_labels,
+                                  deployment.spec.template.spec.containers[0].name)
+            created = create_canary_deployment(name, namespace, new_image,
+                                               canary_replicas=candidate._canary_replicas(steps[0]),
+                                               total_replicas=total)
+            if created.get("status") != "success":
+                return created
+            run = candidate
+        finally:
+            with self._lock:
+                self._starting.discard(key)
+                if run is not None:
+                    self._runs[key] = run
+        run.start()
+        return {"status": "success", "canary": run.snapshot()}
+
+    def abort(self, name: str, namespace: str) -> dict:
+        with self._lock:
+            run = self._runs.get((namespace, name))
+        if run is None or run.phase != RUNNING:
+            return {"status": "error", "message": f"진행 중인 {namespace}/{name} 카나리가 없습니다"}
+        run.abort()
+        return {"status": "success", "message": "중단 요청됨, 롤백을 진행합니다", "canary": run.snapshot()}
+
+    def status(self, name: str = None, namespace: str = None) -> list:
+        with self._lock:
+            runs = list(self._runs.values())
+        return [r.snapshot() for r in runs
+                if (name is None or r.name == name) and (namespace is None or r.namespace == namespace)]
+
+
+controller = CanaryController()
+
+
+def start_progressive_canary(name: str, new_image: str, namespace: str = "default",
+                             total_replicas: int = None, steps: list = None,
+                             interval_seconds: float = None) -> dict:
+    """
+    점진적 카나리 배포를 시작합니다. steps(%)마다 interval_seconds 동안 관찰한 뒤
+    에러 로그 비율과 CPU/메모리를 안정 버전과 비교해 자동으로 다음 단계/승격/롤백합니다.
+    """
+    try:
+        return controller.start(name, namespace, new_image, total_replicas, steps, interval_seconds)
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
+
+
+def get_canary_status(name: str = None, namespace: str = None) -> dict:
+    """
+    카나리 진행 상태(단계, 비율, 단계별 분석 결과, 승격/롤백 사유)를 조회합니다.
+    """
+    return {"status": "success", "canaries": controller.status(name, namespace)}
+
+
+def abort_canary(name: str, namespace: str = "default") -> dict:
+    """
+    진행 중인 카나리를 중단하고 롤백합니다.
+    """
+    return controller.abort(name, namespace)
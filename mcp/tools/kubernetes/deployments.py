@@ -1,32 +1,54 @@
 # tools/kubernetes/deployments.py
 from kubernetes import client
-from .helpers import load_kube_config
+from .helpers import apps_v1
+from .informers import cached_list
+from .listing import DEPLOYMENT_FIELDS, list_page, project
+from .fanout import cluster_scoped, fan_out, paged_by_namespace, project_by_namespace
+from .rollout import ROLLOUT_WAIT_TIMEOUT, wait_for_rollout
 
-def list_deployments(namespace: str = "default") -> dict:
+def list_deployments(namespace: str = "default", label_selector: str = None, field_selector: str = None,
+                     limit: int = None, continue_token: str = None,
+                     namespaces: list = None, all_namespaces: bool = False) -> dict:
     """
     지정된 네임스페이스의 Deployment 목록을 조회합니다.
+    limit/continue_token으로 페이지 단위 조회, label_selector/field_selector로 서버 측 필터링을 지원합니다.
+    all_namespaces=True면 클러스터 범위 LIST(페이지 단위)로, namespaces=[...]면 병렬로 조회해 병합합니다.
     """
-    load_kube_config()
-    deps = client.AppsV1Api().list_namespaced_deployment(namespace)
-    return {
+    if namespaces:
+        return fan_out(list_deployments, namespaces, label_selector=label_selector, field_selector=field_selector)
+    if all_namespaces:
+        def fetch():
+            deps = None
+            if not field_selector:
+                deps = cached_list("deployments", label_selector=label_selector)
+            if deps is None:
+                return paged_by_namespace(apps_v1().list_deployment_for_all_namespaces, DEPLOYMENT_FIELDS,
+                                          "deployments", label_selector=label_selector,
+                                          field_selector=field_selector)
+            return project_by_namespace(deps, DEPLOYMENT_FIELDS, "deployments")
+        return cluster_scoped(fetch)
+    deps = None
+    page = {}
+    if not (field_selector or limit or continue_token):
+        deps = cached_list("deployments", namespace=namespace, label_selector=label_selector)
+    if deps is None:
+        page = list_page(apps_v1().list_namespaced_deployment, namespace, limit=limit,
+                         continue_token=continue_token, label_selector=label_selector,
+                         field_selector=field_selector)
+        deps = page["items"]
+    result = {
         "status": "success",
-        "deployments": [
-            {
-                "name": d.metadata.name,
-                "ready": d.status.ready_replicas or 0,
-                "available": d.status.available_replicas or 0,
-                "desired": d.spec.replicas
-            }
-            for d in deps.items
-        ]
+        "deployments": [project(d, DEPLOYMENT_FIELDS) for d in deps]
     }
+    if page.get("continue"):
+        result["continue"] = page["continue"]
+    return result
 
 def describe_deployment(namespace: str = "default", name: str = "") -> dict:
     """
     특정 네임스페이스의 지정된 Deployment 상세 정보를 반환합니다.
     """
-    load_kube_config()
-    d = client.AppsV1Api().read_namespaced_deployment(name, namespace)
+    d = apps_v1().read_namespaced_deployment(name, namespace)
     return {
         "status": "success",
         "deployment": {
@@ -44,8 +66,7 @@ def create_deployment(name: str, image: str, namespace: str = "default", replica
     """
     이름(name), 이미지(image), 복제 수(replicas)를 이용해 Deployment를 생성합니다.
     """
-    load_kube_config()
-    api = client.AppsV1Api()
+    api = apps_v1()
     if labels is None:
         labels = {"app": name}
     container = client.V1Container(
@@ -72,25 +93,31 @@ def create_deployment(name: str, image: str, namespace: str = "default", replica
     resp = api.create_namespaced_deployment(namespace=namespace, body=deployment)
     return {"status": "success", "name": resp.metadata.name}
 
-def update_deployment(namespace: str = "default", name: str = "", image: str = None, replicas: int = None) -> dict:
+def update_deployment(namespace: str = "default", name: str = "", image: str = None, replicas: int = None,
+                      wait: bool = False, timeout: int = ROLLOUT_WAIT_TIMEOUT) -> dict:
     """
     Deployment의 이미지 또는 replicas를 패치(롤링 업데이트)합니다.
+    wait=True면 롤아웃이 완료/실패하거나 timeout(초)이 지날 때까지 기다려 결과(rollout)를 함께 반환하며,
+    status는 롤아웃 결과를 따릅니다 (완료: success, 실패: error, 기한 초과: timeout).
     """
-    load_kube_config()
-    api = client.AppsV1Api()
+    api = apps_v1()
     body = {"spec": {}}
     if image:
         body["spec"]["template"] = {"spec": {"containers": [{"name": name, "image": image}]}}
     if replicas is not None:
         body["spec"]["replicas"] = replicas
     resp = api.patch_namespaced_deployment(name=name, namespace=namespace, body=body)
-    return {"status": "success", "deployment": {"name": resp.metadata.name, "replicas": resp.spec.replicas}}
+    result = {"status": "success", "deployment": {"name": resp.metadata.name, "replicas": resp.spec.replicas}}
+    if wait:
+        rollout = wait_for_rollout(namespace, name, timeout, min_generation=resp.metadata.generation)
+        result["rollout"] = rollout
+        result["status"] = rollout["status"]
+    return result
 
 def delete_deployment(namespace: str = "default", name: str = "") -> dict:
     """
     특정 네임스페이스의 지정된 Deployment를 삭제합니다.
     """
-    load_kube_config()
-    api = client.AppsV1Api()
+    api = apps_v1()
     api.delete_namespaced_deployment(name=name, namespace=namespace, body=client.V1DeleteOptions())
     return {"status": "success", "message": f"Deployment {name} deleted"}
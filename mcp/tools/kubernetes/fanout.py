@@ -0,0 +1,115 @@
+# tools/kubernetes/fanout.py
+"""
+여러 네임스페이스 조회를 하나의 응답으로 병합하는 도우미.
+
+all_namespaces 모드는 클러스터 범위 LIST를 limit/continue 페이지로 받아 네임스페이스별로 나누고,
+namespaces=[...] 모드는 제한된 스레드 풀로 네임스페이스별 호출을 병렬 실행합니다.
+응답 형식은 두 모드가 같습니다:
+  {"status": "success" | "partial" | "error",
+   "namespaces": {ns: 결과}, "timings_ms": {ns 또는 "*": ms}, "errors": {ns: 메시지}}
+"""
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from .listing import field, iter_pages, project
+
+K8S_FANOUT_WORKERS = int(os.getenv("K8S_FANOUT_WORKERS", "8"))
+
+
+def merged(results: dict, timings: dict, errors: dict) -> dict:
+    if not errors:
+        status = "success"
+    else:
+        status = "partial" if results else "error"
+    return {"status": status, "namespaces": results, "timings_ms": timings, "errors": errors}
+
+
+def _result_error(result):
+    """
+    도구 결과에 담긴 실패({"status": "error"} 또는 {"error": "<메시지>"})를 메시지로 추출합니다.
+    "error" 키를 가진 리소스 레코드는 실패로 보지 않습니다.
+    """
+    if not isinstance(result, dict):
+        return None
+    if result.get("status") == "error":
+        return result.get("message") or "error"
+    if set(result) == {"error"} and isinstance(result["error"], str):
+        return result["error"]
+    return None
+
+
+def _elapsed_ms(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000, 1)
+
+
+def fan_out(func, namespaces: list, max_workers: int = K8S_FANOUT_WORKERS, **kwargs) -> dict:
+    """
+    func(namespace=ns, **kwargs)를 네임스페이스별로 병렬 실행해 병합합니다.
+    일부 네임스페이스가 실패해도 나머지 결과는 반환합니다 (status: partial).
+    """
+    namespaces = list(dict.fromkeys(namespaces))
+
+    def run(ns):
+        started = time.perf_counter()
+        try:
+            result = func(namespace=ns, **kwargs)
+            return ns, result, _result_error(result), _elapsed_ms(started)
+        except Exception as e:
+            return ns, None, str(e), _elapsed_ms(started)
+
+    results, timings, errors = {}, {}, {}
+    workers = max(1, min(max_workers, len(namespaces)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ns-fanout") as pool:
+        for ns, result, error, ms in pool.map(run, namespaces):
+            timings[ns] = ms
+            if error:
+                errors[ns] = error
+            else:
+                results[ns] = result
+    return merged(results, timings, errors)
+
+
+def cluster_scoped(fetch) -> dict:
+    """
+    클러스터 범위 조회 fetch() -> {ns: 결과}를 실행해 같은 병합 형식으로 반환합니다.
+    """
+    started = time.perf_counter()
+    try:
+        by_namespace = fetch()
+    except Exception as e:
+        return merged({}, {"*": _elapsed_ms(started)}, {"*": str(e)})
+    return merged(by_namespace, {"*": _elapsed_ms(started)}, {})
+
+
+def group_by_namespace(items: list) -> dict:
+    """
+    오브젝트(JSON dict 또는 모델) 목록을 metadata.namespace 기준으로 나눕니다.
+    """
+    groups = {}
+    for item in items:
+        groups.setdefault(field(item, "metadata.namespace"), []).append(item)
+    return groups
+
+
+def paged_by_namespace(list_func, fields: dict, key: str, **kwargs) -> dict:
+    """
+    클러스터 범위 LIST를 iter_pages로 한 페이지씩 받아 네임스페이스별로 프로젝션합니다.
+    원시 페이지는 프로젝션 직후 버리므로 메모리에는 한 페이지와 프로젝션 결과만 남습니다.
+    """
+    results = {}
+    for page in iter_pages(list_func, **kwargs):
+        for item in page:
+            ns = field(item, "metadata.namespace")
+            results.setdefault(ns, {"status": "success", key: []})[key].append(project(item, fields))
+    return results
+
+
+def project_by_namespace(items: list, fields: dict, key: str) -> dict:
+    """
+    네임스페이스별로 나눈 뒤 프로젝션해 {ns: {"status": "success", key: [...]}}로 반환합니다.
+    """
+    return {
+        ns: {"status": "success", key: [project(item, fields) for item in group]}
+        for ns, group in group_by_namespace(items).items()
+    }
@@ -1,12 +1,162 @@
 # tools/kubernetes/helpers.py
-from kubernetes import config
+import os
+import threading
+
+from kubernetes import client, config
+
+# urllib3 커넥션 풀 크기 (동시 툴 호출 수에 맞춰 조정)
+K8S_POOL_MAXSIZE = int(os.getenv("K8S_POOL_MAXSIZE", "32"))
+
+
+class ClientRegistry:
+  """
+  프로세스 전역 Kubernetes API 클라이언트 레지스트리.
+
+  설정은 한 번만 로드하고 하나의 ApiClient(urllib3 커넥션 풀)를 재사용합니다.
+  kubeconfig 파일의 mtime이 바뀌었을 때만 설정을 다시 로드하며,
+  토큰 만료 시 갱신은 kubernetes 클라이언트의 refresh_api_key_hook이 처리합니다.
+  """
+
+  def __init__(self, pool_maxsize: int = K8S_POOL_MAXSIZE):
+    self._lock = threading.Lock()
+    self._pool_maxsize = pool_maxsize
+    self._api_client = None
+    self._apis = {}
+    self._in_cluster = None
+    self._kubeconfig_path = None
+    self._kubeconfig_mtime = None
+    self._build_hooks = []
+    self.hits = 0
+    self.misses = 0
+    self.reloads = 0
+
+  def _kubeconfig_file(self):
+    path = os.environ.get("KUBECONFIG", config.KUBE_CONFIG_DEFAULT_LOCATION)
+    # KUBECONFIG에 여러 파일이 지정된 경우 첫 번째 파일 기준으로 변경을 감지
+    return os.path.expanduser(path.split(os.pathsep)[0])
+
+  def _mtime(self, path):
+    try:
+      return os.path.getmtime(path)
+    except OSError:
+      return None
+
+  def _is_stale(self) -> bool:
+    if self._api_client is None:
+      return True
+    if self._in_cluster:
+      return False
+    return self._mtime(self._kubeconfig_path) != self._kubeconfig_mtime
+
+  def _build(self):
+    """
+    클러스터 내부에서 실행될 땐 in-cluster 설정을,
+    개발 환경 로컬에서 실행될 땐 kubeconfig 파일을 로드합니다.
+    """
+    cfg = client.Configuration()
+    try:
+      config.load_incluster_config(client_configuration=cfg, try_refresh_token=True)
+      self._in_cluster = True
+      self._kubeconfig_path = None
+      self._kubeconfig_mtime = None
+    except Exception:
+      self._kubeconfig_path = self._kubeconfig_file()
+      self._kubeconfig_mtime = self._mtime(self._kubeconfig_path)
+      config.load_kube_config(client_configuration=cfg, persist_config=False)
+      self._in_cluster = False
+    cfg.connection_pool_maxsize = self._pool_maxsize
+
+    old = self._api_client
+    self._api_client = client.ApiClient(configuration=cfg)
+    for hook in self._build_hooks:
+      hook(self._api_client)
+    self._apis = {}
+    # 기존 도구 코드의 client.XxxApi() 기본 생성도 같은 설정을 쓰도록 기본값 갱신
+    client.Configuration.set_default(cfg)
+    if old is not None:
+      self.reloads += 1
+      try:
+        old.close()
+      except Exception:
+        pass
+
+  def add_build_hook(self, hook):
+    """
+    새 ApiClient가 만들어질 때마다 hook(api_client)를 호출합니다 (계측 등). 이미 있으면 바로 적용합니다.
+    """
+    with self._lock:
+      self._build_hooks.append(hook)
+      if self._api_client is not None:
+        hook(self._api_client)
+
+  def api_client(self) -> client.ApiClient:
+    with self._lock:
+      if self._is_stale():
+        self.misses += 1
+        self._build()
+      else:
+        self.hits += 1
+      return self._api_client
+
+  def api(self, api_cls):
+    """
+    공유 ApiClient 위에 만든 API 객체(CoreV1Api 등)를 종류별로 캐시해 반환합니다.
+    """
+    api_client = self.api_client()
+    with self._lock:
+      api = self._apis.get(api_cls)
+      if api is None or api.api_client is not api_client:
+        api = api_cls(api_client)
+        self._apis[api_cls] = api
+      return api
+
+  def stats(self) -> dict:
+    with self._lock:
+      return {
+        "hits": self.hits,
+        "misses": self.misses,
+        "reloads": self.reloads,
+        "in_cluster": self._in_cluster,
+        "pool_maxsize": self._pool_maxsize,
+      }
+
+
+registry = ClientRegistry()
+
 
 def load_kube_config():
   """
-  클러스터 내부에서 실행될 땐 in-cluster 설정을,
-  개발 환경 로컬에서 실행될 땐 kubeconfig 파일을 로드합니다.
+  공유 레지스트리를 통해 설정을 (필요할 때만) 로드합니다.
+  """
+  registry.api_client()
+
+
+def core_v1() -> client.CoreV1Api:
+  return registry.api(client.CoreV1Api)
+
+
+def apps_v1() -> client.AppsV1Api:
+  return registry.api(client.AppsV1Api)
+
+
+def autoscaling_v2() -> client.AutoscalingV2Api:
+  return registry.api(client.AutoscalingV2Api)
+
+
+def batch_v1() -> client.BatchV1Api:
+  return registry.api(client.BatchV1Api)
+
+
+def policy_v1() -> client.PolicyV1Api:
+  return registry.api(client.PolicyV1Api)
+
+
+def custom_objects() -> client.CustomObjectsApi:
+  return registry.api(client.CustomObjectsApi)
+
+
+def pool_stats() -> dict:
+  """
+  클라이언트 레지스트리의 재사용(hit)/재생성(miss) 카운터를 반환합니다.
   """
-  try:
-    config.load_incluster_config()
-  except Exception:
-    config.load_kube_config()
+  return registry.stats()
@@ -0,0 +1,316 @@
+# tools/kubernetes/informers.py
+"""
+watch 기반 인포머(informer) 캐시.
+
+리소스 종류별로 하나의 리플렉터가 전체 LIST 후 WATCH를 유지하며,
+네임스페이스/이름/레이블/노드 인덱스를 메모리에 보관합니다.
+도구는 cached_list()로 캐시를 먼저 조회하고, 캐시가 동기화되지 않았거나
+허용 지연(max staleness)을 넘긴 경우 None을 받아 직접 LIST로 대체합니다.
+"""
+import logging
+import os
+import threading
+import time
+
+from kubernetes import watch
+from kubernetes.client.exceptions import ApiException
+
+from .helpers import apps_v1, core_v1
+
+logger = logging.getLogger(__name__)
+
+INFORMERS_ENABLED = os.getenv("K8S_INFORMERS", "false").lower() in ("1", "true", "yes")
+# 워치 연결이 끊긴 뒤에도 캐시를 제공할 최대 시간(초)
+INFORMER_MAX_STALENESS = float(os.getenv("K8S_INFORMER_MAX_STALENESS", "30"))
+# 서버 측 워치 타임아웃(초). 만료되면 같은 resourceVersion으로 워치를 다시 엽니다.
+INFORMER_WATCH_TIMEOUT = int(os.getenv("K8S_INFORMER_WATCH_TIMEOUT", "300"))
+
+
+def _pod_node(obj):
+    return obj.spec.node_name if obj.spec else None
+
+
+# kind -> (클러스터 범위 LIST 함수, 노드 인덱스 키 함수)
+_KINDS = {
+    "pods": (lambda: core_v1().list_pod_for_all_namespaces, _pod_node),
+    "deployments": (lambda: apps_v1().list_deployment_for_all_namespaces, None),
+    "nodes": (lambda: core_v1().list_node, None),
+    "events": (lambda: core_v1().list_event_for_all_namespaces, None),
+}
+
+
+def _parse_selector(label_selector: str):
+    """
+    'a=b,c!=d,e,!f' 형태의 레이블 셀렉터를 (연산자, 키, 값) 목록으로 변환합니다.
+    """
+    terms = []
+    for raw in (label_selector or "").split(","):
+        term = raw.strip()
+        if not term:
+            continue
+        if "!=" in term:
+            k, v = term.split("!=", 1)
+            terms.append(("!=", k.strip(), v.strip()))
+        elif "==" in term:
+            k, v = term.split("==", 1)
+            terms.append(("=", k.strip(), v.strip()))
+        elif "=" in term:
+            k, v = term.split("=", 1)
+            terms.append(("=", k.strip(), v.strip()))
+        elif term.startswith("!"):
+            terms.append(("!", term[1:].strip(), None))
+        else:
+            terms.append(("exists", term, None))
+    return terms
+
+
+def _match_labels(labels: dict, terms) -> bool:
+    for op, k, v in terms:
+        if op == "=" and labels.get(k) != v:
+            return False
+        if op == "!=" and labels.get(k) == v:
+            return False
+        if op == "exists" and k not in labels:
+            return False
+        if op == "!" and k in labels:
+            return False
+    return True
+
+
+class Reflector:
+    """
+    단일 리소스 종류에 대한 LIST+WATCH 루프와 인덱스된 로컬 스토어.
+    """
+
+    def __init__(self, kind: str, list_func_getter, node_key=None):
+        self.kind = kind
+        self._list_func_getter = list_func_getter
+        self._node_key = node_key
+        self._lock = threading.RLock()
+        self._store = {}
+        self._by_namespace = {}
+        self._by_name = {}
+        self._by_label = {}
+        self._by_node = {}
+        self._resource_version = None
+        self._stop = threading.Event()
+        self._thread = None
+        self.synced = False
+        self.watching = False
+        self.last_heartbeat = 0.0
+        self.relists = 0
+        self.events = 0
+
+    # ── 인덱스 관리 ─────────────────────────────
+    def _index_keys(self, obj):
+        meta = obj.metadata
+        keys = [("ns", meta.namespace), ("name", meta.name)]
+        for k, v in (meta.labels or {}).items():
+            keys.append(("label", f"{k}={v}"))
+        if self._node_key:
+            node = self._node_key(obj)
+            if node:
+                keys.append(("node", node))
+        return keys
+
+    def _index_map(self, kind):
+        return {
+            "ns": self._by_namespace,
+            "name": self._by_name,
+            "label": self._by_label,
+            "node": self._by_node,
+        }[kind]
+
+    def _add(self, key, obj):
+        self._remove(key)
+        self._store[key] = obj
+        for kind, value in self._index_keys(obj):
+            self._index_map(kind).setdefault(value, set()).add(key)
+
+    def _remove(self, key):
+        old = self._store.pop(key, None)
+        if old is None:
+            return
+        for kind, value in self._index_keys(old):
+            index = self._index_map(kind)
+            bucket = index.get(value)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del index[value]
+
+    def _replace(self, items):
+        with self._lock:
+            self._store = {}
+            self._by_namespace = {}
+            self._by_name = {}
+            self._by_label = {}
+            self._by_node = {}
+            for obj in items:
+                self._add(self._key(obj), obj)
+
+    @staticmethod
+    def _key(obj):
+        return (obj.metadata.namespace, obj.metadata.name)
+
+    # ── 조회 ─────────────────────────────────
+    def is_fresh(self, max_staleness: float = INFORMER_MAX_STALENESS) -> bool:
+        if not self.synced:
+            return False
+        if self.watching:
+            return True
+        return time.monotonic() - self.last_heartbeat <= max_staleness
+
+    def list(self, namespace: str = None, name: str = None,
+             label_selector: str = None, node: str = None) -> list:
+        """
+        인덱스를 사용해 조건에 맞는 오브젝트 목록을 반환합니다.
+        """
+        terms = _parse_selector(label_selector)
+        with self._lock:
+            candidates = None
+            filters = []
+            if namespace is not None:
+                filters.append(self._by_namespace.get(namespace, set()))
+            if name is not None:
+                filters.append(self._by_name.get(name, set()))
+            if node is not None:
+                filters.append(self._by_node.get(node, set()))
+            for op, k, v in terms:
+                if op == "=":
+                    filters.append(self._by_label.get(f"{k}={v}", set()))
+            if filters:
+                filters.sort(key=len)
+                candidates = set(filters[0])
+                for f in filters[1:]:
+                    candidates &= f
+                objs = [self._store[k] for k in candidates]
+            else:
+                objs = list(self._store.values())
+        if terms:
+            objs = [o for o in objs if _match_labels(o.metadata.labels or {}, terms)]
+        return objs
+
+    # ── LIST/WATCH 루프 ─────────────────────────
+    def _relist(self, list_func):
+        resp = list_func()
+        self._replace(resp.items)
+        self._resource_version = resp.metadata.resource_version
+        self.relists += 1
+        self.synced = True
+        self.last_heartbeat = time.monotonic()
+
+    def _watch(self, list_func):
+        w = watch.Watch()
+        self.watching = True
+        try:
+            for event in w.stream(list_func, resource_version=self._resource_version,
+                                  timeout_seconds=INFORMER_WATCH_TIMEOUT,
+                                  allow_watch_bookmarks=True):
+                if self._stop.is_set():
+                    w.stop()
+                    return True
+                etype = event["type"]
+                obj = event["object"]
+                if etype == "ERROR":
+                    # 410 Gone 등: resourceVersion이 만료되어 다시 LIST 필요
+                    return False
+                self.events += 1
+                self.last_heartbeat = time.monotonic()
+                if etype == "BOOKMARK":
+                    self._resource_version = obj["metadata"]["resourceVersion"] \
+                        if isinstance(obj, dict) else obj.metadata.resource_version
+                    continue
+                self._resource_version = obj.metadata.resource_version
+                with self._lock:
+                    if etype == "DELETED":
+                        self._remove(self._key(obj))
+                    else:
+                        self._add(self._key(obj), obj)
+            self.last_heartbeat = time.monotonic()
+            return True
+        finally:
+            self.watching = False
+
+    def _run(self):
+        backoff = 1.0
+        need_list = True
+        while not self._stop.is_set():
+            try:
+                list_func = self._list_func_getter()
+                if need_list:
+                    self._relist(list_func)
+                need_list = not self._watch(list_func)
+                backoff = 1.0
+            except ApiException as e:
+                need_list = True
+                if e.status != 410:
+                    logger.warning("informer %s watch failed: %s", self.kind, e)
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, 30.0)
+            except Exception as e:
+                need_list = True
+                logger.warning("informer %s failed: %s", self.kind, e)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 30.0)
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"informer-{self.kind}", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    def stats(self) -> dict:
+        with self._lock:
+            size = len(self._store)
+        return {
+            "synced": self.synced,
+            "watching": self.watching,
+            "objects": size,
+            "relists": self.relists,
+            "events": self.events,
+            "heartbeat_age": round(time.monotonic() - self.last_heartbeat, 3) if self.synced else None,
+        }
+
+
+_reflectors = {}
+_reflectors_lock = threading.Lock()
+
+
+def start_informers(kinds: list = None) -> dict:
+    """
+    지정한 리소스 종류(기본: 전체)의 공유 리플렉터를 시작합니다.
+    """
+    with _reflectors_lock:
+        for kind in kinds or list(_KINDS):
+            reflector = _reflectors.get(kind)
+            if reflector is None:
+                getter, node_key = _KINDS[kind]
+                reflector = Reflector(kind, getter, node_key)
+                _reflectors[kind] = reflector
+            reflector.start()
+    return informer_stats()
+
+
+def stop_informers():
+    with _reflectors_lock:
+        for reflector in _reflectors.values():
+            reflector.stop()
+
+
+def cached_list(kind: str, max_staleness: float = INFORMER_MAX_STALENESS, **filters):
+    """
+    캐시가 동기화되어 있고 허용 지연 이내면 목록을, 아니면 None을 반환합니다.
+    """
+    reflector = _reflectors.get(kind)
+    if reflector is None or not reflector.is_fresh(max_staleness):
+        return None
+    return reflector.list(**filters)
+
+
+def informer_stats() -> dict:
+    return {kind: r.stats() for kind, r in _reflectors.items()}
@@ -0,0 +1,124 @@
+# tools/kubernetes/listing.py
+"""
+페이지 단위 LIST와 필드 프로젝션 도우미.
+
+list_page()는 _preload_content=False로 응답 JSON을 직접 디코딩해 kubernetes-client
+모델 역직렬화를 건너뛰고, limit/continue 페이지네이션과 레이블/필드 셀렉터를 지원합니다.
+project()는 필요한 필드만 뽑아내며, JSON dict(camelCase)와 모델 객체(snake_case)
+모두에 같은 경로 표기("spec.nodeName")로 동작하므로 인포머 캐시 결과에도 쓸 수 있습니다.
+"""
+import json
+import re
+from functools import lru_cache
+
+DEFAULT_PAGE_SIZE = 500
+
+
+@lru_cache(maxsize=256)
+def _snake(name: str) -> str:
+    return re.sub(r"(?<!^)(?=[A-Z])", "_", name).lower()
+
+
+def field(obj, path: str, default=None):
+    """
+    점으로 구분된 camelCase 경로의 값을 반환합니다. 중간 값이 없으면 default.
+    """
+    for part in path.split("."):
+        if obj is None:
+            return default
+        if isinstance(obj, dict):
+            obj = obj.get(part)
+        else:
+            obj = getattr(obj, _snake(part), None)
+    return default if obj is None else obj
+
+
+def project(obj, fields: dict) -> dict:
+    """
+    fields: {출력 키: (경로, 기본값)} 정의에 따라 필요한 필드만 추출합니다.
+    """
+    return {key: field(obj, path, default) for key, (path, default) in fields.items()}
+
+
+def list_page(list_func, *args, limit: int = None, continue_token: str = None,
+              label_selector: str = None, field_selector: str = None, **kwargs) -> dict:
+    """
+    LIST 한 페이지를 원시 JSON으로 조회합니다.
+    반환: {"items": [dict, ...], "continue": 다음 페이지 토큰 또는 None, "resource_version": str}
+    """
+    params = {
+        "limit": limit,
+        "_continue": continue_token,
+        "label_selector": label_selector,
+        "field_selector": field_selector,
+    }
+    params = {k: v for k, v in params.items() if v}
+    resp = list_func(*args, _preload_content=False, **params, **kwargs)
+    try:
+        body = json.loads(resp.data)
+    finally:
+        resp.release_conn()
+    meta = body.get("metadata") or {}
+    return {
+        "items": body.get("items") or [],
+        "continue": meta.get("continue") or None,
+        "resource_version": meta.get("resourceVersion"),
+    }
+
+
+def iter_pages(list_func, *args, page_size: int = DEFAULT_PAGE_SIZE, fields: dict = None, **kwargs):
+    """
+    continue 토큰을 따라가며 페이지(원시 dict 목록 또는 프로젝션 결과 목록)를 차례로 yield합니다.
+    전체 결과를 메모리에 모으지 않고 페이지 단위로 처리할 때 사용합니다
+    (all_namespaces 조회의 fanout.paged_by_namespace, 이벤트 집계 등).
+    """
+    token = None
+    while True:
+        page = list_page(list_func, *args, limit=page_size, continue_token=token, **kwargs)
+        items = page["items"]
+        yield [project(item, fields) for item in items] if fields else items
+        token = page["continue"]
+        if not token:
+            return
+
+
+# 도구별 프로젝션 정의: {출력 키: (경로, 기본값)}
+POD_FIELDS = {
+    "name": ("metadata.name", None),
+    "status": ("status.phase", None),
+    "node": ("spec.nodeName", "Unknown"),
+}
+
+DEPLOYMENT_FIELDS = {
+    "name": ("metadata.name", None),
+    "ready": ("status.readyReplicas", 0),
+    "available": ("status.availableReplicas", 0),
+    "desired": ("spec.replicas", None),
+}
+
+STATEFULSET_FIELDS = {
+    "name": ("metadata.name", None),
+    "ready": ("status.readyReplicas", 0),
+    "current": ("status.currentReplicas", 0),
+    "desired": ("spec.replicas", None),
+}
+
+HPA_FIELDS = {
+    "name": ("metadata.name", None),
+    "target_kind": ("spec.scaleTargetRef.kind", None),
+    "target_name": ("spec.scaleTargetRef.name", None),
+    "min_replicas": ("spec.minReplicas", None),
+    "max_replicas": ("spec.maxReplicas", None),
+    "current_replicas": ("status.currentReplicas", None),
+}
+
+EVENT_FIELDS = {
+    "type": ("type", None),
+    "reason": ("reason", None),
+    "message": ("message", None),
+    "count": ("count", None),
+    "first_timestamp": ("firstTimestamp", None),
+    "last_timestamp": ("lastTimestamp", None),
+    "kind": ("involvedObject.kind", None),
+    "name": ("involvedObject.name", None),
+}
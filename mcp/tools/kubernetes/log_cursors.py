@@ -0,0 +1,121 @@
+# tools/kubernetes/log_cursors.py
+"""
+증분 로그 분석을 위한 컨테이너별 커서 저장소.
+
+(namespace, pod, container, instance) 키마다 마지막으로 읽은 로그 타임스탬프와
+누적 집계를 보관합니다. instance는 "파드 UID/재시작 횟수"로, 컨테이너가 재시작되면
+새 커서로 처음부터 읽습니다. LOG_CURSOR_DB를 지정하면 sqlite(WAL)에 함께 저장해
+프로세스 재시작 후에도 이어서 분석합니다.
+"""
+import json
+import os
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+LOG_CURSOR_DB = os.getenv("LOG_CURSOR_DB", "")
+# 갱신되지 않은 커서를 정리하는 기준(초)
+LOG_CURSOR_TTL = int(os.getenv("LOG_CURSOR_TTL", str(24 * 3600)))
+_PRUNE_INTERVAL = 60
+
+
+def ts_key(ts: bytes) -> str:
+    """
+    RFC3339Nano 타임스탬프(소수부 길이가 가변)를 문자열 비교 가능한 형태로 정규화합니다.
+    """
+    head, _, frac = ts.rstrip(b"Z").partition(b".")
+    return (head + b"." + frac.ljust(9, b"0")).decode("ascii", "replace")
+
+
+def seconds_since(key: str) -> float:
+    """
+    정규화된 타임스탬프로부터 현재까지 경과한 시간(초)을 반환합니다.
+    """
+    head, _, frac = key.partition(".")
+    dt = datetime.strptime(head, "%Y-%m-%dT%H:%M:%S").replace(tzinfo=timezone.utc)
+    return datetime.now(timezone.utc).timestamp() - dt.timestamp() - int(frac or 0) / 1e9
+
+
+class LogCursorStore:
+    """
+    메모리 커서 저장소 (선택적으로 sqlite 영속화).
+    """
+
+    def __init__(self, db_path: str = LOG_CURSOR_DB, ttl: int = LOG_CURSOR_TTL):
+        self._lock = threading.Lock()
+        self._cursors = {}
+        self._ttl = ttl
+        self._last_prune = time.time()
+        self._db = None
+        if db_path:
+            self._db = sqlite3.connect(db_path, check_same_thread=False)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.execute(
+                "CREATE TABLE IF NOT EXISTS log_cursors ("
+                " namespace TEXT, pod TEXT, container TEXT, instance TEXT,"
+                " last_ts TEXT, totals TEXT, updated_at REAL,"
+                " PRIMARY KEY (namespace, pod, container, instance))"
+            )
+            self._db.execute("CREATE INDEX IF NOT EXISTS idx_log_cursors_updated ON log_cursors(updated_at)")
+            self._db.commit()
+            self._load()
+
+    def _load(self):
+        cutoff = time.time() - self._ttl
+        rows = self._db.execute(
+            "SELECT namespace, pod, container, instance, last_ts, totals, updated_at"
+            " FROM log_cursors WHERE updated_at >= ?", (cutoff,)
+        )
+        for ns, pod, container, instance, last_ts, totals, updated_at in rows:
+            self._cursors[(ns, pod, container, instance)] = {
+                "last_ts": last_ts,
+                "totals": json.loads(totals),
+                "updated_at": updated_at,
+            }
+
+    def get(self, key: tuple):
+        with self._lock:
+            cursor = self._cursors.get(key)
+            return dict(cursor, totals=dict(cursor["totals"])) if cursor else None
+
+    def put(self, key: tuple, last_ts: str, totals: dict):
+        now = time.time()
+        with self._lock:
+            self._cursors[key] = {"last_ts": last_ts, "totals": dict(totals), "updated_at": now}
+            if self._db is not None:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO log_cursors VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (*key, last_ts, json.dumps(totals), now)
+                )
+                self._db.commit()
+            if now - self._last_prune >= _PRUNE_INTERVAL:
+                self._prune(now)
+
+    def _prune(self, now: float):
+        cutoff = now - self._ttl
+        for key in [k for k, c in self._cursors.items() if c["updated_at"] < cutoff]:
+            del self._cursors[key]
+        if self._db is not None:
+            self._db.execute("DELETE FROM log_cursors WHERE updated_at < ?", (cutoff,))
+            self._db.commit()
+        self._last_prune = now
+
+    def reset(self, namespace: str = None):
+        """
+        커서를 초기화합니다 (namespace 지정 시 해당 네임스페이스만).
+        """
+        with self._lock:
+            keys = [k for k in self._cursors if namespace is None or k[0] == namespace]
+            for key in keys:
+                del self._cursors[key]
+            if self._db is not None:
+                if namespace is None:
+                    self._db.execute("DELETE FROM log_cursors")
+                else:
+                    self._db.execute("DELETE FROM log_cursors WHERE namespace = ?", (namespace,))
+                self._db.commit()
+
+
+cursor_store = LogCursorStore()
@@ -0,0 +1,291 @@
+# tools/kubernetes/manifests.py
+"""
+여러 문서/여러 Kind YAML 번들 적용.
+
+- 문서를 하나씩 읽어(yaml.safe_load_all) 각 오브젝트를 (apiVersion, kind)로 REST 리소스에 매핑합니다.
+  매핑은 DynamicClient의 디스커버리 결과를 캐시해 재사용하며, 모르는 Kind를 만나거나
+  번들이 CRD를 만든 뒤에만 디스커버리를 다시 조회합니다.
+- 서버 측 적용(server-side apply)으로 보내므로 같은 번들을 여러 번 적용해도 결과가 같습니다.
+- Namespace/CRD -> 설정/권한 -> Service -> 워크로드 -> 부가 리소스 순의 단계로 나누고,
+  같은 단계의 오브젝트는 제한된 스레드 풀로 동시에 보냅니다.
+- dry_run=True면 서버 측 dryRun=All로 번들 전체를 한 번에 검증하고 아무것도 저장하지 않습니다.
+"""
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import yaml
+from kubernetes.client.exceptions import ApiException
+from kubernetes.dynamic import DynamicClient
+from kubernetes.dynamic.exceptions import ResourceNotFoundError
+
+from .helpers import registry
+
+K8S_APPLY_WORKERS = int(os.getenv("K8S_APPLY_WORKERS", "8"))
+# 디스커버리 결과를 다시 조회하지 않고 재사용하는 시간(초)
+K8S_DISCOVERY_TTL = float(os.getenv("K8S_DISCOVERY_TTL", "600"))
+FIELD_MANAGER = os.getenv("K8S_FIELD_MANAGER", "k8s-aws-copilot")
+# 번들에서 만든 CRD의 Kind가 디스커버리에 나타나기를 기다리는 최대 시간(초)
+_CRD_WAIT = 15
+
+# 적용 단계: 숫자가 작은 단계가 모두 끝난 뒤 다음 단계를 보냅니다. 목록에 없는 Kind(CR 등)는 마지막.
+_TIERS = {
+    "Namespace": 0,
+    "CustomResourceDefinition": 0,
+    "PriorityClass": 1,
+    "StorageClass": 1,
+    "PersistentVolume": 1,
+    "ServiceAccount": 1,
+    "Secret": 1,
+    "ConfigMap": 1,
+    "LimitRange": 1,
+    "ResourceQuota": 1,
+    "ClusterRole": 1,
+    "Role": 1,
+    "PersistentVolumeClaim": 2,
+    "ClusterRoleBinding": 2,
+    "RoleBinding": 2,
+    "Service": 2,
+    "DaemonSet": 3,
+    "Deployment": 3,
+    "StatefulSet": 3,
+    "ReplicaSet": 3,
+    "Pod": 3,
+    "Job": 3,
+    "CronJob": 3,
+    "HorizontalPodAutoscaler": 4,
+    "PodDisruptionBudget": 4,
+    "Ingress": 4,
+    "NetworkPolicy": 4,
+}
+_LAST_TIER = 5
+
+
+class RestMapper:
+    """
+    (apiVersion, kind) -> DynamicClient 리소스 매핑 캐시.
+    공유 ApiClient가 다시 만들어지면(kubeconfig 변경) 디스커버리도 새로 합니다.
+    DynamicClient의 디스커버리 캐시(LazyDiscoverer)는 스레드 안전하지 않으므로
+    조회(resources.get)와 갱신(invalidate_cache)을 모두 같은 잠금 안에서 수행합니다.
+    """
+
+    def __init__(self, ttl: float = K8S_DISCOVERY_TTL):
+        self._ttl = ttl
+        self._lock = threading.Lock()
+        self._client = None
+        self._api_client = None
+        self._loaded_at = 0.0
+        self._resources = {}
+        self.hits = 0
+        self.misses = 0
+        self.refreshes = 0
+
+    def client(self) -> DynamicClient:
+        api_client = registry.api_client()
+        with self._lock:
+            if self._client is None or self._api_client is not api_client:
+                self._client = DynamicClient(api_client)
+                self._api_client = api_client
+                self._resources = {}
+                self._loaded_at = time.monotonic()
+            elif time.monotonic() - self._loaded_at > self._ttl:
+                self._refresh()
+            return self._client
+
+    def _refresh(self):
+        self._client.resources.invalidate_cache()
+        self._resources = {}
+        self._loaded_at = time.monotonic()
+        self.refreshes += 1
+
+    def invalidate(self):
+        """
+        CRD를 만든 뒤처럼 서버의 API 목록이 바뀌었을 때 호출합니다.
+        """
+        with self._lock:
+            if self._client is not None:
+                self._refresh()
+
+    def resource(self, api_version: str, kind: str):
+        dyn = self.client()
+        key = (api_version, kind)
+        with self._lock:
+            found = self._resources.get(key)
+            if found is not None:
+                self.hits += 1
+                return found
+            self.misses += 1
+            try:
+                found = dyn.resources.get(api_version=api_version, kind=kind)
+            except ResourceNotFoundError:
+                # 캐시된 디스커버리에 없는 Kind면 한 번만 다시 조회
+                self._refresh()
+                found = dyn.resources.get(api_version=api_version, kind=kind)
+            self._resources[key] = found
+            return found
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "kinds": len(self._resources),
+                "hits": self.hits,
+                "misses": self.misses,
+                "refreshes": self.refreshes,
+            }
+
+
+mapper = RestMapper()
+
+
+def _documents(yaml_content: str):
+    """
+    문서를 하나씩 읽어 (문서 번호, 오브젝트)를 돌려줍니다. kind: List는 items로 펼칩니다.
+    """
+    for index, doc in enumerate(yaml.safe_load_all(yaml_content)):
+        if not doc:
+            continue
+        if not isinstance(doc, dict):
+            raise ValueError(f"문서 {index}: 오브젝트(매핑)가 아닙니다")
+        kind = doc.get("kind") or ""
+        if isinstance(kind, str) and kind.endswith("List") and isinstance(doc.get("items"), list):
+            for item in doc["items"]:
+                if not isinstance(item, dict):
+                    raise ValueError(f"문서 {index}: items의 항목이 오브젝트(매핑)가 아닙니다")
+                yield index, item
+        else:
+            yield index, doc
+
+
+def _crd_kinds(objects: list) -> set:
+    """
+    번들에 포함된 CRD가 정의하는 (group, kind) 목록.
+    """
+    kinds = set()
+    for obj in objects:
+        if obj.get("kind") == "CustomResourceDefinition":
+            spec = obj.get("spec")
+            names = spec.get("names") if isinstance(spec, dict) else None
+            if isinstance(names, dict):
+                kinds.add((spec.get("group"), names.get("kind")))
+    return kinds
+
+
+def _group(api_version: str) -> str:
+    return api_version.split("/", 1)[0] if "/" in api_version else ""
+
+
+def _error_message(e: Exception) -> str:
+    if isinstance(e, ApiException):
+        return f"{e.status} {e.reason}: {e.body}" if e.body else f"{e.status} {e.reason}"
+    return str(e)
+
+
+def apply_yaml(yaml_content: str, default_namespace: str = "default", dry_run: bool = False,
+               force_conflicts: bool = False) -> dict:
+    """
+    여러 문서로 된 YAML 번들을 서버 측 적용(server-side apply)으로 반영합니다.
+    Kind 제한 없이 디스커버리로 API를 찾고, Namespace/CRD부터 의존 순서대로 단계별 동시 적용합니다.
+    metadata.namespace가 없는 네임스페이스 리소스는 default_namespace에 적용합니다.
+    dry_run=True면 저장하지 않고 서버 검증만 수행합니다.
+    force_conflicts=True면 다른 관리자(kubectl 등)가 소유한 필드도 덮어씁니다.
+    """
+    started = time.perf_counter()
+    try:
+        objects = list(_documents(yaml_content))
+    except (yaml.YAMLError, ValueError) as e:
+        return {"status": "error", "message": f"YAML 파싱 실패: {e}"}
+    if not objects:
+        return {"status": "error", "message": "적용할 오브젝트가 없습니다"}
+
+    results = []
+    valid = []
+    for index, obj in objects:
+        meta = obj.get("metadata")
+        if not isinstance(meta, dict):
+            meta = {}
+        entry = {"document": index, "kind": obj.get("kind"), "name": meta.get("name")}
+        # 값이 없거나(null 포함) 문자열이 아니면 누락으로 처리
+        missing = [f for f in ("apiVersion", "kind") if not isinstance(obj.get(f), str) or not obj.get(f)]
+        if not isinstance(meta.get("name"), str) or not meta.get("name"):
+            missing.append("metadata.name")
+        if missing:
+            results.append({**entry, "status": "error", "message": f"필수 필드 누락 또는 형식 오류: {', '.join(missing)}"})
+        else:
+            valid.append((entry, obj))
+
+    bundle_namespaces = {obj["metadata"]["name"] for _, obj in valid if obj["kind"] == "Namespace"}
+    bundle_crds = _crd_kinds([obj for _, obj in valid])
+
+    def resolve(obj):
+        # 번들에서 방금 만든 CRD는 Established 될 때까지 디스커버리에 늦게 나타날 수 있음
+        defined_here = (_group(obj["apiVersion"]), obj["kind"]) in bundle_crds
+        deadline = time.monotonic() + (_CRD_WAIT if defined_here and not dry_run else 0)
+        delay = 0.5
+        while True:
+            try:
+                return mapper.resource(obj["apiVersion"], obj["kind"])
+            except ResourceNotFoundError:
+                if time.monotonic() + delay > deadline:
+                    raise
+                time.sleep(delay)
+                delay = min(delay * 2, 4)
+
+    def apply_one(item):
+        entry, obj = item
+        entry = dict(entry)
+        try:
+            resource = resolve(obj)
+        except ResourceNotFoundError:
+            if dry_run and (_group(obj["apiVersion"]), obj["kind"]) in bundle_crds:
+                return {**entry, "status": "skipped", "message": "번들의 CRD가 아직 없어 검증을 생략했습니다"}
+            return {**entry, "status": "error", "message": f"알 수 없는 리소스: {obj['apiVersion']}/{obj['kind']}"}
+        except Exception as e:
+            return {**entry, "status": "error", "message": _error_message(e)}
+        namespace = None
+        if resource.namespaced:
+            namespace = obj["metadata"].get("namespace") or default_namespace
+            entry["namespace"] = namespace
+        try:
+            resp = mapper.client().server_side_apply(
+                resource, body=obj, name=obj["metadata"]["name"], namespace=namespace,
+                field_manager=FIELD_MANAGER, force_conflicts=force_conflicts or None,
+                dry_run="All" if dry_run else None
+            )
+            meta = resp.metadata
+            return {**entry, "status": "success", "uid": meta.uid, "resource_version": meta.resourceVersion}
+        except ApiException as e:
+            if dry_run and e.status == 404 and namespace in bundle_namespaces:
+                return {**entry, "status": "skipped", "message": "번들의 Namespace가 아직 없어 검증을 생략했습니다"}
+            return {**entry, "status": "error", "message": _error_message(e)}
+        except Exception as e:
+            return {**entry, "status": "error", "message": _error_message(e)}
+
+    tiers = {}
+    for item in valid:
+        tiers.setdefault(_TIERS.get(item[1]["kind"], _LAST_TIER), []).append(item)
+    workers = max(1, min(K8S_APPLY_WORKERS, len(valid) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="k8s-apply") as pool:
+        for tier in sorted(tiers):
+            tier_results = list(pool.map(apply_one, tiers[tier]))
+            results.extend(tier_results)
+            # 새 CRD가 등록됐으면 이후 단계의 CR을 찾을 수 있도록 디스커버리 갱신
+            if not dry_run and any(r["kind"] == "CustomResourceDefinition" and r["status"] == "success"
+                                   for r in tier_results):
+                mapper.invalidate()
+
+    results.sort(key=lambda r: r["document"])
+    failed = sum(1 for r in results if r["status"] == "error")
+    if not failed:
+        status = "success"
+    else:
+        status = "partial" if failed < len(results) else "error"
+    return {
+        "status": status,
+        "dry_run": dry_run,
+        "total": len(results),
+        "applied": sum(1 for r in results if r["status"] == "success"),
+        "failed": failed,
+        "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+        "results": results
+    }
@@ -0,0 +1,226 @@
+# tools/kubernetes/metrics_history.py
+"""
+metrics.k8s.io 시계열 샘플러와 추세 조회 도구.
+
+백그라운드 스레드가 METRICS_SAMPLE_INTERVAL 간격으로 노드/파드 메트릭을 한 번씩 LIST해
+노드, 파드, 컨테이너별 고정 크기 링 버퍼(array 기반, 값 float32)에 저장합니다.
+get_metrics_trend는 API 서버를 호출하지 않고 버퍼만으로 변화율, 이동 평균,
+최소/최대/p95를 계산합니다. 메모리 사용량은 시리즈 수 × 버퍼 크기 × 12바이트로 제한됩니다.
+"""
+import logging
+import os
+import threading
+import time
+from array import array
+from typing import Any, Dict
+
+from .helpers import custom_objects
+from .quantity import parse_quantity, percentile
+
+logger = logging.getLogger(__name__)
+
+METRICS_SAMPLER_ENABLED = os.getenv("METRICS_SAMPLER", "false").lower() in ("1", "true", "yes")
+METRICS_SAMPLE_INTERVAL = float(os.getenv("METRICS_SAMPLE_INTERVAL", "30"))
+# 시리즈당 보관 샘플 수 (기본 240 × 30초 = 2시간)
+METRICS_HISTORY_SIZE = int(os.getenv("METRICS_HISTORY_SIZE", "240"))
+METRICS_MAX_SERIES = int(os.getenv("METRICS_MAX_SERIES", "20000"))
+# 이 횟수만큼 연속으로 갱신되지 않은 시리즈(삭제된 파드 등)는 정리
+_STALE_INTERVALS = 10
+_KI = 1024.0
+
+
+class RingBuffer:
+    """
+    (타임스탬프, 값) 고정 크기 링 버퍼. 타임스탬프는 float64, 값은 float32로 보관합니다.
+    """
+    __slots__ = ("_ts", "_values", "_capacity", "_pos", "_count")
+
+    def __init__(self, capacity: int):
+        self._ts = array("d", bytes(8 * capacity))
+        self._values = array("f", bytes(4 * capacity))
+        self._capacity = capacity
+        self._pos = 0
+        self._count = 0
+
+    def append(self, ts: float, value: float):
+        self._ts[self._pos] = ts
+        self._values[self._pos] = value
+        self._pos = (self._pos + 1) % self._capacity
+        self._count = min(self._count + 1, self._capacity)
+
+    @property
+    def last_ts(self) -> float:
+        return self._ts[self._pos - 1] if self._count else 0.0
+
+    def window(self, since: float):
+        """
+        since 이후의 샘플을 시간순 (타임스탬프 목록, 값 목록)으로 반환합니다.
+        """
+        start = (self._pos - self._count) % self._capacity
+        ts, values = [], []
+        for k in range(self._count):
+            i = (start + k) % self._capacity
+            if self._ts[i] >= since:
+                ts.append(self._ts[i])
+                values.append(self._values[i])
+        return ts, values
+
+
+class MetricsSampler:
+    """
+    노드/파드/컨테이너별 CPU(코어)·메모리(Ki) 시계열을 수집하는 백그라운드 샘플러.
+    """
+
+    def __init__(self, interval: float = METRICS_SAMPLE_INTERVAL, size: int = METRICS_HISTORY_SIZE,
+                 max_series: int = METRICS_MAX_SERIES):
+        self.interval = interval
+        self._size = size
+        self._max_series = max_series
+        self._lock = threading.Lock()
+        self._series = {}
+        self._stop = threading.Event()
+        self._thread = None
+        self.samples = 0
+        self.dropped_series = 0
+        self.last_error = None
+
+    def _record(self, key: tuple, ts: float, value: float):
+        buf = self._series.get(key)
+        if buf is None:
+            if len(self._series) >= self._max_series:
+                self.dropped_series += 1
+                return
+            buf = RingBuffer(self._size)
+            self._series[key] = buf
+        buf.append(ts, value)
+
+    def sample_once(self):
+        custom = custom_objects()
+        nodes = custom.list_cluster_custom_object(group="metrics.k8s.io", version="v1beta1", plural="nodes")
+        pods = custom.list_cluster_custom_object(group="metrics.k8s.io", version="v1beta1", plural="pods")
+        now = time.time()
+        with self._lock:
+            for item in nodes["items"]:
+                name = item["metadata"]["name"]
+                self._record(("node", None, name, "cpu"), now, parse_quantity(item["usage"]["cpu"]))
+                self._record(("node", None, name, "memory"), now, parse_quantity(item["usage"]["memory"]) / _KI)
+            for item in pods["items"]:
+                ns = item["metadata"]["namespace"]
+                pod = item["metadata"]["name"]
+                pod_cpu = pod_memory = 0.0
+                for c in item["containers"]:
+                    cpu = parse_quantity(c["usage"]["cpu"])
+                    memory = parse_quantity(c["usage"]["memory"]) / _KI
+                    pod_cpu += cpu
+                    pod_memory += memory
+                    self._record(("container", ns, f"{pod}/{c['name']}", "cpu"), now, cpu)
+                    self._record(("container", ns, f"{pod}/{c['name']}", "memory"), now, memory)
+                self._record(("pod", ns, pod, "cpu"), now, pod_cpu)
+                self._record(("pod", ns, pod, "memory"), now, pod_memory)
+            cutoff = now - self.interval * _STALE_INTERVALS
+            for key in [k for k, buf in self._series.items() if buf.last_ts < cutoff]:
+                del self._series[key]
+        self.samples += 1
+
+    def _run(self):
+        while not self._stop.is_set():
+            started = time.monotonic()
+            try:
+                self.sample_once()
+                self.last_error = None
+            except Exception as e:
+                self.last_error = str(e)
+                logger.warning("metrics sampler failed: %s", e)
+            self._stop.wait(max(0.0, self.interval - (time.monotonic() - started)))
+
+    def start(self):
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="metrics-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        self._stop.set()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._thread and self._thread.is_alive())
+
+    def windows(self, kind: str, namespace: str, name: str, metric: str, since: float) -> dict:
+        with self._lock:
+            matched = [
+                (key, buf) for key, buf in self._series.items()
+                if key[0] == kind and key[3] == metric
+                and (namespace is None or key[1] == namespace)
+                and (name is None or key[2] == name)
+            ]
+            return {key: buf.window(since) for key, buf in matched}
+
+    def stats(self) -> dict:
+        with self._lock:
+            series = len(self._series)
+        return {
+            "running": self.running,
+            "interval": self.interval,
+            "series": series,
+            "samples": self.samples,
+            "dropped_series": self.dropped_series,
+            "memory_bytes": series * self._size * 12,
+            "last_error": self.last_error,
+        }
+
+
+sampler = MetricsSampler()
+
+
+def _trend(ts: list, values: list, moving_window: int) -> Dict[str, Any]:
+    elapsed = ts[-1] - ts[0]
+    tail = values[-moving_window:]
+    stats = {
+        "latest": values[-1],
+        "min": min(values),
+        "max": max(values),
+        "mean": sum(values) / len(values),
+        "p95": percentile(values, 95),
+        "moving_average": sum(tail) / len(tail),
+        "rate_per_minute": (values[-1] - values[0]) / elapsed * 60 if elapsed > 0 else 0.0,
+    }
+    # float32 저장값이므로 유효 자릿수 이상은 반올림
+    return {"samples": len(values), **{k: round(float(v), 6) for k, v in stats.items()}}
+
+
+def get_metrics_trend(kind: str = "pod", name: str = None, namespace: str = None,
+                      metric: str = "cpu", window_minutes: int = 15,
+                      moving_window: int = 5, top_n: int = 10) -> Dict[str, Any]:
+    """
+    샘플러에 저장된 시계열로 노드/파드/컨테이너의 추세를 계산합니다 (API 서버 호출 없음).
+    kind: node | pod | container, metric: cpu(코어) | memory(Ki)
+    name을 생략하면 평균값 기준 상위 top_n개 시리즈를 반환합니다.
+    """
+    if kind not in ("node", "pod", "container"):
+        return {"error": f"지원하지 않는 kind: {kind} (node, pod, container)"}
+    if metric not in ("cpu", "memory"):
+        return {"error": f"지원하지 않는 metric: {metric} (cpu, memory)"}
+    if not sampler.running:
+        sampler.start()
+        return {"status": "warming_up", "message": "메트릭 샘플러를 시작했습니다. 잠시 후 다시 조회하세요.",
+                "sampler": sampler.stats()}
+
+    since = time.time() - window_minutes * 60
+    series = []
+    for (k, ns, series_name, _), (ts, values) in sampler.windows(
+            kind, namespace if kind != "node" else None, name, metric, since).items():
+        if not values:
+            continue
+        series.append({"name": series_name, "namespace": ns, **_trend(ts, values, moving_window)})
+    series.sort(key=lambda s: s["mean"], reverse=True)
+
+    return {
+        "kind": kind,
+        "metric": metric,
+        "unit": "cores" if metric == "cpu" else "Ki",
+        "window_minutes": window_minutes,
+        "series": series if name else series[:top_n],
+        "sampler": sampler.stats(),
+    }
@@ -1,114 +1,218 @@
-from kubernetes import client, config
+from kubernetes import client
+from .helpers import apps_v1, core_v1, custom_objects
+from .informers import cached_list
+from .listing import EVENT_FIELDS, iter_pages, list_page, project
+from .fanout import cluster_scoped, fan_out, group_by_namespace
+from .log_cursors import cursor_store, seconds_since, ts_key
+from .log_patterns import get_engine
+from .quantity import group_by, parse_quantities, percentages, percentile, sum_by_index, top_indices, total
 from typing import Dict, List, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+import math
+import os
 import time
 from datetime import datetime, timedelta
 
+# 로그 분석 동시 실행 수와 파드당 읽기 상한
+LOG_ANALYSIS_PARALLELISM = int(os.getenv("LOG_ANALYSIS_PARALLELISM", "8"))
+LOG_MAX_BYTES_PER_POD = int(os.getenv("LOG_MAX_BYTES_PER_POD", str(16 * 1024 * 1024)))
+LOG_MAX_LINES_PER_POD = int(os.getenv("LOG_MAX_LINES_PER_POD", "200000"))
+_LOG_CHUNK_SIZE = 64 * 1024
+# 증분 분석 시 커서보다 조금 앞에서부터 읽어 시계 오차를 흡수 (중복 줄은 커서로 걸러냄)
+_CURSOR_SLACK_SECONDS = 5
+_KI = 1024.0
+
+def _distribution(values) -> Dict[str, float]:
+    return {
+        "p50": percentile(values, 50),
+        "p95": percentile(values, 95),
+        "max": percentile(values, 100)
+    }
+
 def get_cluster_metrics() -> Dict[str, Any]:
     """
-    클러스터 전반적인 메트릭 수집
+    클러스터 전반적인 메트릭 수집 (CPU: 코어, 메모리: Ki)
     """
     try:
-        v1 = client.CoreV1Api()
-        custom = client.CustomObjectsApi()
+        custom = custom_objects()
         
         # 노드 메트릭 수집
-        nodes = v1.list_node()
+        nodes = cached_list("nodes")
+        if nodes is None:
+            nodes = core_v1().list_node().items
         node_metrics = custom.list_cluster_custom_object(
             group="metrics.k8s.io",
             version="v1beta1",
             plural="nodes"
-        )
-        
-        # 전체 클러스터 리소스 사용량 계산
-        total_cpu_capacity = 0
-        total_memory_capacity = 0
-        total_cpu_usage = 0
-        total_memory_usage = 0
+        )['items']
         
-        for node in nodes.items:
-            cpu = int(node.status.capacity['cpu'])
-            memory = int(node.status.capacity['memory'].replace('Ki', ''))
-            total_cpu_capacity += cpu
-            total_memory_capacity += memory
-            
-        for metric in node_metrics['items']:
-            cpu_usage = int(metric['usage']['cpu'].replace('n', '')) / 1000000000
-            memory_usage = int(metric['usage']['memory'].replace('Ki', ''))
-            total_cpu_usage += cpu_usage
-            total_memory_usage += memory_usage
+        # 전체 클러스터 리소스 사용량 계산 (일괄 파싱 후 벡터 집계)
+        cpu_capacity = parse_quantities(n.status.capacity['cpu'] for n in nodes)
+        memory_capacity = parse_quantities((n.status.capacity['memory'] for n in nodes), unit=_KI)
+        cpu_usage = parse_quantities(m['usage']['cpu'] for m in node_metrics)
+        memory_usage = parse_quantities((m['usage']['memory'] for m in node_metrics), unit=_KI)
+
+        total_cpu_capacity = total(cpu_capacity)
+        total_memory_capacity = total(memory_capacity)
+        total_cpu_usage = total(cpu_usage)
+        total_memory_usage = total(memory_usage)
+
+        # 노드별 사용률 (메트릭 순서에 맞춰 용량 정렬)
+        node_index = {n.metadata.name: i for i, n in enumerate(nodes)}
+        aligned = [node_index.get(m['metadata']['name']) for m in node_metrics]
+        metric_names = [m['metadata']['name'] for m in node_metrics]
+        node_cpu_pct = percentages(cpu_usage, [cpu_capacity[i] if i is not None else 0 for i in aligned])
+        node_memory_pct = percentages(memory_usage, [memory_capacity[i] if i is not None else 0 for i in aligned])
             
         return {
             "cluster_metrics": {
                 "cpu": {
                     "capacity": total_cpu_capacity,
                     "usage": total_cpu_usage,
-                    "usage_percentage": (total_cpu_usage / total_cpu_capacity) * 100
+                    "usage_percentage": (total_cpu_usage / total_cpu_capacity) * 100 if total_cpu_capacity else 0
                 },
                 "memory": {
                     "capacity": total_memory_capacity,
                     "usage": total_memory_usage,
-                    "usage_percentage": (total_memory_usage / total_memory_capacity) * 100
+                    "usage_percentage": (total_memory_usage / total_memory_capacity) * 100 if total_memory_capacity else 0
                 }
+            },
+            "node_usage_percentage": {
+                "cpu": _distribution(node_cpu_pct),
+                "memory": _distribution(node_memory_pct),
+                "top_cpu": [
+                    {"node": metric_names[i], "usage_percentage": float(node_cpu_pct[i])}
+                    for i in top_indices(node_cpu_pct, 3)
+                ],
+                "top_memory": [
+                    {"node": metric_names[i], "usage_percentage": float(node_memory_pct[i])}
+                    for i in top_indices(node_memory_pct, 3)
+                ]
             }
         }
     except Exception as e:
         return {"error": f"Failed to get cluster metrics: {str(e)}"}
 
-def get_pod_metrics(namespace: str = "default") -> Dict[str, Any]:
+def _flatten_pod_metrics(items: list):
     """
-    네임스페이스별 파드 메트릭 수집
+    metrics.k8s.io 파드 메트릭을 컨테이너 단위 배열(CPU 코어, 메모리 Ki)과 파드 인덱스로 펼칩니다.
     """
+    pod_index = []
+    cpu_values = []
+    memory_values = []
+    for i, pod in enumerate(items):
+        for container in pod['containers']:
+            pod_index.append(i)
+            cpu_values.append(container['usage']['cpu'])
+            memory_values.append(container['usage']['memory'])
+    return pod_index, parse_quantities(cpu_values), parse_quantities(memory_values, unit=_KI)
+
+def _metrics_by_pod(pod_metrics: list) -> Dict[str, Any]:
+    """
+    metrics.k8s.io 파드 메트릭 목록을 파드/컨테이너별 사용량으로 변환합니다.
+    """
+    pod_index, cpu, memory = _flatten_pod_metrics(pod_metrics)
+    pod_cpu = sum_by_index(pod_index, cpu, len(pod_metrics))
+    pod_memory = sum_by_index(pod_index, memory, len(pod_metrics))
+    
+    metrics_by_pod = {}
+    row = 0
+    for i, pod in enumerate(pod_metrics):
+        container_metrics = {}
+        for container in pod['containers']:
+            container_metrics[container['name']] = {
+                "cpu_usage": float(cpu[row]),
+                "memory_usage": float(memory[row])
+            }
+            row += 1
+        
+        metrics_by_pod[pod['metadata']['name']] = {
+            "total": {
+                "cpu_usage": float(pod_cpu[i]),
+                "memory_usage": float(pod_memory[i])
+            },
+            "containers": container_metrics
+        }
+        
+    return metrics_by_pod
+
+def get_pod_metrics(namespace: str = "default", namespaces: list = None,
+                    all_namespaces: bool = False) -> Dict[str, Any]:
+    """
+    네임스페이스별 파드 메트릭 수집 (CPU: 코어, 메모리: Ki)
+    all_namespaces=True면 클러스터 범위 LIST 한 번으로, namespaces=[...]면 병렬로 조회해 병합합니다.
+    """
+    if namespaces:
+        return fan_out(get_pod_metrics, namespaces)
+    if all_namespaces:
+        return cluster_scoped(lambda: {
+            ns: _metrics_by_pod(items)
+            for ns, items in group_by_namespace(custom_objects().list_cluster_custom_object(
+                group="metrics.k8s.io", version="v1beta1", plural="pods")['items']).items()
+        })
     try:
-        custom = client.CustomObjectsApi()
+        custom = custom_objects()
         pod_metrics = custom.list_namespaced_custom_object(
             group="metrics.k8s.io",
             version="v1beta1",
             namespace=namespace,
             plural="pods"
-        )
-        
-        metrics_by_pod = {}
-        for pod in pod_metrics['items']:
-            pod_name = pod['metadata']['name']
-            containers = pod['containers']
-            
-            total_cpu = 0
-            total_memory = 0
-            container_metrics = {}
-            
-            for container in containers:
-                cpu_usage = int(container['usage']['cpu'].replace('n', '')) / 1000000000
-                memory_usage = int(container['usage']['memory'].replace('Ki', ''))
-                total_cpu += cpu_usage
-                total_memory += memory_usage
-                
-                container_metrics[container['name']] = {
-                    "cpu_usage": cpu_usage,
-                    "memory_usage": memory_usage
-                }
-            
-            metrics_by_pod[pod_name] = {
-                "total": {
-                    "cpu_usage": total_cpu,
-                    "memory_usage": total_memory
-                },
-                "containers": container_metrics
-            }
-            
-        return metrics_by_pod
+        )['items']
+        return _metrics_by_pod(pod_metrics)
     except Exception as e:
         return {"error": f"Failed to get pod metrics: {str(e)}"}
 
+def get_namespace_resource_summary(namespace: str = None, top_n: int = 5) -> Dict[str, Any]:
+    """
+    네임스페이스별 파드 리소스 사용량 요약 (합계, 파드 p95/최대값, 상위 소비 파드)
+    namespace를 생략하면 전체 네임스페이스를 한 번의 LIST로 집계합니다.
+    """
+    try:
+        custom = custom_objects()
+        if namespace:
+            items = custom.list_namespaced_custom_object(
+                group="metrics.k8s.io", version="v1beta1", namespace=namespace, plural="pods"
+            )['items']
+        else:
+            items = custom.list_cluster_custom_object(
+                group="metrics.k8s.io", version="v1beta1", plural="pods"
+            )['items']
+
+        pod_index, cpu, memory = _flatten_pod_metrics(items)
+        pod_cpu = sum_by_index(pod_index, cpu, len(items))
+        pod_memory = sum_by_index(pod_index, memory, len(items))
+        namespaces = [p['metadata']['namespace'] for p in items]
+        names = [f"{p['metadata']['namespace']}/{p['metadata']['name']}" for p in items]
+
+        cpu_groups = group_by(namespaces, pod_cpu)
+        memory_groups = group_by(namespaces, pod_memory)
+        summary = {}
+        for ns in sorted(cpu_groups):
+            summary[ns] = {
+                "pods": len(cpu_groups[ns]),
+                "cpu": {"total": total(cpu_groups[ns]), **_distribution(cpu_groups[ns])},
+                "memory": {"total": total(memory_groups[ns]), **_distribution(memory_groups[ns])}
+            }
+
+        return {
+            "namespaces": summary,
+            "top_cpu": [{"pod": names[i], "cpu_usage": float(pod_cpu[i])} for i in top_indices(pod_cpu, top_n)],
+            "top_memory": [{"pod": names[i], "memory_usage": float(pod_memory[i])} for i in top_indices(pod_memory, top_n)]
+        }
+    except Exception as e:
+        return {"error": f"Failed to get namespace resource summary: {str(e)}"}
+
 def get_node_health() -> Dict[str, Any]:
     """
     노드 상태 및 health check
     """
     try:
-        v1 = client.CoreV1Api()
-        nodes = v1.list_node()
+        nodes = cached_list("nodes")
+        if nodes is None:
+            nodes = core_v1().list_node().items
         
         node_health = {}
-        for node in nodes.items:
+        for node in nodes:
             conditions = {cond.type: cond.status for cond in node.status.conditions}
             ready_status = conditions.get('Ready', 'Unknown')
             
@@ -133,128 +237,366 @@ def get_node_health() -> Dict[str, Any]:
     except Exception as e:
         return {"error": f"Failed to get node health: {str(e)}"}
 
-def get_deployment_health(namespace: str = "default") -> Dict[str, Any]:
+def _deployment_health(deployments: list) -> Dict[str, Any]:
+    """
+    디플로이먼트 목록의 가용 레플리카 비율과 업데이트 상태를 계산합니다.
+    """
+    deployment_health = {}
+    for dep in deployments:
+        name = dep.metadata.name
+        spec_replicas = dep.spec.replicas
+        available_replicas = dep.status.available_replicas or 0
+        
+        # 업데이트 상태 확인
+        update_status = "Stable"
+        if dep.status.conditions:
+            for condition in dep.status.conditions:
+                if condition.type == "Progressing" and condition.status == "True":
+                    update_status = "Updating"
+                elif condition.type == "Available" and condition.status != "True":
+                    update_status = "NotAvailable"
+        
+        deployment_health[name] = {
+            "desired_replicas": spec_replicas,
+            "available_replicas": available_replicas,
+            "health_percentage": (available_replicas / spec_replicas * 100) if spec_replicas > 0 else 0,
+            "update_status": update_status
+        }
+        
+    return deployment_health
+
+def get_deployment_health(namespace: str = "default", namespaces: list = None,
+                          all_namespaces: bool = False) -> Dict[str, Any]:
     """
     디플로이먼트 상태 및 health check
+    all_namespaces=True면 클러스터 범위 LIST 한 번으로, namespaces=[...]면 병렬로 조회해 병합합니다.
     """
+    if namespaces:
+        return fan_out(get_deployment_health, namespaces)
+    if all_namespaces:
+        def fetch():
+            deployments = cached_list("deployments")
+            if deployments is None:
+                deployments = apps_v1().list_deployment_for_all_namespaces().items
+            return {ns: _deployment_health(deps) for ns, deps in group_by_namespace(deployments).items()}
+        return cluster_scoped(fetch)
     try:
-        apps_v1 = client.AppsV1Api()
-        deployments = apps_v1.list_namespaced_deployment(namespace)
-        
-        deployment_health = {}
-        for dep in deployments.items:
-            name = dep.metadata.name
-            spec_replicas = dep.spec.replicas
-            available_replicas = dep.status.available_replicas or 0
-            
-            # 업데이트 상태 확인
-            update_status = "Stable"
-            if dep.status.conditions:
-                for condition in dep.status.conditions:
-                    if condition.type == "Progressing" and condition.status == "True":
-                        update_status = "Updating"
-                    elif condition.type == "Available" and condition.status != "True":
-                        update_status = "NotAvailable"
-            
-            deployment_health[name] = {
-                "desired_replicas": spec_replicas,
-                "available_replicas": available_replicas,
-                "health_percentage": (available_replicas / spec_replicas * 100) if spec_replicas > 0 else 0,
-                "update_status": update_status
-            }
-            
-        return deployment_health
+        deployments = cached_list("deployments", namespace=namespace)
+        if deployments is None:
+            deployments = apps_v1().list_namespaced_deployment(namespace).items
+        return _deployment_health(deployments)
     except Exception as e:
         return {"error": f"Failed to get deployment health: {str(e)}"}
 
+class _LogStream:
+    """
+    스트리밍 로그 응답(_preload_content=False)을 완결된 줄 단위 블록으로 나눠 반환합니다.
+    바이트/줄 상한에 도달하면 연결을 닫고 중단하므로 메모리 사용량이 로그 크기와 무관합니다.
+    """
+
+    def __init__(self, resp, max_bytes: int, max_lines: int):
+        self._resp = resp
+        self._max_bytes = max(0, max_bytes)
+        self._max_lines = max(0, max_lines)
+        self.bytes = 0
+        self.lines = 0
+        self.truncated = False
+
+    def _cut_lines(self, block: bytes, keep: int) -> bytes:
+        idx = -1
+        for _ in range(keep):
+            idx = block.index(b"\n", idx + 1)
+        return block[:idx + 1]
+
+    def __iter__(self):
+        pending = b""
+        try:
+            for chunk in self._resp.stream(_LOG_CHUNK_SIZE):
+                if self.bytes + len(chunk) > self._max_bytes:
+                    chunk = chunk[:self._max_bytes - self.bytes]
+                    self.truncated = True
+                self.bytes += len(chunk)
+                data = pending + chunk
+                cut = data.rfind(b"\n") + 1
+                block, pending = data[:cut], data[cut:]
+                if block:
+                    n = block.count(b"\n")
+                    if self.lines + n > self._max_lines:
+                        n = self._max_lines - self.lines
+                        block = self._cut_lines(block, n)
+                        self.truncated = True
+                    self.lines += n
+                    if block:
+                        yield block
+                if self.truncated:
+                    return
+            if pending:
+                if self.lines >= self._max_lines:
+                    self.truncated = True
+                    return
+                self.lines += 1
+                yield pending
+        finally:
+            if self.truncated:
+                self._resp.close()
+            else:
+                self._resp.release_conn()
+
+
+class _CursorFilter:
+    """
+    timestamps=True로 읽은 로그 블록에서 커서 이전(이미 분석한) 줄을 건너뛰고,
+    마지막으로 읽은 줄의 타임스탬프를 기록합니다.
+    """
+
+    def __init__(self, after: str = None):
+        self._after = after
+        self.last_ts = after
+
+    def __call__(self, block: bytes) -> bytes:
+        if self._after is not None:
+            pos = 0
+            while pos < len(block):
+                end = block.find(b"\n", pos)
+                end = len(block) if end < 0 else end + 1
+                sp = block.find(b" ", pos, end)
+                if ts_key(block[pos:sp if sp >= 0 else end].strip()) > self._after:
+                    break
+                pos = end
+            if pos < len(block):
+                self._after = None
+            block = block[pos:]
+        if block:
+            start = block.rfind(b"\n", 0, len(block) - 1) + 1
+            sp = block.find(b" ", start)
+            ts = block[start:sp if sp >= 0 else len(block)].strip()
+            if ts:
+                self.last_ts = ts_key(ts)
+        return block
+
+
+def _analyze_pod_logs(v1, namespace: str, pod, container_name: str, since_seconds: int,
+                      max_bytes: int, max_lines: int, engine, top_n: int,
+                      incremental: bool = False) -> Dict[str, Any]:
+    """
+    한 파드의 컨테이너 로그를 스트리밍으로 읽으며 패턴 엔진으로 한 번의 패스에 분류합니다.
+    바이트/줄 상한은 파드 단위로 적용됩니다. incremental이면 커서 이후의 새 줄만 읽어
+    누적 집계에 합산합니다.
+    """
+    restarts = {cs.name: cs.restart_count for cs in (pod.status.container_statuses or [])}
+    container_logs = {}
+    for container in pod.spec.containers:
+        if container_name and container.name != container_name:
+            continue
+
+        try:
+            key = (namespace, pod.metadata.name, container.name,
+                   f"{pod.metadata.uid}/{restarts.get(container.name, 0)}")
+            cursor = cursor_store.get(key) if incremental else None
+            window = since_seconds
+            if cursor:
+                elapsed = math.ceil(seconds_since(cursor["last_ts"])) + _CURSOR_SLACK_SECONDS
+                window = max(1, min(since_seconds, elapsed))
+
+            resp = v1.read_namespaced_pod_log(
+                pod.metadata.name,
+                namespace,
+                container=container.name,
+                since_seconds=window,
+                timestamps=incremental,
+                _preload_content=False
+            )
+            stream = _LogStream(resp, max_bytes, max_lines)
+            cursor_filter = _CursorFilter(cursor["last_ts"] if cursor else None)
+            analyzer = engine.analyzer(timestamps=incremental)
+            for block in stream:
+                if incremental:
+                    block = cursor_filter(block)
+                if block:
+                    analyzer.feed(block)
+            max_bytes -= stream.bytes
+            max_lines -= stream.lines
+
+            counts = analyzer.counts()
+            result = {
+                **counts,
+                **analyzer.summary(top_n),
+                "bytes_read": stream.bytes,
+                "lines_read": stream.lines,
+                "truncated": stream.truncated
+            }
+            if incremental:
+                totals = cursor["totals"] if cursor else {}
+                for k, v in counts.items():
+                    totals[k] = totals.get(k, 0) + v
+                if cursor_filter.last_ts:
+                    cursor_store.put(key, cursor_filter.last_ts, totals)
+                result.update(totals)
+                result["new_issues"] = counts
+                result["cursor"] = cursor_filter.last_ts
+            container_logs[container.name] = result
+        except Exception as e:
+            container_logs[container.name] = {"error": f"Failed to get logs: {str(e)}"}
+    return container_logs
+
+
+def _analyze_pods(pods: list, container_name: str, hours: int, parallelism: int,
+                  max_bytes_per_pod: int, max_lines_per_pod: int, incremental: bool,
+                  rules: list, top_n: int) -> Dict[str, Any]:
+    """
+    파드 목록의 로그를 병렬로 분석해 {namespace: {pod: 컨테이너별 결과}}로 반환합니다.
+    """
+    if not pods:
+        return {}
+    v1 = core_v1()
+    engine = get_engine(rules)
+    # 시간 범위 설정
+    since_seconds = int(timedelta(hours=hours).total_seconds())
+
+    workers = max(1, min(parallelism, len(pods)))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pod-logs") as pool:
+        results = pool.map(
+            lambda pod: _analyze_pod_logs(v1, pod.metadata.namespace, pod, container_name, since_seconds,
+                                          max_bytes_per_pod, max_lines_per_pod, engine, top_n,
+                                          incremental),
+            pods
+        )
+        analysis = {}
+        for pod, logs in zip(pods, results):
+            analysis.setdefault(pod.metadata.namespace, {})[pod.metadata.name] = logs
+        return analysis
+
+
 def get_pod_logs_analysis(namespace: str = "default", pod_name: str = None, 
-                        container_name: str = None, hours: int = 1) -> Dict[str, Any]:
+                        container_name: str = None, hours: int = 1,
+                        parallelism: int = LOG_ANALYSIS_PARALLELISM,
+                        max_bytes_per_pod: int = LOG_MAX_BYTES_PER_POD,
+                        max_lines_per_pod: int = LOG_MAX_LINES_PER_POD,
+                        incremental: bool = False, rules: list = None,
+                        top_n: int = 5, namespaces: list = None,
+                        all_namespaces: bool = False) -> Dict[str, Any]:
     """
-    파드 로그 분석
+    파드 로그 분석 (파드별 병렬 스트리밍, 파드당 바이트/줄 상한 적용)
+    incremental=True면 컨테이너별 커서 이후의 새 로그만 읽어 누적 집계를 반환합니다.
+    rules로 패턴 규칙을 지정할 수 있으며, 심각도별 집계와 상위 top_n개 에러 시그니처를 반환합니다.
+    all_namespaces=True면 전체 파드를, namespaces=[...]면 네임스페이스별로 병렬 분석해 병합합니다.
     """
+    options = dict(container_name=container_name, hours=hours, parallelism=parallelism,
+                   max_bytes_per_pod=max_bytes_per_pod, max_lines_per_pod=max_lines_per_pod,
+                   incremental=incremental, rules=rules, top_n=top_n)
+    if namespaces:
+        return fan_out(get_pod_logs_analysis, namespaces, **options)
+    if all_namespaces:
+        def fetch():
+            pods = cached_list("pods")
+            if pods is None:
+                pods = core_v1().list_pod_for_all_namespaces().items
+            return _analyze_pods(pods, **options)
+        return cluster_scoped(fetch)
     try:
-        v1 = client.CoreV1Api()
-        
-        # 시간 범위 설정
-        since_seconds = int(timedelta(hours=hours).total_seconds())
-        
+        v1 = core_v1()
         if pod_name:
             pods = [v1.read_namespaced_pod(pod_name, namespace)]
         else:
-            pods = v1.list_namespaced_pod(namespace).items
-            
-        log_analysis = {}
-        for pod in pods:
-            pod_name = pod.metadata.name
-            containers = pod.spec.containers
-            
-            container_logs = {}
-            for container in containers:
-                if container_name and container.name != container_name:
-                    continue
-                    
-                try:
-                    logs = v1.read_namespaced_pod_log(
-                        pod_name,
-                        namespace,
-                        container=container.name,
-                        since_seconds=since_seconds
-                    )
-                    
-                    # 에러 패턴 분석
-                    error_count = logs.lower().count('error')
-                    warning_count = logs.lower().count('warn')
-                    exception_count = logs.lower().count('exception')
-                    
-                    container_logs[container.name] = {
-                        "error_count": error_count,
-                        "warning_count": warning_count,
-                        "exception_count": exception_count,
-                        "total_issues": error_count + warning_count + exception_count
-                    }
-                except Exception as e:
-                    container_logs[container.name] = {"error": f"Failed to get logs: {str(e)}"}
-                    
-            log_analysis[pod_name] = container_logs
-            
-        return log_analysis
+            pods = cached_list("pods", namespace=namespace)
+            if pods is None:
+                pods = v1.list_namespaced_pod(namespace).items
+        return _analyze_pods(pods, **options).get(namespace, {})
     except Exception as e:
         return {"error": f"Failed to analyze pod logs: {str(e)}"}
 
+def _format_timestamp(value) -> Optional[str]:
+    """
+    모델(datetime) 또는 원시 JSON(RFC3339 문자열) 타임스탬프를 "YYYY-MM-DD HH:MM:SS"로 변환합니다.
+    """
+    if not value:
+        return None
+    if isinstance(value, str):
+        return value.replace("T", " ")[:19]
+    return value.strftime("%Y-%m-%d %H:%M:%S")
+
+def _event_selector(field_selector: str, resource_name: str) -> str:
+    selectors = [s for s in (field_selector,
+                             f"involvedObject.name={resource_name}" if resource_name else None) if s]
+    return ",".join(selectors)
+
+def _summarize_events(events: list, resource_type: str, resource_name: str) -> Dict[str, Any]:
+    """
+    이벤트 목록을 리소스 종류/이름으로 거르고 유형별로 집계합니다.
+    """
+    filtered_events = []
+    for event in events:
+        e = project(event, EVENT_FIELDS)
+        if resource_type and (e["kind"] or "").lower() != resource_type.lower():
+            continue
+        if resource_name and e["name"] != resource_name:
+            continue
+            
+        filtered_events.append({
+            "type": e["type"],
+            "reason": e["reason"],
+            "message": e["message"],
+            "count": e["count"],
+            "first_timestamp": _format_timestamp(e["first_timestamp"]),
+            "last_timestamp": _format_timestamp(e["last_timestamp"]),
+            "involved_object": {
+                "kind": e["kind"],
+                "name": e["name"]
+            }
+        })
+        
+    return {
+        "events": filtered_events,
+        "total_count": len(filtered_events),
+        "warning_count": sum(1 for e in filtered_events if e["type"] == "Warning"),
+        "normal_count": sum(1 for e in filtered_events if e["type"] == "Normal")
+    }
+
 def get_resource_events(namespace: str = "default", resource_type: str = None, 
-                    resource_name: str = None) -> Dict[str, Any]:
+                    resource_name: str = None, field_selector: str = None,
+                    limit: int = None, continue_token: str = None,
+                    namespaces: list = None, all_namespaces: bool = False) -> Dict[str, Any]:
     """
     리소스 이벤트 수집 및 분석
+    resource_name은 서버 측 필드 셀렉터(involvedObject.name)로 필터링하며,
+    limit/continue_token으로 페이지 단위 조회를 지원합니다.
+    all_namespaces=True면 클러스터 범위 LIST(페이지 단위)로, namespaces=[...]면 병렬로 조회해 병합합니다.
     """
+    if namespaces:
+        return fan_out(get_resource_events, namespaces, resource_type=resource_type,
+                       resource_name=resource_name, field_selector=field_selector)
+    if all_namespaces:
+        def fetch():
+            groups = None
+            if not field_selector:
+                events = cached_list("events")
+                groups = group_by_namespace(events) if events is not None else None
+            if groups is None:
+                # 요약 전에 원시 이벤트를 모아야 하므로 페이지별로 네임스페이스에 나눠 담음
+                groups = {}
+                for page in iter_pages(core_v1().list_event_for_all_namespaces,
+                                       field_selector=_event_selector(field_selector, resource_name)):
+                    for ns, group in group_by_namespace(page).items():
+                        groups.setdefault(ns, []).extend(group)
+            return {
+                ns: _summarize_events(group, resource_type, resource_name)
+                for ns, group in groups.items()
+            }
+        return cluster_scoped(fetch)
     try:
-        v1 = client.CoreV1Api()
-        events = v1.list_namespaced_event(namespace)
-        
-        filtered_events = []
-        for event in events.items:
-            if resource_type and event.involved_object.kind.lower() != resource_type.lower():
-                continue
-            if resource_name and event.involved_object.name != resource_name:
-                continue
-                
-            filtered_events.append({
-                "type": event.type,
-                "reason": event.reason,
-                "message": event.message,
-                "count": event.count,
-                "first_timestamp": event.first_timestamp.strftime("%Y-%m-%d %H:%M:%S") if event.first_timestamp else None,
-                "last_timestamp": event.last_timestamp.strftime("%Y-%m-%d %H:%M:%S") if event.last_timestamp else None,
-                "involved_object": {
-                    "kind": event.involved_object.kind,
-                    "name": event.involved_object.name
-                }
-            })
-            
-        return {
-            "events": filtered_events,
-            "total_count": len(filtered_events),
-            "warning_count": sum(1 for e in filtered_events if e["type"] == "Warning"),
-            "normal_count": sum(1 for e in filtered_events if e["type"] == "Normal")
-        }
+        events = None
+        page = {}
+        if not (field_selector or limit or continue_token):
+            events = cached_list("events", namespace=namespace)
+        if events is None:
+            page = list_page(core_v1().list_namespaced_event, namespace, limit=limit,
+                             continue_token=continue_token,
+                             field_selector=_event_selector(field_selector, resource_name))
+            events = page["items"]
+
+        result = _summarize_events(events, resource_type, resource_name)
+        if page.get("continue"):
+            result["continue"] = page["continue"]
+        return result
     except Exception as e:
         return {"error": f"Failed to get resource events: {str(e)}"} 
\ No newline at end of file
@@ -1,26 +1,48 @@
 # tools/kubernetes/pods.py
 from kubernetes import client
-import yaml
-from .helpers import load_kube_config
+from .helpers import core_v1
+from .informers import cached_list
+from .listing import POD_FIELDS, list_page, project
+from .fanout import cluster_scoped, fan_out, paged_by_namespace, project_by_namespace
 
-def list_pods(namespace: str = "default") -> dict:
+def list_pods(namespace: str = "default", label_selector: str = None, field_selector: str = None,
+              limit: int = None, continue_token: str = None,
+              namespaces: list = None, all_namespaces: bool = False) -> dict:
     """
     지정된 네임스페이스의 파드 목록을 조회합니다.
+    limit/continue_token으로 페이지 단위 조회, label_selector/field_selector로 서버 측 필터링을 지원합니다.
+    all_namespaces=True면 클러스터 범위 LIST(페이지 단위)로, namespaces=[...]면 병렬로 조회해
+    네임스페이스별 결과/소요 시간/실패를 하나의 응답으로 병합합니다.
     """
-    load_kube_config()
+    if namespaces:
+        return fan_out(list_pods, namespaces, label_selector=label_selector, field_selector=field_selector)
+    if all_namespaces:
+        def fetch():
+            pods = None
+            if not field_selector:
+                pods = cached_list("pods", label_selector=label_selector)
+            if pods is None:
+                return paged_by_namespace(core_v1().list_pod_for_all_namespaces, POD_FIELDS, "pods",
+                                          label_selector=label_selector, field_selector=field_selector)
+            return project_by_namespace(pods, POD_FIELDS, "pods")
+        return cluster_scoped(fetch)
     try:
-        pods = client.CoreV1Api().list_namespaced_pod(namespace)
-        return {
+        pods = None
+        page = {}
+        if not (field_selector or limit or continue_token):
+            pods = cached_list("pods", namespace=namespace, label_selector=label_selector)
+        if pods is None:
+            page = list_page(core_v1().list_namespaced_pod, namespace, limit=limit,
+                             continue_token=continue_token, label_selector=label_selector,
+                             field_selector=field_selector)
+            pods = page["items"]
+        result = {
             "status": "success",
-            "pods": [
-                {
-                    "name": p.metadata.name,
-                    "status": p.status.phase,
-                    "node": p.spec.node_name or "Unknown"
-                }
-                for p in pods.items
-            ]
+            "pods": [project(p, POD_FIELDS) for p in pods]
         }
+        if page.get("continue"):
+            result["continue"] = page["continue"]
+        return result
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
@@ -28,9 +50,8 @@ def describe_pod(namespace: str = "default", pod_name: str = "") -> dict:
     """
     특정 네임스페이스의 지정된 파드 상세 정보를 반환합니다.
     """
-    load_kube_config()
     try:
-        pod = client.CoreV1Api().read_namespaced_pod(pod_name, namespace)
+        pod = core_v1().read_namespaced_pod(pod_name, namespace)
         return {
             "status": "success",
             "pod_info": {
@@ -57,9 +78,8 @@ def create_pod(name: str, image: str, namespace: str = "default", labels: dict =
     """
     이름(name)과 이미지(image)를 이용해 새로운 파드를 생성합니다.
     """
-    load_kube_config()
     try:
-        api = client.CoreV1Api()
+        api = core_v1()
         if labels is None:
             labels = {"app": name}
         manifest = client.V1Pod(
@@ -75,31 +95,12 @@ def create_pod(name: str, image: str, namespace: str = "default", labels: dict =
     except Exception as e:
         return {"status": "error", "message": str(e)}
 
-def apply_yaml(yaml_content: str) -> dict:
-    """
-    YAML 콘텐츠를 파싱해 Pod 오브젝트를 생성합니다.
-    """
-    load_kube_config()
-    try:
-        spec = yaml.safe_load(yaml_content)
-        if spec.get("kind") != "Pod":
-            return {"status": "error", "message": "지원하는 Kind: Pod 만 가능합니다."}
-        api = client.CoreV1Api()
-        resp = api.create_namespaced_pod(
-            namespace=spec.get("metadata", {}).get("namespace", "default"),
-            body=spec
-        )
-        return {"status": "success", "name": resp.metadata.name, "uid": resp.metadata.uid}
-    except Exception as e:
-        return {"status": "error", "message": str(e)}
-
 def delete_pod(namespace: str = "default", pod_name: str = "") -> dict:
     """
     특정 네임스페이스의 지정된 파드를 삭제합니다.
     """
-    load_kube_config()
     try:
-        api = client.CoreV1Api()
+        api = core_v1()
         api.delete_namespaced_pod(name=pod_name, namespace=namespace, body=client.V1DeleteOptions())
         return {"status": "success", "message": f"Pod {pod_name} deleted"}
     except Exception as e:
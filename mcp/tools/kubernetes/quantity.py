@@ -0,0 +1,139 @@
+# tools/kubernetes/quantity.py
+"""
+Kubernetes 리소스 수량(quantity) 파서와 일괄 집계 도우미.
+
+"3500m", "250u", "1.5", "128974848", "129e6", "123Mi", "2Gi" 등 API가 반환하는
+모든 표기를 기본 단위(CPU: 코어, 메모리: 바이트) float로 변환합니다.
+같은 문자열이 반복되므로 결과를 메모이제이션하며, 정수 문자열은 정규식 없이 처리합니다.
+문자열 파싱은 항목별(캐시 조회)로 하고, 그 뒤의 합계/사용률/백분위수/상위 N 집계만 벡터화합니다.
+NumPy는 선택 의존성(extra "vectorized")입니다. 설치되어 있을 때만 벡터 연산을 쓰고,
+없으면(기본 설치) 같은 결과를 순수 파이썬으로 계산합니다.
+큰 클러스터에서는 `poetry install --extras vectorized`로 설치하세요.
+"""
+import re
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy는 선택 의존성: 없으면 순수 파이썬으로 집계
+    np = None
+
+# 1 미만 단위는 나눗셈으로 적용해 부동소수점 오차를 줄임 ("100n" -> 1e-07)
+_DIVISORS = {"n": 1e9, "u": 1e6, "m": 1e3}
+_SUFFIXES = {
+    "": 1.0,
+    "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12, "P": 1e15, "E": 1e18,
+    "Ki": 2.0 ** 10, "Mi": 2.0 ** 20, "Gi": 2.0 ** 30,
+    "Ti": 2.0 ** 40, "Pi": 2.0 ** 50, "Ei": 2.0 ** 60,
+}
+
+_QUANTITY = re.compile(
+    r"^([+-]?(?:\d+\.?\d*|\.\d+))(?:([eE][+-]?\d+)|(Ki|Mi|Gi|Ti|Pi|Ei|n|u|m|k|M|G|T|P|E))?$"
+)
+
+
+@lru_cache(maxsize=8192)
+def parse_quantity(quantity) -> float:
+    """
+    수량 문자열을 기본 단위 float로 변환합니다. 잘못된 형식이면 ValueError.
+    """
+    if isinstance(quantity, (int, float)):
+        return float(quantity)
+    q = quantity.strip()
+    if q.isdigit():
+        return float(q)
+    m = _QUANTITY.match(q)
+    if not m:
+        raise ValueError(f"invalid quantity: {quantity!r}")
+    number, exponent, suffix = m.groups()
+    if exponent:
+        return float(number + exponent)
+    if suffix in _DIVISORS:
+        return float(number) / _DIVISORS[suffix]
+    return float(number) * _SUFFIXES[suffix or ""]
+
+
+def parse_quantities(quantities, unit: float = 1.0):
+    """
+    수량 목록을 변환합니다 (NumPy가 있으면 float64 배열, 없으면 list).
+    문자열 파싱 자체는 항목별 parse_quantity 호출이며, 반복되는 문자열은 캐시에서 바로 반환됩니다.
+    unit을 지정하면 해당 단위로 나눈 값을 반환합니다 (예: unit=1024 -> Ki).
+    """
+    values = [parse_quantity(q) / unit for q in quantities]
+    if np is not None:
+        return np.asarray(values, dtype=np.float64)
+    return values
+
+
+def total(values) -> float:
+    if np is not None:
+        return float(np.sum(values))
+    return float(sum(values))
+
+
+def sum_by_index(index: list, values, size: int):
+    """
+    index[i]번째 그룹에 values[i]를 더한 길이 size의 합계 배열을 반환합니다.
+    """
+    if np is not None:
+        return np.bincount(np.asarray(index, dtype=np.int64), weights=values, minlength=size)
+    sums = [0.0] * size
+    for i, v in zip(index, values):
+        sums[i] += v
+    return sums
+
+
+def percentages(usage, capacity):
+    """
+    원소별 사용률(%)을 계산합니다. 용량이 0이면 0.
+    """
+    if np is not None:
+        usage = np.asarray(usage, dtype=np.float64)
+        capacity = np.asarray(capacity, dtype=np.float64)
+        out = np.zeros_like(usage)
+        np.divide(usage * 100.0, capacity, out=out, where=capacity > 0)
+        return out
+    return [(u * 100.0 / c) if c > 0 else 0.0 for u, c in zip(usage, capacity)]
+
+
+def percentile(values, q: float) -> float:
+    """
+    선형 보간 백분위수 (numpy.percentile 기본 방식과 동일).
+    """
+    if len(values) == 0:
+        return 0.0
+    if np is not None:
+        return float(np.percentile(values, q))
+    ordered = sorted(values)
+    pos = (len(ordered) - 1) * q / 100.0
+    lo = int(pos)
+    hi = min(lo + 1, len(ordered) - 1)
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (pos - lo)
+
+
+def top_indices(values, n: int) -> list:
+    """
+    값이 큰 순서대로 상위 n개 인덱스를 반환합니다.
+    """
+    if n <= 0 or len(values) == 0:
+        return []
+    if np is not None:
+        n = min(n, len(values))
+        idx = np.argpartition(values, -n)[-n:]
+        return [int(i) for i in idx[np.argsort(values[idx])[::-1]]]
+    return sorted(range(len(values)), key=lambda i: values[i], reverse=True)[:n]
+
+
+def group_by(keys: list, values) -> dict:
+    """
+    키별로 값을 묶어 {key: 값 배열}을 반환합니다.
+    """
+    if np is not None:
+        labels, inverse = np.unique(np.asarray(keys, dtype=object), return_inverse=True)
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.searchsorted(inverse[order], np.arange(len(labels) + 1))
+        return {labels[i]: values[order[bounds[i]:bounds[i + 1]]] for i in range(len(labels))}
+    groups = {}
+    for k, v in zip(keys, values):
+        groups.setdefault(k, []).append(v)
+    return groups
@@ -0,0 +1,168 @@
+# tools/kubernetes/rollout.py
+"""
+Deployment 롤아웃 대기.
+
+describe_deployment를 반복 호출(매번 전체 GET)하는 대신 대상 Deployment 하나에
+field_selector로 좁힌 WATCH 연결 하나를 열어 상태 변화를 받습니다.
+Deployment status가 ReplicaSet 진행 상황(updated/available/old replicas)을 집계하므로
+ReplicaSet을 따로 감시하지 않습니다. 판정 기준은 kubectl rollout status와 같습니다.
+응답 status는 완료면 success, 실패/삭제면 error, 기한 안에 끝나지 않으면 timeout입니다.
+호출자는 status 대신 rollout(complete/failed/timeout/not_found)으로 완료 여부를 판단하세요.
+"""
+import os
+import time
+
+from kubernetes import watch
+from kubernetes.client.exceptions import ApiException
+
+from .helpers import apps_v1
+
+ROLLOUT_WAIT_TIMEOUT = int(os.getenv("ROLLOUT_WAIT_TIMEOUT", "300"))
+# 응답에 담는 진행 기록 최대 개수 (오래된 것부터 생략)
+_MAX_PROGRESS = 50
+
+COMPLETE = "complete"
+PROGRESSING = "progressing"
+FAILED = "failed"
+TIMEOUT = "timeout"
+NOT_FOUND = "not_found"
+# 롤아웃 상태 -> 응답 status (PROGRESSING은 대기하지 않은 조회에서만 나옴)
+_STATUS = {COMPLETE: "success", PROGRESSING: "success", FAILED: "error", TIMEOUT: "timeout", NOT_FOUND: "error"}
+
+
+def rollout_state(deployment, min_generation: int = None):
+    """
+    Deployment 오브젝트에서 (상태, 설명)을 계산합니다.
+    min_generation: 이 세대 이상의 spec을 컨트롤러가 관찰해야 완료로 봅니다 (방금 패치한 경우).
+    """
+    meta, spec, status = deployment.metadata, deployment.spec, deployment.status
+    generation = max(meta.generation or 0, min_generation or 0)
+    if (status.observed_generation or 0) < generation:
+        return PROGRESSING, "컨트롤러가 새 spec을 반영하기를 기다리는 중"
+    for condition in status.conditions or []:
+        if condition.type == "Progressing" and condition.reason == "ProgressDeadlineExceeded":
+            return FAILED, f"진행 기한 초과: {condition.message}"
+    desired = spec.replicas if spec.replicas is not None else 1
+    updated = status.updated_replicas or 0
+    total = status.replicas or 0
+    available = status.available_replicas or 0
+    if updated < desired:
+        return PROGRESSING, f"새 레플리카 {updated}/{desired}개 업데이트됨"
+    if total > updated:
+        return PROGRESSING, f"이전 레플리카 {total - updated}개 종료 대기 중"
+    if available < updated:
+        return PROGRESSING, f"업데이트된 레플리카 {available}/{updated}개 사용 가능"
+    return COMPLETE, f"롤아웃 완료: {available}/{desired}개 사용 가능"
+
+
+def _replicas(deployment) -> dict:
+    status = deployment.status
+    return {
+        "desired": deployment.spec.replicas,
+        "updated": status.updated_replicas or 0,
+        "ready": status.ready_replicas or 0,
+        "available": status.available_replicas or 0,
+        "unavailable": status.unavailable_replicas or 0,
+    }
+
+
+def wait_for_rollout(namespace: str, name: str, timeout: float = ROLLOUT_WAIT_TIMEOUT,
+                     min_generation: int = None) -> dict:
+    """
+    대상 Deployment 하나에 WATCH를 열어 롤아웃이 완료/실패하거나 timeout이 지날 때까지 기다립니다.
+    진행 중 상태가 바뀔 때마다 경과 시간과 함께 progress에 기록합니다.
+    """
+    started = time.monotonic()
+    deadline = started + timeout
+    progress = []
+    state, message, last = None, None, None
+
+    def record(deployment):
+        nonlocal state, message, last
+        last = deployment
+        state, message = rollout_state(deployment, min_generation)
+        if not progress or progress[-1]["message"] != message:
+            progress.append({"elapsed_s": round(time.monotonic() - started, 1), "state": state,
+                             "message": message, **_replicas(deployment)})
+
+    selector = f"metadata.name={name}"
+
+    def relist():
+        # 현재 상태와 WATCH 시작 지점(resourceVersion)을 LIST 한 번으로 얻음
+        resp = apps_v1().list_namespaced_deployment(namespace, field_selector=selector)
+        if resp.items:
+            record(resp.items[0])
+        return resp.metadata.resource_version, bool(resp.items)
+
+    resource_version, found = relist()
+    if not found:
+        return {"status": "error", "rollout": NOT_FOUND, "name": name, "namespace": namespace,
+                "message": f"Deployment {name}을(를) 찾을 수 없습니다"}
+    w = watch.Watch()
+    try:
+        while state not in (COMPLETE, FAILED):
+            remaining = int(deadline - time.monotonic())
+            if remaining <= 0:
+                break
+            try:
+                for event in w.stream(apps_v1().list_namespaced_deployment, namespace, field_selector=selector,
+                                      resource_version=resource_version, timeout_seconds=remaining):
+                    if event["type"] == "ERROR":
+                        # 410 Gone 등: resourceVersion이 만료되어 다시 LIST 필요
+                        raise ApiException(status=410, reason="watch expired")
+                    if event["type"] == "DELETED":
+                        return {"status": "error", "rollout": NOT_FOUND, "name": name, "namespace": namespace,
+                                "message": "롤아웃 중 Deployment가 삭제되었습니다", "progress": progress[-_MAX_PROGRESS:]}
+                    resource_version = event["object"].metadata.resource_version
+                    record(event["object"])
+                    if state in (COMPLETE, FAILED):
+                        break
+            except ApiException as e:
+                if e.status != 410:
+                    raise
+                resource_version, found = relist()
+                if not found:
+                    return {"status": "error", "rollout": NOT_FOUND, "name": name, "namespace": namespace,
+                            "message": "롤아웃 중 Deployment가 삭제되었습니다", "progress": progress[-_MAX_PROGRESS:]}
+    finally:
+        w.stop()
+
+    if state not in (COMPLETE, FAILED):
+        state = TIMEOUT
+        message = f"{timeout}초 안에 완료되지 않음: {message}"
+    result = {
+        "status": _STATUS.get(state, "success"),
+        "rollout": state,
+        "name": name,
+        "namespace": namespace,
+        "message": message,
+        "elapsed_s": round(time.monotonic() - started, 1),
+        "progress": progress[-_MAX_PROGRESS:],
+    }
+    if last is not None:
+        result["replicas"] = _replicas(last)
+    return result
+
+
+def get_rollout_status(namespace: str = "default", name: str = "", wait: bool = False,
+                       timeout: int = ROLLOUT_WAIT_TIMEOUT) -> dict:
+    """
+    Deployment 롤아웃 상태를 조회합니다 (kubectl rollout status와 같은 기준).
+    wait=True면 WATCH 연결 하나로 완료/실패/timeout(초)까지 기다리며 진행 기록을 함께 반환합니다.
+    기한 안에 끝나지 않으면 status가 "timeout"입니다.
+    """
+    try:
+        if wait:
+            return wait_for_rollout(namespace, name, timeout)
+        deployment = apps_v1().read_namespaced_deployment(name, namespace)
+        state, message = rollout_state(deployment)
+        return {
+            "status": _STATUS[state],
+            "rollout": state,
+            "name": name,
+            "namespace": namespace,
+            "message": message,
+            "replicas": _replicas(deployment),
+        }
+    except Exception as e:
+        return {"status": "error", "message": str(e)}
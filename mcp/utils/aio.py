@@ -0,0 +1,58 @@
+# mcp/utils/aio.py
+"""
+동기 도구 함수를 코루틴 도구로 감싸 제한된 스레드 풀에서 실행합니다.
+
+kubernetes-client와 boto3는 동기 I/O만 제공하므로, 이벤트 루프를 막지 않도록
+호출을 전용 스레드 풀로 넘깁니다. 풀 크기(MCP_TOOL_WORKERS)가 동시에 실행되는
+업스트림 호출 수의 상한이 되며, 나머지 호출은 루프를 점유하지 않고 대기합니다.
+"""
+import asyncio
+import contextvars
+import functools
+import inspect
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
+
+MCP_TOOL_WORKERS = int(os.getenv("MCP_TOOL_WORKERS", "32"))
+
+_executor = ThreadPoolExecutor(max_workers=MCP_TOOL_WORKERS, thread_name_prefix="mcp-tool")
+
+
+async def run_blocking(func, *args, **kwargs):
+  """
+  동기 함수를 도구 스레드 풀에서 실행하고 결과를 기다립니다.
+  """
+  loop = asyncio.get_running_loop()
+  ctx = contextvars.copy_context()
+  return await loop.run_in_executor(_executor, functools.partial(ctx.run, func, *args, **kwargs))
+
+
+def to_async(func):
+  """
+  동기 도구 함수를 같은 이름/시그니처/docstring을 가진 코루틴 함수로 변환합니다.
+  """
+  if inspect.iscoroutinefunction(func):
+    return func
+
+  @functools.wraps(func)
+  async def wrapper(*args, **kwargs):
+    return await run_blocking(func, *args, **kwargs)
+  return wrapper
+
+
+def submit_background(func, *args, **kwargs):
+  """
+  결과를 기다리지 않는 작업(승인된 작업 실행 등)을 도구 스레드 풀에 넘깁니다.
+  예외는 호출자에게 전달되지 않으므로 로그로 남깁니다.
+  """
+  ctx = contextvars.copy_context()
+  future = _executor.submit(ctx.run, func, *args, **kwargs)
+
+  def _log_error(f):
+    if f.exception() is not None:
+      logger.error("background task %s failed", getattr(func, "__name__", func), exc_info=f.exception())
+  future.add_done_callback(_log_error)
+  return future
@@ -0,0 +1,174 @@
+# mcp/utils/audit_store.py
+"""
+감사 로그 색인 저장소 (sqlite, WAL).
+
+AuditLogger의 writer 스레드가 JSON Lines 파일과 함께 이 저장소에도 배치로 기록합니다.
+user, action, (resource_type, resource_name), 시각에 인덱스가 있어 수백만 건에서도
+"사용자 X가 지난주에 삭제한 것" 같은 조회가 인덱스 범위 스캔으로 끝납니다.
+조회는 요청마다 별도의 읽기 연결을 사용하므로 기록과 서로 막지 않습니다 (WAL).
+"""
+import datetime
+import json
+import os
+import sqlite3
+import threading
+
+AUDIT_DB = os.getenv("AUDIT_DB", "audit_log.db")
+_MAX_PAGE_SIZE = 500
+# 접두어 범위 검색 상한 (action >= 'abc' AND action < 'abc' || _PREFIX_END)
+_PREFIX_END = "\U0010ffff"
+
+# 이벤트에서 컬럼으로 분리하는 필드, 나머지는 data(JSON)에 보관
+_COLUMNS = ("user", "action", "status", "resource_type", "resource_name", "namespace")
+
+
+def _connect(path: str) -> sqlite3.Connection:
+  db = sqlite3.connect(path, check_same_thread=False)
+  db.execute("PRAGMA journal_mode=WAL")
+  db.execute("PRAGMA synchronous=NORMAL")
+  return db
+
+
+def _epoch(value) -> float:
+  """
+  ISO 8601 문자열(타임존 없으면 UTC) 또는 epoch 숫자를 epoch 초로 변환합니다.
+  """
+  if isinstance(value, (int, float)):
+    return float(value)
+  dt = datetime.datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+  if dt.tzinfo is None:
+    dt = dt.replace(tzinfo=datetime.timezone.utc)
+  return dt.timestamp()
+
+
+class SqliteAuditSink:
+  """
+  AuditLogger sink. write()/flush()/close()는 writer 스레드에서만 호출됩니다.
+  """
+
+  def __init__(self, path: str = AUDIT_DB):
+    self.path = path
+    self._db = None
+    self._full_sync = False
+
+  def _open(self):
+    directory = os.path.dirname(self.path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+    self._db = _connect(self.path)
+    self._db.executescript(
+      "CREATE TABLE IF NOT EXISTS audit_events ("
+      " id INTEGER PRIMARY KEY, ts REAL NOT NULL, user TEXT, action TEXT, status TEXT,"
+      " resource_type TEXT, resource_name TEXT, namespace TEXT, data TEXT);"
+      # 모든 인덱스는 rowid(id)를 암묵적으로 포함하므로 'WHERE user=? ORDER BY id DESC'도 정렬 없이 처리
+      "CREATE INDEX IF NOT EXISTS idx_audit_user ON audit_events(user);"
+      "CREATE INDEX IF NOT EXISTS idx_audit_action ON audit_events(action);"
+      "CREATE INDEX IF NOT EXISTS idx_audit_resource ON audit_events(resource_type, resource_name);"
+      "CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_events(ts);"
+    )
+
+  def write(self, events: list):
+    if self._db is None:
+      self._open()
+    rows = []
+    for event in events:
+      extra = {k: v for k, v in event.items() if k not in _COLUMNS and k != "ts"}
+      rows.append((
+        _epoch(event["ts"]), *(event.get(c) for c in _COLUMNS),
+        json.dumps(extra, ensure_ascii=False, default=str) if extra else None
+      ))
+    with self._db:
+      self._db.executemany(
+        "INSERT INTO audit_events (ts, user, action, status, resource_type, resource_name, namespace, data)"
+        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows
+      )
+
+  def flush(self, fsync: bool = False):
+    # 배치마다 커밋하므로 별도 flush 불필요, fsync 수준이면 커밋마다 동기화하도록 전환
+    if fsync and not self._full_sync and self._db is not None:
+      self._db.execute("PRAGMA synchronous=FULL")
+      self._full_sync = True
+
+  def close(self):
+    if self._db is not None:
+      self._db.close()
+      self._db = None
+
+
+_local = threading.local()
+
+
+def _reader(path: str) -> sqlite3.Connection:
+  """
+  스레드별 읽기 연결 (도구 스레드 풀에서 재사용).
+  """
+  conns = getattr(_local, "conns", None)
+  if conns is None:
+    conns = _local.conns = {}
+  db = conns.get(path)
+  if db is None:
+    db = conns[path] = sqlite3.connect(f"file:{path}?mode=ro", uri=True, check_same_thread=False)
+  return db
+
+
+def query_audit_log(user: str = None, action: str = None, action_contains: str = None,
+                    status: str = None, resource_type: str = None, resource_name: str = None,
+                    namespace: str = None, since: str = None, until: str = None,
+                    hours: float = None, limit: int = 50, cursor: int = None) -> dict:
+  """
+  감사 로그를 조회합니다 (최신순).
+  action은 접두어 일치("파드 삭제"), action_contains는 부분 일치("삭제")로 거릅니다.
+  시간 범위는 since/until(ISO 8601) 또는 최근 hours시간으로 지정합니다.
+  결과가 더 있으면 next_cursor를 반환하며, 다음 페이지는 cursor=next_cursor로 조회합니다.
+  """
+  if not AUDIT_DB or not os.path.exists(AUDIT_DB):
+    return {"status": "error", "message": "감사 로그 저장소(AUDIT_DB)가 없습니다"}
+  try:
+    where, params = [], []
+    for column, value in (("user", user), ("status", status), ("resource_type", resource_type),
+                          ("resource_name", resource_name), ("namespace", namespace)):
+      if value:
+        where.append(f"{column} = ?")
+        params.append(value)
+    if action:
+      where.append("action >= ? AND action < ?")
+      params += [action, action + _PREFIX_END]
+    if action_contains:
+      where.append("instr(action, ?) > 0")
+      params.append(action_contains)
+    if hours:
+      since = datetime.datetime.now(datetime.timezone.utc).timestamp() - hours * 3600
+    if since:
+      where.append("ts >= ?")
+      params.append(_epoch(since))
+    if until:
+      where.append("ts < ?")
+      params.append(_epoch(until))
+    if cursor:
+      where.append("id < ?")
+      params.append(int(cursor))
+    limit = max(1, min(int(limit), _MAX_PAGE_SIZE))
+
+    sql = (
+      "SELECT id, ts, user, action, status, resource_type, resource_name, namespace, data"
+      " FROM audit_events" + (" WHERE " + " AND ".join(where) if where else "") +
+      " ORDER BY id DESC LIMIT ?"
+    )
+    rows = _reader(AUDIT_DB).execute(sql, (*params, limit + 1)).fetchall()
+    events = []
+    for row in rows[:limit]:
+      event = {
+        "id": row[0],
+        "ts": datetime.datetime.fromtimestamp(row[1], datetime.timezone.utc).isoformat(),
+        **dict(zip(_COLUMNS, row[2:8])),
+      }
+      if row[8]:
+        event.update(json.loads(row[8]))
+      events.append(event)
+    return {
+      "status": "success",
+      "events": events,
+      "next_cursor": events[-1]["id"] if len(rows) > limit else None
+    }
+  except Exception as e:
+    return {"status": "error", "message": str(e)}
@@ -0,0 +1,249 @@
+# mcp/utils/cache.py
+"""
+읽기 전용 도구의 응답 캐시.
+
+main.py가 도구를 등록할 때 정책 표(이름 -> TTL/리소스)를 보고 감쌉니다.
+- 키: 도구 이름 + 시그니처 기본값을 채운 정규화된 인자 (호출 방식이 달라도 같은 키)
+- LRU + 메모리 상한(RESPONSE_CACHE_MAX_BYTES, 응답 JSON 크기 기준)
+- single-flight: 같은 키의 동시 호출은 첫 호출 결과를 함께 기다림
+- 변경 도구(create_*, update_*, delete_* 등)는 실행 후 관련 리소스/네임스페이스 항목을 무효화
+에러 응답은 캐시하지 않습니다.
+"""
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+RESPONSE_CACHE_ENABLED = os.getenv("RESPONSE_CACHE", "true").lower() in ("1", "true", "yes")
+RESPONSE_CACHE_MAX_BYTES = int(os.getenv("RESPONSE_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+# 네임스페이스와 무관한 항목(클러스터 범위, all_namespaces 등)
+ANY_NAMESPACE = "*"
+
+
+def _is_error(result) -> bool:
+  if not isinstance(result, dict):
+    return False
+  return result.get("status") == "error" or (len(result) == 1 and "error" in result)
+
+
+def _scope(arguments: dict) -> str:
+  if arguments.get("all_namespaces") or arguments.get("namespaces"):
+    return ANY_NAMESPACE
+  return arguments.get("namespace") or ANY_NAMESPACE
+
+
+class ResponseCache:
+  """
+  (도구, 인자) -> 응답. 리소스별 색인으로 무효화 대상을 바로 찾습니다.
+  """
+
+  def __init__(self, max_bytes: int = RESPONSE_CACHE_MAX_BYTES):
+    self._max_bytes = max_bytes
+    self._lock = threading.Lock()
+    self._entries = OrderedDict()
+    self._by_resource = {}
+    self._inflight = {}
+    self._bytes = 0
+    self.hits = 0
+    self.misses = 0
+    self.coalesced = 0
+    self.evictions = 0
+    self.invalidations = 0
+
+  def _drop(self, key):
+    value, expires_at, size, resources, scope = self._entries.pop(key)
+    self._bytes -= size
+    for resource in resources:
+      keys = self._by_resource.get(resource)
+      if keys is not None:
+        keys.pop(key, None)
+
+  def _get(self, key):
+    entry = self._entries.get(key)
+    if entry is None:
+      return None
+    if entry[1] < time.monotonic():
+      self._drop(key)
+      return None
+    self._entries.move_to_end(key)
+    return entry
+
+  def _put(self, key, value, ttl: float, resources: tuple, scope: str):
+    try:
+      size = len(json.dumps(value, default=str, ensure_ascii=False))
+    except (TypeError, ValueError):
+      return
+    if size > self._max_bytes // 4:
+      return
+    if key in self._entries:
+      self._drop(key)
+    self._entries[key] = (value, time.monotonic() + ttl, size, resources, scope)
+    self._bytes += size
+    for resource in resources:
+      self._by_resource.setdefault(resource, {})[key] = scope
+    while self._bytes > self._max_bytes and self._entries:
+      self._drop(next(iter(self._entries)))
+      self.evictions += 1
+
+  def call(self, key, ttl: float, resources: tuple, scope: str, func, *args, **kwargs):
+    """
+    캐시된 응답을 반환하거나, 같은 키의 진행 중인 호출을 기다리거나, 직접 호출해 저장합니다.
+    """
+    with self._lock:
+      entry = self._get(key)
+      if entry is not None:
+        self.hits += 1
+        return entry[0]
+      inflight = self._inflight.get(key)
+      leader = inflight is None
+      if leader:
+        future = Future()
+        self._inflight[key] = (future, resources, scope)
+        self.misses += 1
+      else:
+        future = inflight[0]
+        self.coalesced += 1
+    if not leader:
+      return future.result()
+
+    try:
+      result = func(*args, **kwargs)
+    except BaseException as e:
+      with self._lock:
+        self._inflight.pop(key, None)
+      future.set_exception(e)
+      raise
+    with self._lock:
+      # 진행 중에 무효화됐으면(=_inflight에서 빠졌으면) 저장하지 않음
+      inflight = self._inflight.get(key)
+      if inflight is not None and inflight[0] is future:
+        del self._inflight[key]
+        if not _is_error(result):
+          self._put(key, result, ttl, resources, scope)
+    future.set_result(result)
+    return result
+
+  def invalidate(self, resources: tuple, namespace: str = None) -> int:
+    """
+    리소스의 캐시 항목을 지웁니다. namespace를 주면 해당 네임스페이스와 클러스터 범위 항목만.
+    """
+    def affected(scope: str) -> bool:
+      return namespace is None or scope in (namespace, ANY_NAMESPACE)
+
+    dropped = 0
+    with self._lock:
+      for resource in resources:
+        for key, scope in list((self._by_resource.get(resource) or {}).items()):
+          if affected(scope) and key in self._entries:
+            self._drop(key)
+            dropped += 1
+      # 무효화 이전에 시작된 호출의 결과는 저장하지 않음 (기다리는 호출에는 그대로 전달)
+      for key, (_, key_resources, scope) in list(self._inflight.items()):
+        if set(resources) & set(key_resources) and affected(scope):
+          del self._inflight[key]
+      self.invalidations += dropped
+    return dropped
+
+  def clear(self):
+    with self._lock:
+      self._entries.clear()
+      self._by_resource.clear()
+      self._bytes = 0
+
+  def stats(self) -> dict:
+    with self._lock:
+      return {
+        "entries": len(self._entries),
+        "bytes": self._bytes,
+        "max_bytes": self._max_bytes,
+        "hits": self.hits,
+        "misses": self.misses,
+        "coalesced": self.coalesced,
+        "evictions": self.evictions,
+        "invalidations": self.invalidations,
+      }
+
+
+response_cache = ResponseCache()
+
+
+def _normalizer(func):
+  """
+  호출 인자를 시그니처 기본값까지 채운 {이름: 값}으로 바꾸는 함수를 만듭니다.
+  """
+  sig = inspect.signature(func)
+
+  def normalize(args, kwargs) -> dict:
+    bound = sig.bind(*args, **kwargs)
+    bound.apply_defaults()
+    arguments = dict(bound.arguments)
+    for name, param in sig.parameters.items():
+      if param.kind is inspect.Parameter.VAR_KEYWORD:
+        arguments.update(arguments.pop(name, {}))
+      elif param.kind is inspect.Parameter.VAR_POSITIONAL:
+        arguments[name] = list(arguments.get(name, ()))
+    return arguments
+  return normalize
+
+
+def cached(ttl: float, resources: tuple = (), cache: ResponseCache = None):
+  """
+  읽기 전용 도구 데코레이터. resources는 이 응답이 의존하는 리소스 종류 (무효화 기준).
+  """
+  def decorator(func):
+    store = cache or response_cache
+    normalize = _normalizer(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+      try:
+        arguments = normalize(args, kwargs)
+        key = (func.__name__, json.dumps(arguments, sort_keys=True, default=str))
+      except (TypeError, ValueError):
+        return func(*args, **kwargs)
+      return store.call(key, ttl, tuple(resources), _scope(arguments), func, *args, **kwargs)
+    return wrapper
+  return decorator
+
+
+def invalidates(resources: tuple, cache: ResponseCache = None):
+  """
+  변경 도구 데코레이터. 실행이 끝나면(성공/실패 무관) 인자의 namespace 기준으로 관련 항목을 지웁니다.
+  """
+  def decorator(func):
+    store = cache or response_cache
+    normalize = _normalizer(func)
+
+    @functools.wraps(func)
+    def wrapper(*args, **kwargs):
+      try:
+        return func(*args, **kwargs)
+      finally:
+        try:
+          namespace = normalize(args, kwargs).get("namespace")
+        except TypeError:
+          namespace = None
+        store.invalidate(tuple(resources), namespace)
+    return wrapper
+  return decorator
+
+
+def apply_policy(func, policies: dict, mutations: dict):
+  """
+  정책 표에 따라 함수를 감쌉니다.
+  policies: {도구 이름: (ttl, 리소스 목록)}, mutations: {도구 이름: 리소스 목록}
+  """
+  if not RESPONSE_CACHE_ENABLED:
+    return func
+  name = func.__name__
+  if name in policies:
+    ttl, resources = policies[name]
+    return cached(ttl, resources)(func)
+  if name in mutations:
+    return invalidates(mutations[name])(func)
+  return func
@@ -1,17 +1,298 @@
-# mcp/main.py (또는 별도 Flask/FastAPI 서버)
-
-from workflows.slack_approval import send_approval_request, send_action_log, send_result_notification
-
-# 예시: 민감 작업 요청 처리
-def handle_sensitive_action(user, action):
-    impact = "이 작업은 모든 EC2 인스턴스가 중지되어 서비스가 중단될 수 있습니다."
-    send_action_log(user, action, "대기(영향도 안내)")
-    # 영향도 안내 후 사용자 확인 → 확인되면
-    send_approval_request(user, action, impact)
-    send_action_log(user, action, "대기(관리자 승인)")
-
-# 예시: 승인 후 실제 작업 실행
-def on_admin_approve(user, action, admin):
-    # 실제 작업 실행 코드
-    send_action_log(user, action, f"실행됨(관리자:{admin})")
-    send_result_notification(action, admin)
\ No newline at end of file
+# mcp/utils/logger.py
+"""
+구조화된 감사 로그(audit log) 기록기.
+
+호출 스레드는 이벤트를 큐에 넣고 바로 반환하며, 단일 writer 스레드가 모아서
+JSON Lines 형식으로 기록합니다. 파일은 한 번 열어 버퍼링된 상태로 유지하고,
+크기(AUDIT_LOG_MAX_BYTES) 또는 시간(AUDIT_LOG_ROTATE_SECONDS) 기준으로 회전하며
+회전된 파일은 선택적으로 gzip 압축합니다.
+
+AUDIT_LOG_DURABILITY로 flush 정책을 정합니다.
+  buffered: AUDIT_LOG_FLUSH_INTERVAL초마다 flush (기본, 가장 빠름)
+  flush:    배치마다 flush (프로세스가 죽어도 OS 버퍼에는 남음)
+  fsync:    배치마다 flush + fsync (전원 장애에도 보존)
+"""
+import atexit
+import datetime
+import glob
+import gzip
+import json
+import logging
+import os
+import queue
+import shutil
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+AUDIT_LOG_PATH = os.getenv("AUDIT_LOG_PATH", "audit_log.jsonl")
+AUDIT_LOG_MAX_BYTES = int(os.getenv("AUDIT_LOG_MAX_BYTES", str(50 * 1024 * 1024)))
+AUDIT_LOG_ROTATE_SECONDS = float(os.getenv("AUDIT_LOG_ROTATE_SECONDS", "86400"))
+AUDIT_LOG_BACKUPS = int(os.getenv("AUDIT_LOG_BACKUPS", "14"))
+AUDIT_LOG_COMPRESS = os.getenv("AUDIT_LOG_COMPRESS", "true").lower() in ("1", "true", "yes")
+AUDIT_LOG_DURABILITY = os.getenv("AUDIT_LOG_DURABILITY", "buffered").lower()
+AUDIT_LOG_FLUSH_INTERVAL = float(os.getenv("AUDIT_LOG_FLUSH_INTERVAL", "1"))
+AUDIT_LOG_QUEUE_SIZE = int(os.getenv("AUDIT_LOG_QUEUE_SIZE", "10000"))
+
+DURABILITY_LEVELS = ("buffered", "flush", "fsync")
+_BATCH_MAX = 512
+_BUFFER_SIZE = 64 * 1024
+
+
+class JsonLinesSink:
+  """
+  회전/압축을 지원하는 JSON Lines 파일. writer 스레드에서만 사용합니다.
+  """
+
+  def __init__(self, path: str = AUDIT_LOG_PATH, max_bytes: int = AUDIT_LOG_MAX_BYTES,
+               rotate_seconds: float = AUDIT_LOG_ROTATE_SECONDS, backups: int = AUDIT_LOG_BACKUPS,
+               compress: bool = AUDIT_LOG_COMPRESS):
+    self.path = path
+    self._max_bytes = max_bytes
+    self._rotate_seconds = rotate_seconds
+    self._backups = backups
+    self._compress = compress
+    self._file = None
+    self._size = 0
+    self._opened_at = 0.0
+    self.rotations = 0
+
+  def _open(self):
+    directory = os.path.dirname(self.path)
+    if directory:
+      os.makedirs(directory, exist_ok=True)
+    self._file = open(self.path, "a", encoding="utf-8", buffering=_BUFFER_SIZE)
+    self._size = self._file.tell()
+    # 재시작 시 기존 파일의 첫 레코드 시각부터 회전 주기를 계산
+    # (mtime은 기록할 때마다 바뀌므로 재시작할 때마다 주기가 초기화됨)
+    started = self._first_timestamp() if self._size else None
+    self._opened_at = started if started is not None else time.time()
+
+  def _first_timestamp(self):
+    """
+    파일 첫 줄의 ts 필드(ISO 8601)를 epoch 초로 반환합니다. 읽을 수 없으면 None.
+    """
+    try:
+      with open(self.path, "r", encoding="utf-8") as f:
+        ts = json.loads(f.readline()).get("ts")
+      parsed = datetime.datetime.fromisoformat(ts)
+    except (OSError, ValueError, TypeError, AttributeError):
+      return None
+    if parsed.tzinfo is None:
+      parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed.timestamp()
+
+  def _should_rotate(self) -> bool:
+    if self._max_bytes and self._size >= self._max_bytes:
+      return True
+    return bool(self._rotate_seconds) and self._size > 0 and time.time() - self._opened_at >= self._rotate_seconds
+
+  def _rotate(self):
+    self._file.close()
+    self._file = None
+    stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+    rotated = f"{self.path}.{stamp}"
+    os.replace(self.path, rotated)
+    self.rotations += 1
+    if self._compress:
+      # 압축은 별도 스레드에서 수행해 기록을 막지 않음
+      threading.Thread(target=self._gzip, args=(rotated,), name="audit-gzip", daemon=True).start()
+    self._prune()
+
+  def _gzip(self, path: str):
+    try:
+      with open(path, "rb") as src, gzip.open(path + ".gz", "wb") as dst:
+        shutil.copyfileobj(src, dst)
+      os.remove(path)
+    except OSError as e:
+      logger.warning("audit log compression failed: %s", e)
+
+  def _prune(self):
+    backups = sorted(p for p in glob.glob(f"{glob.escape(self.path)}.*"))
+    for path in backups[:-self._backups] if self._backups else backups:
+      try:
+        os.remove(path)
+      except OSError:
+        pass
+
+  def write(self, events: list):
+    if self._file is None:
+      self._open()
+    elif self._should_rotate():
+      self._rotate()
+      self._open()
+    data = "".join(json.dumps(e, ensure_ascii=False, default=str) + "\n" for e in events)
+    self._file.write(data)
+    self._size += len(data.encode("utf-8"))
+
+  def flush(self, fsync: bool = False):
+    if self._file is None:
+      return
+    self._file.flush()
+    if fsync:
+      os.fsync(self._file.fileno())
+
+  def close(self):
+    if self._file is not None:
+      self._file.flush()
+      self._file.close()
+      self._file = None
+
+
+def _default_sinks() -> list:
+  """
+  JSON Lines 파일 + (AUDIT_DB가 설정되어 있으면) 조회용 sqlite 색인 저장소.
+  """
+  from utils.audit_store import AUDIT_DB, SqliteAuditSink
+  sinks = [JsonLinesSink()]
+  if AUDIT_DB:
+    sinks.append(SqliteAuditSink(AUDIT_DB))
+  return sinks
+
+
+class AuditLogger:
+  """
+  단일 writer 스레드가 큐의 이벤트를 모아 sink에 기록하는 감사 로거.
+  """
+
+  def __init__(self, sinks: list = None, durability: str = AUDIT_LOG_DURABILITY,
+               flush_interval: float = AUDIT_LOG_FLUSH_INTERVAL, maxsize: int = AUDIT_LOG_QUEUE_SIZE):
+    if durability not in DURABILITY_LEVELS:
+      raise ValueError(f"지원하지 않는 AUDIT_LOG_DURABILITY: {durability} {DURABILITY_LEVELS}")
+    self.sinks = sinks if sinks is not None else _default_sinks()
+    self.durability = durability
+    self._flush_interval = flush_interval
+    self._queue = queue.Queue(maxsize=maxsize)
+    self._lock = threading.Lock()
+    self._thread = None
+    self.written = 0
+    self.dropped = 0
+    self.batches = 0
+    self.last_error = None
+
+  def add_sink(self, sink):
+    """
+    sink 객체(write(events), flush(fsync), close())를 추가합니다.
+    """
+    self.sinks.append(sink)
+
+  def _ensure_started(self):
+    if self._thread and self._thread.is_alive():
+      return
+    with self._lock:
+      if self._thread and self._thread.is_alive():
+        return
+      self._thread = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+      self._thread.start()
+
+  def log(self, event: dict) -> bool:
+    """
+    이벤트를 큐에 넣습니다 (ts 필드가 없으면 현재 시각 추가). 큐가 가득 차면 버리고 False.
+    """
+    self._ensure_started()
+    event.setdefault("ts", datetime.datetime.now(datetime.timezone.utc).isoformat())
+    try:
+      self._queue.put_nowait(event)
+      return True
+    except queue.Full:
+      self.dropped += 1
+      return False
+
+  def record(self, user: str, action: str, status: str, **fields) -> bool:
+    """
+    작업 감사 이벤트: {ts, user, action, status, ...추가 필드}
+    """
+    return self.log({"user": user, "action": action, "status": status, **fields})
+
+  def _drain(self, first) -> tuple:
+    events, waiters = [], []
+    item = first
+    while True:
+      if isinstance(item, threading.Event):
+        waiters.append(item)
+      elif item is not None:
+        events.append(item)
+      if len(events) >= _BATCH_MAX:
+        break
+      try:
+        item = self._queue.get_nowait()
+      except queue.Empty:
+        break
+    return events, waiters
+
+  def _write(self, events: list, fsync: bool = None):
+    for sink in self.sinks:
+      try:
+        if events:
+          sink.write(events)
+        if fsync is not None:
+          sink.flush(fsync)
+      except Exception as e:
+        self.last_error = str(e)
+        logger.warning("audit sink %s failed: %s", type(sink).__name__, e)
+
+  def _run(self):
+    last_flush = time.monotonic()
+    while True:
+      timeout = self._flush_interval if self.durability == "buffered" else None
+      try:
+        first = self._queue.get(timeout=timeout)
+      except queue.Empty:
+        first = None
+      events, waiters = self._drain(first)
+
+      if self.durability == "buffered":
+        due = waiters or time.monotonic() - last_flush >= self._flush_interval
+        self._write(events, fsync=False if due else None)
+        if due:
+          last_flush = time.monotonic()
+      else:
+        self._write(events, fsync=self.durability == "fsync")
+      if events:
+        self.written += len(events)
+        self.batches += 1
+      for waiter in waiters:
+        waiter.set()
+
+  def flush(self, timeout: float = 5.0) -> bool:
+    """
+    현재까지 큐에 들어온 이벤트가 모두 기록(flush)될 때까지 기다립니다.
+    """
+    if not (self._thread and self._thread.is_alive()):
+      return True
+    done = threading.Event()
+    try:
+      self._queue.put(done, timeout=timeout)
+    except queue.Full:
+      return False
+    return done.wait(timeout)
+
+  def close(self):
+    self.flush()
+    for sink in self.sinks:
+      try:
+        sink.close()
+      except Exception:
+        pass
+
+  def stats(self) -> dict:
+    return {
+      "depth": self._queue.qsize(),
+      "written": self.written,
+      "dropped": self.dropped,
+      "batches": self.batches,
+      "durability": self.durability,
+      "last_error": self.last_error,
+    }
+
+
+audit = AuditLogger()
+atexit.register(audit.close)
+
+
+def audit_log(user: str, action: str, status: str, **fields) -> bool:
+  """
+  서버 전역 감사 로거에 작업 이벤트를 기록합니다.
+  """
+  return audit.record(user, action, status, **fields)
@@ -0,0 +1,331 @@
+# mcp/utils/metrics.py
+"""
+Prometheus 텍스트 형식 메트릭 (prometheus_client 없이 구현).
+
+- 도구: main.py의 register_tool이 instrument()로 감싸 호출 수/에러 수/지연 히스토그램과
+  응답 크기(METRICS_PAYLOAD_SAMPLE번에 한 번 샘플링, JSON 직렬화 비용 때문)를 기록합니다.
+- 업스트림: Kubernetes(동사/리소스), AWS(서비스.오퍼레이션), Slack 요청 지연을 기록합니다.
+  Kubernetes는 ApiClient.call_api, AWS는 botocore 이벤트, Slack은 전송 스레드에서 측정합니다.
+- 수집기: 캐시/커넥션 풀/전송 큐 등 기존 stats() 결과를 스크레이프 시점에 게이지로 내보냅니다.
+같은 uvicorn 앱에 GET /metrics로 마운트되며 METRICS=false면 아무것도 감싸지 않습니다.
+"""
+import bisect
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+METRICS_ENABLED = os.getenv("METRICS", "true").lower() in ("1", "true", "yes")
+METRICS_PAYLOAD_SAMPLE = max(1, int(os.getenv("METRICS_PAYLOAD_SAMPLE", "10")))
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576, 4194304)
+
+
+def _escape(value) -> str:
+  return str(value).replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+def _labels(names: tuple, values: tuple, extra: str = None) -> str:
+  parts = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+  if extra:
+    parts.append(extra)
+  return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _number(value) -> str:
+  if value == float("inf"):
+    return "+Inf"
+  return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+  def __init__(self, name: str, help_text: str, label_names: tuple):
+    self.name = name
+    self.help = help_text
+    self.label_names = label_names
+    self._lock = threading.Lock()
+    self._values = {}
+
+  def inc(self, labels: tuple, amount: float = 1):
+    with self._lock:
+      self._values[labels] = self._values.get(labels, 0) + amount
+
+  def render(self) -> list:
+    with self._lock:
+      values = list(self._values.items())
+    lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} counter"]
+    lines += [f"{self.name}{_labels(self.label_names, k)} {_number(v)}" for k, v in sorted(values)]
+    return lines
+
+
+class Histogram:
+  """
+  고정 버킷 히스토그램. 관측은 bisect 한 번과 잠금 안의 덧셈 세 번입니다.
+  """
+
+  def __init__(self, name: str, help_text: str, label_names: tuple, buckets: tuple = LATENCY_BUCKETS):
+    self.name = name
+    self.help = help_text
+    self.label_names = label_names
+    self._buckets = tuple(buckets)
+    self._lock = threading.Lock()
+    self._series = {}
+
+  def observe(self, labels: tuple, value: float):
+    index = bisect.bisect_left(self._buckets, value)
+    with self._lock:
+      series = self._series.get(labels)
+      if series is None:
+        series = self._series[labels] = [[0] * (len(self._buckets) + 1), 0.0, 0]
+      series[0][index] += 1
+      series[1] += value
+      series[2] += 1
+
+  def render(self) -> list:
+    with self._lock:
+      snapshot = [(k, list(s[0]), s[1], s[2]) for k, s in self._series.items()]
+    lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+    for labels, counts, total, count in sorted(snapshot):
+      cumulative = 0
+      for bound, n in zip(self._buckets + (float("inf"),), counts):
+        cumulative += n
+        le = f'le="{_number(bound)}"'
+        lines.append(f"{self.name}_bucket{_labels(self.label_names, labels, le)} {cumulative}")
+      lines.append(f"{self.name}_sum{_labels(self.label_names, labels)} {_number(total)}")
+      lines.append(f"{self.name}_count{_labels(self.label_names, labels)} {count}")
+    return lines
+
+
+TOOL_CALLS = Counter("mcp_tool_calls_total", "MCP tool invocations", ("tool",))
+TOOL_ERRORS = Counter("mcp_tool_errors_total", "MCP tool invocations that raised or returned an error", ("tool",))
+TOOL_LATENCY = Histogram("mcp_tool_duration_seconds", "MCP tool latency including thread pool wait", ("tool",))
+TOOL_PAYLOAD = Histogram("mcp_tool_response_bytes", "Sampled MCP tool response size (JSON bytes)", ("tool",),
+                         SIZE_BUCKETS)
+UPSTREAM_CALLS = Counter("mcp_upstream_requests_total", "Upstream API requests", ("system", "operation"))
+UPSTREAM_ERRORS = Counter("mcp_upstream_errors_total", "Failed upstream API requests", ("system", "operation"))
+UPSTREAM_LATENCY = Histogram("mcp_upstream_duration_seconds", "Upstream API request latency",
+                             ("system", "operation"))
+
+_METRICS = (TOOL_CALLS, TOOL_ERRORS, TOOL_LATENCY, TOOL_PAYLOAD, UPSTREAM_CALLS, UPSTREAM_ERRORS, UPSTREAM_LATENCY)
+_collectors = {}
+
+
+def _is_error(result) -> bool:
+  if not isinstance(result, dict):
+    return False
+  return result.get("status") == "error" or (len(result) == 1 and "error" in result)
+
+
+def observe_upstream(system: str, operation: str, seconds: float, error: bool = False):
+  labels = (system, operation)
+  UPSTREAM_CALLS.inc(labels)
+  UPSTREAM_LATENCY.observe(labels, seconds)
+  if error:
+    UPSTREAM_ERRORS.inc(labels)
+
+
+def instrument(func):
+  """
+  도구 함수(동기/코루틴)를 같은 이름/시그니처로 감싸 호출 메트릭을 기록합니다.
+  """
+  if not METRICS_ENABLED:
+    return func
+  labels = (func.__name__,)
+  calls = [0]
+
+  def record(started: float, result, failed: bool):
+    TOOL_CALLS.inc(labels)
+    TOOL_LATENCY.observe(labels, time.perf_counter() - started)
+    if failed or _is_error(result):
+      TOOL_ERRORS.inc(labels)
+    calls[0] += 1
+    if calls[0] % METRICS_PAYLOAD_SAMPLE == 0 and result is not None:
+      try:
+        TOOL_PAYLOAD.observe(labels, len(json.dumps(result, default=str, ensure_ascii=False)))
+      except (TypeError, ValueError):
+        pass
+
+  if inspect.iscoroutinefunction(func):
+    @functools.wraps(func)
+    async def async_wrapper(*args, **kwargs):
+      started = time.perf_counter()
+      try:
+        result = await func(*args, **kwargs)
+      except BaseException:
+        record(started, None, True)
+        raise
+      record(started, result, False)
+      return result
+    return async_wrapper
+
+  @functools.wraps(func)
+  def wrapper(*args, **kwargs):
+    started = time.perf_counter()
+    try:
+      result = func(*args, **kwargs)
+    except BaseException:
+      record(started, None, True)
+      raise
+    record(started, result, False)
+    return result
+  return wrapper
+
+
+# ── 업스트림 계측 ─────────────────────────────
+_K8S_VERBS = {"POST": "create", "PUT": "update", "PATCH": "patch", "DELETE": "delete"}
+_NAMESPACE_SUBRESOURCES = ("status", "finalize")
+
+
+def k8s_operation(resource_path: str, method: str, query_params) -> str:
+  """
+  '/apis/apps/v1/namespaces/{namespace}/deployments/{name}/scale' -> 'patch deployments/scale'
+  생성된 *Api 메서드는 경로 템플릿(치환 전)을, DynamicClient(apply_yaml 등)는 치환된 경로를 넘기므로
+  placeholder 여부가 아니라 위치로 네임스페이스/이름 세그먼트를 제거해 레이블 수를 고정합니다.
+  """
+  segments = [s for s in resource_path.split("/") if s]
+  # api/v1/... 또는 apis/<group>/<version>/... (metrics.k8s.io 등 도메인 그룹은 리소스에 붙여 구분)
+  group = ""
+  if segments[:1] == ["api"]:
+    segments = segments[2:]
+  else:
+    if len(segments) > 1 and "." in segments[1]:
+      group = "." + segments[1]
+    segments = segments[3:]
+  # 이전 형식 WATCH 경로: .../v1/watch/namespaces/<ns>/pods
+  watching = segments[:1] == ["watch"]
+  if watching:
+    segments = segments[1:]
+  # namespaces/<ns>/<리소스>...: 네임스페이스 범위 리소스 (namespaces/<이름>/status|finalize는 Namespace 자체)
+  if segments[:1] == ["namespaces"] and len(segments) > 2 and segments[2] not in _NAMESPACE_SUBRESOURCES:
+    segments = segments[2:]
+  # <리소스>[/<이름>[/<하위 리소스>]] (proxy 등 하위 리소스 뒤의 임의 경로는 버림)
+  named = len(segments) > 1
+  resource = "/".join(segments[:1] + segments[2:3])
+  if not resource:
+    resource = "discovery"
+  elif group:
+    head, _, sub = resource.partition("/")
+    resource = head + group + ("/" + sub if sub else "")
+  if method == "GET":
+    if watching or any(k == "watch" and v for k, v in query_params or ()):
+      verb = "watch"
+    else:
+      verb = "get" if named else "list"
+  else:
+    verb = _K8S_VERBS.get(method, method.lower())
+  return f"{verb} {resource}"
+
+
+def instrument_kubernetes(api_client):
+  """
+  ApiClient 인스턴스의 call_api를 감싸 요청별 지연을 기록합니다 (ClientRegistry 빌드 훅).
+  WATCH/스트리밍 응답은 헤더 수신까지의 시간만 측정됩니다.
+  """
+  call_api = api_client.call_api
+  if getattr(call_api, "_metrics_instrumented", False):
+    return
+
+  @functools.wraps(call_api)
+  def wrapper(resource_path, method, *args, **kwargs):
+    query_params = kwargs.get("query_params", args[1] if len(args) > 1 else None)
+    operation = k8s_operation(resource_path, method, query_params)
+    started = time.perf_counter()
+    try:
+      result = call_api(resource_path, method, *args, **kwargs)
+    except Exception:
+      observe_upstream("kubernetes", operation, time.perf_counter() - started, True)
+      raise
+    observe_upstream("kubernetes", operation, time.perf_counter() - started)
+    return result
+  wrapper._metrics_instrumented = True
+  api_client.call_api = wrapper
+
+
+def _aws_operation(event_name: str) -> str:
+  # 'after-call.ec2.DescribeInstances' -> 'ec2.DescribeInstances'
+  return event_name.split(".", 1)[1] if "." in event_name else event_name
+
+
+def _aws_before_call(context=None, **kwargs):
+  if context is not None:
+    context["metrics_started"] = time.perf_counter()
+
+
+def _aws_after_call(event_name: str = "", http_response=None, context=None, **kwargs):
+  started = (context or {}).get("metrics_started")
+  if started is not None:
+    status = getattr(http_response, "status_code", 200)
+    observe_upstream("aws", _aws_operation(event_name), time.perf_counter() - started, status >= 400)
+
+
+def _aws_after_call_error(event_name: str = "", context=None, **kwargs):
+  started = (context or {}).get("metrics_started")
+  if started is not None:
+    observe_upstream("aws", _aws_operation(event_name), time.perf_counter() - started, True)
+
+
+# botocore 이벤트 -> 핸들러 (tools.aws.clients.ClientCache.register_event에 등록)
+AWS_EVENT_HANDLERS = (
+  ("before-call", _aws_before_call),
+  ("after-call", _aws_after_call),
+  ("after-call-error", _aws_after_call_error),
+)
+
+
+# ── 수집기 / 노출 ─────────────────────────────
+def register_collector(name: str, func):
+  """
+  스크레이프 시점에 호출할 stats 함수. 숫자/불리언 값(중첩 dict 포함)을 mcp_<name>_<key> 게이지로 노출합니다.
+  """
+  _collectors[name] = func
+
+
+def _flatten(prefix: str, value, out: list):
+  if isinstance(value, dict):
+    for k, v in value.items():
+      _flatten(f"{prefix}_{k}", v, out)
+  elif isinstance(value, bool):
+    out.append((prefix, int(value)))
+  elif isinstance(value, (int, float)):
+    out.append((prefix, value))
+
+
+def _metric_name(name: str) -> str:
+  return "".join(c if c.isalnum() or c == "_" else "_" for c in name)
+
+
+def render() -> str:
+  lines = []
+  for metric in _METRICS:
+    lines += metric.render()
+  for name, func in list(_collectors.items()):
+    try:
+      values = []
+      _flatten(f"mcp_{name}", func(), values)
+    except Exception as e:
+      logger.warning("metrics collector %s failed: %s", name, e)
+      continue
+    for key, value in values:
+      metric = _metric_name(key)
+      lines += [f"# TYPE {metric} gauge", f"{metric} {_number(value)}"]
+  return "\n".join(lines) + "\n"
+
+
+def mount_metrics_route(app, path: str = "/metrics"):
+  """
+  Starlette 앱(mcp.sse_app())에 Prometheus 스크레이프 라우트를 추가합니다.
+  """
+  if not METRICS_ENABLED:
+    return
+  from starlette.responses import PlainTextResponse
+  from starlette.routing import Route
+
+  async def metrics_endpoint(request):
+    return PlainTextResponse(render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+  app.router.routes.append(Route(path, metrics_endpoint, methods=["GET"]))
@@ -0,0 +1,330 @@
+# mcp/utils/tracing.py
+"""
+선택적 분산 추적 (OpenTelemetry 형식의 span, 외부 라이브러리 없이 구현).
+
+TRACING=file|otlp일 때만 동작하며, 기본값(off)이면 main.py가 도구/클라이언트를 감싸지 않고
+span()은 공유 no-op 객체를 돌려주므로 비용이 없습니다.
+- MCP 도구 호출 하나가 루트 span이 되고, Kubernetes API 요청(kubeconfig 로드 포함),
+  boto3 호출, Slack 웹훅 전송이 그 아래 자식 span으로 기록됩니다.
+  도구 스레드 풀은 contextvars를 복사하므로 현재 span이 스레드로 그대로 전달됩니다.
+- 승인 요청은 W3C traceparent를 승인 저장소에 함께 보관해,
+  Slack 콜백에서 실행되는 승인 작업이 요청한 도구 호출과 같은 trace로 이어집니다.
+- span은 감사 로그와 같은 단일 writer 큐(AuditLogger)로 내보냅니다.
+  file: TRACING_FILE에 JSON Lines (회전/압축 포함), otlp: OTLP/HTTP JSON으로 TRACING_OTLP_ENDPOINT에 전송
+"""
+import atexit
+import contextvars
+import functools
+import inspect
+import json
+import logging
+import os
+import time
+import urllib.request
+
+from utils.logger import AuditLogger, JsonLinesSink
+
+logger = logging.getLogger(__name__)
+
+TRACING = os.getenv("TRACING", "off").lower()
+TRACING_ENABLED = TRACING in ("file", "otlp")
+TRACING_FILE = os.getenv("TRACING_FILE", "traces.jsonl")
+TRACING_OTLP_ENDPOINT = os.getenv("TRACING_OTLP_ENDPOINT", "http://localhost:4318/v1/traces")
+TRACING_SERVICE_NAME = os.getenv("TRACING_SERVICE_NAME", "k8s-aws-copilot")
+_OTLP_TIMEOUT = 5
+
+# OTLP SpanKind
+_KINDS = {"internal": 1, "server": 2, "client": 3}
+
+_current = contextvars.ContextVar("current_span", default=None)
+
+
+class OtlpHttpSink:
+  """
+  AuditLogger sink: span 배치를 OTLP/HTTP JSON(ExportTraceServiceRequest)으로 전송합니다.
+  """
+
+  def __init__(self, endpoint: str = TRACING_OTLP_ENDPOINT, service_name: str = TRACING_SERVICE_NAME):
+    self.endpoint = endpoint
+    self._resource = {"attributes": [_attribute("service.name", service_name)]}
+
+  def write(self, events: list):
+    body = {"resourceSpans": [{
+      "resource": self._resource,
+      "scopeSpans": [{"scope": {"name": "k8s-aws-copilot"}, "spans": [_otlp_span(e) for e in events]}],
+    }]}
+    request = urllib.request.Request(self.endpoint, data=json.dumps(body, default=str).encode("utf-8"),
+                                     headers={"Content-Type": "application/json"}, method="POST")
+    with urllib.request.urlopen(request, timeout=_OTLP_TIMEOUT) as resp:
+      resp.read()
+
+  def flush(self, fsync: bool = False):
+    pass
+
+  def close(self):
+    pass
+
+
+def _attribute(key: str, value) -> dict:
+  if isinstance(value, bool):
+    return {"key": key, "value": {"boolValue": value}}
+  if isinstance(value, int):
+    return {"key": key, "value": {"intValue": str(value)}}
+  if isinstance(value, float):
+    return {"key": key, "value": {"doubleValue": value}}
+  return {"key": key, "value": {"stringValue": str(value)}}
+
+
+def _otlp_span(event: dict) -> dict:
+  span = {
+    "traceId": event["trace_id"],
+    "spanId": event["span_id"],
+    "name": event["name"],
+    "kind": _KINDS.get(event["kind"], 1),
+    "startTimeUnixNano": str(event["start_ns"]),
+    "endTimeUnixNano": str(event["end_ns"]),
+    "attributes": [_attribute(k, v) for k, v in event["attributes"].items()],
+    "status": {"code": 2, "message": event["error"]} if event["error"] else {"code": 1},
+  }
+  if event["parent_id"]:
+    span["parentSpanId"] = event["parent_id"]
+  return span
+
+
+def _exporter():
+  if not TRACING_ENABLED:
+    return None
+  sink = OtlpHttpSink() if TRACING == "otlp" else JsonLinesSink(TRACING_FILE)
+  return AuditLogger(sinks=[sink], durability="buffered")
+
+
+_export = _exporter()
+if _export is not None:
+  atexit.register(_export.close)
+
+
+class Span:
+  __slots__ = ("trace_id", "span_id", "parent_id", "name", "kind", "attributes", "error", "start_ns", "_token")
+
+  def __init__(self, name: str, kind: str = "internal", parent: tuple = None, attributes: dict = None):
+    if parent is None:
+      current = _current.get()
+      parent = (current.trace_id, current.span_id) if current is not None else None
+    self.trace_id = parent[0] if parent else os.urandom(16).hex()
+    self.parent_id = parent[1] if parent else None
+    self.span_id = os.urandom(8).hex()
+    self.name = name
+    self.kind = kind
+    self.attributes = dict(attributes or {})
+    self.error = None
+    self.start_ns = time.time_ns()
+    self._token = None
+
+  def set_attribute(self, key: str, value):
+    self.attributes[key] = value
+
+  def set_error(self, message: str):
+    self.error = str(message)[:500]
+
+  def traceparent(self) -> str:
+    return f"00-{self.trace_id}-{self.span_id}-01"
+
+  def finish(self):
+    end_ns = time.time_ns()
+    _export.log({
+      "trace_id": self.trace_id,
+      "span_id": self.span_id,
+      "parent_id": self.parent_id,
+      "name": self.name,
+      "kind": self.kind,
+      "start_ns": self.start_ns,
+      "end_ns": end_ns,
+      "duration_ms": round((end_ns - self.start_ns) / 1e6, 3),
+      "attributes": self.attributes,
+      "error": self.error,
+    })
+
+  def __enter__(self):
+    self._token = _current.set(self)
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    _current.reset(self._token)
+    if exc is not None and self.error is None:
+      self.set_error(f"{exc_type.__name__}: {exc}")
+    self.finish()
+    return False
+
+
+class _NoopSpan:
+  trace_id = span_id = parent_id = None
+
+  def set_attribute(self, key: str, value):
+    pass
+
+  def set_error(self, message: str):
+    pass
+
+  def traceparent(self):
+    return None
+
+  def finish(self):
+    pass
+
+  def __enter__(self):
+    return self
+
+  def __exit__(self, exc_type, exc, tb):
+    return False
+
+
+_NOOP = _NoopSpan()
+
+
+def parse_traceparent(value: str):
+  """
+  '00-<trace_id>-<span_id>-<flags>' -> (trace_id, span_id). 형식이 다르면 None.
+  """
+  parts = (value or "").split("-")
+  if len(parts) != 4 or len(parts[1]) != 32 or len(parts[2]) != 16:
+    return None
+  return parts[1], parts[2]
+
+
+def span(name: str, kind: str = "internal", parent: str = None, **attributes):
+  """
+  with span("이름"): 블록을 현재 span의 자식으로 기록합니다.
+  parent에 traceparent 문자열을 주면 그 trace를 이어갑니다 (승인 콜백 등 다른 요청에서).
+  """
+  if not TRACING_ENABLED:
+    return _NOOP
+  return Span(name, kind, parse_traceparent(parent) if parent else None, attributes)
+
+
+def traceparent():
+  """
+  현재 span의 W3C traceparent (추적이 꺼져 있거나 span 밖이면 None).
+  """
+  current = _current.get() if TRACING_ENABLED else None
+  return current.traceparent() if current is not None else None
+
+
+def _is_error(result):
+  if not isinstance(result, dict):
+    return None
+  if result.get("status") == "error":
+    return result.get("message") or "error"
+  if len(result) == 1 and "error" in result:
+    return result["error"]
+  return None
+
+
+def trace_tool(func):
+  """
+  도구 함수(동기/코루틴)를 같은 이름/시그니처로 감싸 호출마다 루트 span을 만듭니다.
+  """
+  if not TRACING_ENABLED:
+    return func
+  name = f"tool {func.__name__}"
+
+  def finish(s: Span, result):
+    error = _is_error(result)
+    if error:
+      s.set_error(error)
+    if isinstance(result, dict) and result.get("approval_id"):
+      s.set_attribute("approval.id", result["approval_id"])
+
+  if inspect.iscoroutinefunction(func):
+    @functools.wraps(func)
+    async def async_wrapper(*args, **kwargs):
+      # 도구 호출은 항상 새 trace의 루트
+      token = _current.set(None)
+      try:
+        with Span(name, "server", attributes={"mcp.tool": func.__name__}) as s:
+          result = await func(*args, **kwargs)
+          finish(s, result)
+          return result
+      finally:
+        _current.reset(token)
+    return async_wrapper
+
+  @functools.wraps(func)
+  def wrapper(*args, **kwargs):
+    token = _current.set(None)
+    try:
+      with Span(name, "server", attributes={"mcp.tool": func.__name__}) as s:
+        result = func(*args, **kwargs)
+        finish(s, result)
+        return result
+    finally:
+      _current.reset(token)
+  return wrapper
+
+
+# ── 업스트림 계측 ─────────────────────────────
+def instrument_kubernetes(api_client):
+  """
+  ApiClient 인스턴스의 call_api를 감싸 요청마다 자식 span을 만듭니다 (응답 역직렬화 포함).
+  _preload_content=False(로그 스트리밍 등)면 본문 읽기는 호출한 도구 span에 포함됩니다.
+  """
+  from utils.metrics import k8s_operation
+
+  call_api = api_client.call_api
+  if getattr(call_api, "_traced", False):
+    return
+
+  @functools.wraps(call_api)
+  def wrapper(resource_path, method, *args, **kwargs):
+    query_params = kwargs.get("query_params", args[1] if len(args) > 1 else None)
+    with Span(f"k8s {k8s_operation(resource_path, method, query_params)}", "client",
+              attributes={"http.method": method, "k8s.path": resource_path}):
+      return call_api(resource_path, method, *args, **kwargs)
+  wrapper._traced = True
+  api_client.call_api = wrapper
+
+
+def trace_kubeconfig_load(registry):
+  """
+  ClientRegistry의 설정 로드(kubeconfig/in-cluster, ApiClient 생성)를 span으로 기록합니다.
+  """
+  build = registry._build
+
+  @functools.wraps(build)
+  def traced_build():
+    with Span("k8s load_config"):
+      return build()
+  registry._build = traced_build
+
+
+def _aws_before_call(event_name: str = "", context=None, **kwargs):
+  if context is not None:
+    context["trace_span"] = Span(f"aws {event_name.split('.', 1)[-1]}", "client")
+
+
+def _aws_after_call(http_response=None, context=None, **kwargs):
+  s = (context or {}).pop("trace_span", None)
+  if s is not None:
+    status = getattr(http_response, "status_code", 200)
+    s.set_attribute("http.status_code", status)
+    if status >= 400:
+      s.set_error(f"HTTP {status}")
+    s.finish()
+
+
+def _aws_after_call_error(exception=None, context=None, **kwargs):
+  s = (context or {}).pop("trace_span", None)
+  if s is not None:
+    s.set_error(repr(exception))
+    s.finish()
+
+
+# botocore 이벤트 -> 핸들러 (tools.aws.clients.ClientCache.register_event에 등록)
+AWS_EVENT_HANDLERS = (
+  ("before-call", _aws_before_call),
+  ("after-call", _aws_after_call),
+  ("after-call-error", _aws_after_call_error),
+)
+
+
+def stats() -> dict:
+  return {"enabled": TRACING_ENABLED, **(_export.stats() if _export is not None else {})}
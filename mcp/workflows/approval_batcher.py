@@ -0,0 +1,109 @@
+# mcp/workflows/approval_batcher.py
+"""
+승인 요청 묶음 전송.
+
+같은 요청자/세션에서 APPROVAL_BATCH_WINDOW초 안에 들어온 승인 요청을 모아
+Slack 메시지 하나로 보냅니다. 첫 요청이 들어온 시점부터 창이 열리며,
+APPROVAL_BATCH_MAX건이 모이면 창이 끝나기 전에 바로 보냅니다.
+한 건만 모이면 기존 단건 승인 메시지를 그대로 사용합니다. 창을 0으로 두면 묶지 않습니다.
+"""
+import atexit
+import logging
+import os
+import threading
+import uuid
+
+from utils.tracing import span
+from workflows.approval_store import approval_store
+from workflows.slack_approval import send_approval_request_with_button, send_batch_approval_request
+
+logger = logging.getLogger(__name__)
+
+APPROVAL_BATCH_WINDOW = float(os.getenv("APPROVAL_BATCH_WINDOW", "5"))
+# 체크박스 요소 5개(옵션 50개)와 메시지 블록 수 제한 안에서 보낼 수 있는 최대 건수
+APPROVAL_BATCH_MAX = min(int(os.getenv("APPROVAL_BATCH_MAX", "30")), 50)
+
+
+class ApprovalBatcher:
+  """
+  (요청자, 세션) -> 대기 중인 승인 요청 목록.
+  """
+
+  def __init__(self, window: float = APPROVAL_BATCH_WINDOW, max_items: int = APPROVAL_BATCH_MAX):
+    self.window = window
+    self._max_items = max_items
+    self._lock = threading.Lock()
+    self._groups = {}
+    self.batches = 0
+    self.singles = 0
+
+  def submit(self, user: str, session: str, item: dict):
+    """
+    item: {"approval_id", "action", "impact", "resource_type", "resource_name", "namespace"}
+    """
+    if self.window <= 0:
+      self._send(user, [item])
+      return
+    key = (user, session)
+    ready = None
+    with self._lock:
+      group = self._groups.get(key)
+      if group is None:
+        timer = threading.Timer(self.window, self._flush, args=(key,))
+        timer.daemon = True
+        group = self._groups[key] = {"items": [], "timer": timer}
+        timer.start()
+      group["items"].append(item)
+      if len(group["items"]) >= self._max_items:
+        group["timer"].cancel()
+        ready = self._groups.pop(key)["items"]
+    if ready:
+      self._send(user, ready)
+
+  def _flush(self, key: tuple):
+    with self._lock:
+      group = self._groups.pop(key, None)
+    if group:
+      self._send(key[0], group["items"])
+
+  def _send(self, user: str, items: list):
+    # 타이머 스레드에서 보내므로 첫 요청의 trace를 이어 Slack 전송을 연결
+    with span("approval.request", parent=items[0].get("trace_context"), items=len(items)):
+      self._send_items(user, items)
+
+  def _send_items(self, user: str, items: list):
+    try:
+      if len(items) == 1:
+        self.singles += 1
+        item = items[0]
+        send_approval_request_with_button(
+          user=user,
+          action=item["action"],
+          impact=item["impact"],
+          resource_type=item["resource_type"],
+          resource_name=item["resource_name"],
+          namespace=item["namespace"],
+          approval_id=item["approval_id"]
+        )
+        return
+      batch_id = uuid.uuid4().hex
+      approval_store.assign_batch([item["approval_id"] for item in items], batch_id)
+      self.batches += 1
+      send_batch_approval_request(user, batch_id, items)
+    except Exception as e:
+      logger.error("approval request delivery failed: %s", e)
+
+  def flush_all(self):
+    """
+    열려 있는 모든 창을 즉시 보냅니다 (종료 시).
+    """
+    with self._lock:
+      groups = list(self._groups.items())
+      self._groups = {}
+    for key, group in groups:
+      group["timer"].cancel()
+      self._send(key[0], group["items"])
+
+
+approval_batcher = ApprovalBatcher()
+atexit.register(approval_batcher.flush_all)
@@ -0,0 +1,278 @@
+# mcp/workflows/approval_store.py
+"""
+승인 대기 요청 저장소.
+
+approval_required가 만든 요청(호출 인자, 요청자, 만료 시각)을 승인 id로 보관하고,
+Slack 버튼에는 승인 id만 실어 보냅니다. 콜백은 id로 바로 찾아 한 번만 실행합니다.
+
+- 메모리 dict + sqlite(WAL) 영속화(APPROVAL_DB). 승인 콜백 서버가 별도 프로세스여도
+  같은 파일을 보므로 요청을 찾을 수 있습니다.
+- claim()은 pending -> executing 전이를 조건부 UPDATE 한 번으로 수행해
+  버튼을 여러 번 누르거나 콜백이 재전송되어도 작업은 정확히 한 번만 실행됩니다.
+- 백그라운드 스레드가 만료된 요청을 expired로 바꾸고, 오래된 완료 기록을 정리합니다.
+"""
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+APPROVAL_DB = os.getenv("APPROVAL_DB", "approvals.db")
+APPROVAL_TTL = int(os.getenv("APPROVAL_TTL", "3600"))
+# 완료/만료된 요청을 보관하는 기간(초), 중복 콜백에 이전 결과를 돌려주는 데 사용
+APPROVAL_RETENTION = int(os.getenv("APPROVAL_RETENTION", str(7 * 24 * 3600)))
+APPROVAL_SWEEP_INTERVAL = float(os.getenv("APPROVAL_SWEEP_INTERVAL", "30"))
+
+PENDING = "pending"
+EXECUTING = "executing"
+DONE = "done"
+FAILED = "failed"
+EXPIRED = "expired"
+
+_FIELDS = ("id", "action", "args", "kwargs", "requester", "resource_type", "resource_name",
+           "namespace", "action_name", "created_at", "expires_at", "status", "approver", "result",
+           "batch_id", "trace_context")
+_JSON_FIELDS = ("args", "kwargs", "result")
+
+
+class ApprovalStore:
+  """
+  승인 id -> 요청 레코드. 모든 상태 전이는 잠금 안에서 메모리와 DB에 함께 반영됩니다.
+  """
+
+  def __init__(self, db_path: str = APPROVAL_DB, ttl: int = APPROVAL_TTL,
+               retention: int = APPROVAL_RETENTION):
+    self._lock = threading.Lock()
+    self._records = {}
+    self.ttl = ttl
+    self._retention = retention
+    self._db = None
+    self._stop = threading.Event()
+    self._thread = None
+    if db_path:
+      self._db = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None)
+      self._db.execute("PRAGMA journal_mode=WAL")
+      self._db.execute("PRAGMA synchronous=NORMAL")
+      # 다른 프로세스(콜백 서버)와 동시에 쓸 때 잠금 대기
+      self._db.execute("PRAGMA busy_timeout=5000")
+      self._db.execute(
+        "CREATE TABLE IF NOT EXISTS approvals ("
+        " id TEXT PRIMARY KEY, action TEXT, args TEXT, kwargs TEXT, requester TEXT,"
+        " resource_type TEXT, resource_name TEXT, namespace TEXT, action_name TEXT,"
+        " created_at REAL, expires_at REAL, status TEXT, approver TEXT, result TEXT, batch_id TEXT,"
+        " trace_context TEXT)"
+      )
+      columns = {row[1] for row in self._db.execute("PRAGMA table_info(approvals)")}
+      for column in ("batch_id", "trace_context"):
+        if column not in columns:
+          self._db.execute(f"ALTER TABLE approvals ADD COLUMN {column} TEXT")
+      self._db.execute("CREATE INDEX IF NOT EXISTS idx_approvals_batch ON approvals(batch_id)")
+      self._db.execute("CREATE INDEX IF NOT EXISTS idx_approvals_status_expires ON approvals(status, expires_at)")
+
+  def _row(self, record: dict) -> tuple:
+    return tuple(
+      json.dumps(record[f], ensure_ascii=False, default=str) if f in _JSON_FIELDS and record[f] is not None
+      else record[f]
+      for f in _FIELDS
+    )
+
+  def _from_row(self, row) -> dict:
+    record = dict(zip(_FIELDS, row))
+    for f in _JSON_FIELDS:
+      if record[f] is not None:
+        record[f] = json.loads(record[f])
+    return record
+
+  def create(self, action: str, args: list = None, kwargs: dict = None, requester: str = "unknown",
+             ttl: int = None, **meta) -> str:
+    """
+    승인 대기 요청을 저장하고 승인 id를 반환합니다.
+    meta: resource_type, resource_name, namespace, action_name, trace_context(W3C traceparent)
+    """
+    now = time.time()
+    record = {
+      "id": uuid.uuid4().hex,
+      "action": action,
+      "args": list(args or []),
+      "kwargs": dict(kwargs or {}),
+      "requester": requester,
+      "resource_type": meta.get("resource_type"),
+      "resource_name": meta.get("resource_name"),
+      "namespace": meta.get("namespace"),
+      "action_name": meta.get("action_name"),
+      "created_at": now,
+      "expires_at": now + (ttl or self.ttl),
+      "status": PENDING,
+      "approver": None,
+      "result": None,
+      "batch_id": None,
+      "trace_context": meta.get("trace_context"),
+    }
+    with self._lock:
+      self._records[record["id"]] = record
+      if self._db is not None:
+        self._db.execute(f"INSERT INTO approvals VALUES ({', '.join('?' * len(_FIELDS))})", self._row(record))
+    self._ensure_sweeper()
+    return record["id"]
+
+  def get(self, approval_id: str):
+    with self._lock:
+      record = self._records.get(approval_id)
+      if record is None and self._db is not None:
+        row = self._db.execute(
+          f"SELECT {', '.join(_FIELDS)} FROM approvals WHERE id = ?", (approval_id,)
+        ).fetchone()
+        record = self._from_row(row) if row else None
+      return dict(record) if record else None
+
+  def assign_batch(self, ids: list, batch_id: str):
+    """
+    묶음 승인 메시지로 함께 보낸 요청들에 batch_id를 기록합니다.
+    """
+    with self._lock:
+      for approval_id in ids:
+        record = self._records.get(approval_id)
+        if record is not None:
+          record["batch_id"] = batch_id
+      if self._db is not None:
+        self._db.executemany("UPDATE approvals SET batch_id = ? WHERE id = ?", [(batch_id, i) for i in ids])
+
+  def batch(self, batch_id: str) -> list:
+    """
+    batch_id로 묶인 요청 레코드 목록 (생성 순).
+    """
+    with self._lock:
+      if self._db is not None:
+        rows = self._db.execute(
+          f"SELECT {', '.join(_FIELDS)} FROM approvals WHERE batch_id = ? ORDER BY created_at", (batch_id,)
+        ).fetchall()
+        return [self._from_row(row) for row in rows]
+      records = [dict(r) for r in self._records.values() if r["batch_id"] == batch_id]
+    return sorted(records, key=lambda r: r["created_at"])
+
+  def claim(self, approval_id: str, approver: str = None):
+    """
+    대기 중이고 만료되지 않은 요청을 executing으로 바꾸고 레코드를 반환합니다.
+    이미 처리됐거나 만료됐거나 없으면 (None, 현재 레코드 또는 None).
+    """
+    now = time.time()
+    with self._lock:
+      if self._db is not None:
+        # 프로세스 간에도 한 번만 성공하는 조건부 전이
+        cur = self._db.execute(
+          "UPDATE approvals SET status = ?, approver = ? WHERE id = ? AND status = ? AND expires_at > ?",
+          (EXECUTING, approver, approval_id, PENDING, now)
+        )
+        claimed = cur.rowcount == 1
+      else:
+        record = self._records.get(approval_id)
+        claimed = bool(record and record["status"] == PENDING and record["expires_at"] > now)
+      record = self._records.get(approval_id)
+      if claimed and record is not None:
+        record["status"] = EXECUTING
+        record["approver"] = approver
+    record = self.get(approval_id)
+    if claimed:
+      return record, None
+    if record and record["status"] == PENDING and record["expires_at"] <= now:
+      self._expire([approval_id])
+      record["status"] = EXPIRED
+    return None, record
+
+  def complete(self, approval_id: str, result, status: str = DONE):
+    with self._lock:
+      record = self._records.get(approval_id)
+      if record is not None:
+        record["status"] = status
+        record["result"] = result
+      if self._db is not None:
+        self._db.execute(
+          "UPDATE approvals SET status = ?, result = ? WHERE id = ?",
+          (status, json.dumps(result, ensure_ascii=False, default=str), approval_id)
+        )
+
+  def _expire(self, ids: list):
+    with self._lock:
+      for approval_id in ids:
+        record = self._records.get(approval_id)
+        if record is not None and record["status"] == PENDING:
+          record["status"] = EXPIRED
+
+  def sweep(self, now: float = None) -> int:
+    """
+    만료된 대기 요청을 expired로 바꾸고, 보관 기간이 지난 기록을 삭제합니다.
+    """
+    now = now or time.time()
+    cutoff = now - self._retention
+    with self._lock:
+      expired = [r["id"] for r in self._records.values() if r["status"] == PENDING and r["expires_at"] <= now]
+      for approval_id in expired:
+        self._records[approval_id]["status"] = EXPIRED
+      # 메모리에는 아직 결정되지 않은 요청만 유지 (완료 기록은 DB에서 조회)
+      keep_done = self._db is None
+      for approval_id in [k for k, r in self._records.items()
+                          if r["status"] != PENDING and (not keep_done or r["expires_at"] < cutoff)]:
+        del self._records[approval_id]
+      if self._db is not None:
+        cur = self._db.execute(
+          "UPDATE approvals SET status = ? WHERE status = ? AND expires_at <= ?", (EXPIRED, PENDING, now)
+        )
+        self._db.execute("DELETE FROM approvals WHERE status != ? AND expires_at < ?", (PENDING, cutoff))
+        return cur.rowcount
+    return len(expired)
+
+  def _run(self):
+    while not self._stop.wait(APPROVAL_SWEEP_INTERVAL):
+      try:
+        self.sweep()
+      except Exception as e:
+        logger.warning("approval sweep failed: %s", e)
+
+  def _ensure_sweeper(self):
+    if self._thread and self._thread.is_alive():
+      return
+    with self._lock:
+      if self._thread and self._thread.is_alive():
+        return
+      self._thread = threading.Thread(target=self._run, name="approval-sweeper", daemon=True)
+      self._thread.start()
+
+  def pending(self) -> list:
+    now = time.time()
+    with self._lock:
+      return [dict(r) for r in self._records.values() if r["status"] == PENDING and r["expires_at"] > now]
+
+
+approval_store = ApprovalStore()
+
+
+def execute_approved(approval_id: str, actions: dict, approver: str = None) -> dict:
+  """
+  승인된 요청을 정확히 한 번 실행합니다.
+  actions: {action 이름: 실행 함수}. 이미 처리된 요청은 이전 결과를 그대로 반환합니다.
+  """
+  record, existing = approval_store.claim(approval_id, approver)
+  if record is None:
+    if existing is None:
+      return {"status": "error", "message": f"승인 요청을 찾을 수 없습니다: {approval_id}"}
+    if existing["status"] == EXPIRED:
+      return {"status": "error", "message": "승인 요청이 만료되었습니다", "approval_id": approval_id}
+    return {"status": "already_processed", "approval_id": approval_id,
+            "approval_status": existing["status"], "result": existing["result"]}
+
+  func = actions.get(record["action"])
+  if func is None:
+    result = {"status": "error", "message": f"알 수 없는 작업: {record['action']}"}
+    approval_store.complete(approval_id, result, FAILED)
+    return result
+  try:
+    result = func(*record["args"], **record["kwargs"])
+  except Exception as e:
+    result = {"status": "error", "message": str(e)}
+  failed = isinstance(result, dict) and result.get("status") == "error"
+  approval_store.complete(approval_id, result, FAILED if failed else DONE)
+  return result
@@ -1,18 +1,22 @@
 # mcp/workflows/slack_approval.py
 from dotenv import load_dotenv
 import os
-import requests
 import datetime
 
+from utils.logger import audit_log
+from workflows.slack_delivery import delivery
+
 load_dotenv()
 
 SLACK_WEBHOOK_URL = os.getenv("SLACK_WEBHOOK_URL")
 
-def send_approval_request_with_button(user, action, impact, resource_type, resource_name, namespace="default"):
+def send_approval_request_with_button(user, action, impact, resource_type, resource_name, namespace="default",
+                                      approval_id=None):
   """
   resource_type: pod, deployment, ec2 등
   resource_name: 리소스 이름 또는 인스턴스 ID
   namespace: 네임스페이스(기본값 default)
+  approval_id: 승인 대기 저장소의 id (버튼 값으로 id만 전달, 콜백은 저장소의 대기 요청만 실행)
   """
   current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
   
@@ -92,7 +96,7 @@ def send_approval_request_with_button(user, action, impact, resource_type, resou
               "emoji": True
             },
             "style": "primary",
-            "value": f"{resource_type}|{resource_name}|{namespace}|{action}",
+            "value": approval_id,
             "confirm": {
               "title": {
                 "type": "plain_text",
@@ -116,15 +120,14 @@ def send_approval_request_with_button(user, action, impact, resource_type, resou
       }
     ]
   }
-  requests.post(SLACK_WEBHOOK_URL, json=message)
+  delivery.send(message)
 
-def send_action_log(user, action, status):
+def send_action_log(user, action, status, **fields):
   log_message = f"{datetime.datetime.now()} | {user} | {action} | {status}"
-  # 파일 또는 DB에 로그 저장
-  with open("action_log.txt", "a") as f:
-    f.write(log_message + "\n")
-  # Slack 알림도 보낼 수 있음
-  requests.post(SLACK_WEBHOOK_URL, json={"text": f"[작업 로그] {log_message}"})
+  # 감사 로그는 writer 스레드가 JSON Lines로 기록
+  audit_log(user, action, status, **fields)
+  # Slack 알림은 큐에 넣고 바로 반환 (짧은 시간 안의 로그는 한 메시지로 묶여 전송)
+  delivery.log_line(log_message)
 
 def send_result_notification(action, admin):
   message = {
@@ -138,4 +141,123 @@ def send_result_notification(action, admin):
       }
     ]
   }
-  requests.post(SLACK_WEBHOOK_URL, json=message)
\ No newline at end of file
+  delivery.send(message)
+
+def send_batch_approval_request(user, batch_id, items):
+  """
+  여러 승인 요청을 한 메시지로 보냅니다. 관리자는 전체 승인 또는 체크한 항목만 승인할 수 있습니다.
+  items: [{"approval_id", "action", "impact", "resource_type", "resource_name", "namespace"}, ...]
+  """
+  current_time = datetime.datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+  lines = [
+    f"*{i}. {item['action']}* `{item['resource_type']}/{item['resource_name']}` ({item['namespace']})"
+    for i, item in enumerate(items, 1)
+  ]
+  impacts = sorted({item["impact"] for item in items})
+
+  blocks = [
+    {
+      "type": "header",
+      "text": {
+        "type": "plain_text",
+        "text": f"🔔 묶음 승인 요청 ({len(items)}건)",
+        "emoji": True
+      }
+    },
+    {
+      "type": "section",
+      "fields": [
+        {
+          "type": "mrkdwn",
+          "text": f"*👤 요청자:*\n{user}"
+        },
+        {
+          "type": "mrkdwn",
+          "text": f"*⏰ 요청 시간:*\n{current_time}"
+        }
+      ]
+    },
+    {
+      "type": "divider"
+    }
+  ]
+  # 섹션 텍스트 길이 제한(3000자)을 넘지 않도록 10줄씩 나눔
+  for start in range(0, len(lines), 10):
+    blocks.append({
+      "type": "section",
+      "text": {
+        "type": "mrkdwn",
+        "text": "\n".join(lines[start:start + 10])
+      }
+    })
+  blocks.append({
+    "type": "context",
+    "elements": [{"type": "mrkdwn", "text": "⚠️ " + " / ".join(impacts)}]
+  })
+  # 체크박스 요소 하나에 옵션은 최대 10개
+  blocks.append({
+    "type": "actions",
+    "block_id": "batch_select",
+    "elements": [
+      {
+        "type": "checkboxes",
+        "action_id": f"select_{start}",
+        "options": [
+          {
+            "text": {
+              "type": "plain_text",
+              "text": f"{i}. {item['action']}: {item['resource_name']}"[:75]
+            },
+            "value": item["approval_id"]
+          }
+          for i, item in enumerate(items[start:start + 10], start + 1)
+        ]
+      }
+      for start in range(0, len(items), 10)
+    ]
+  })
+  blocks.append({
+    "type": "actions",
+    "elements": [
+      {
+        "type": "button",
+        "action_id": "approve_all",
+        "text": {
+          "type": "plain_text",
+          "text": f"✅ 전체 승인 ({len(items)}건)",
+          "emoji": True
+        },
+        "style": "primary",
+        "value": f"batch:{batch_id}:all",
+        "confirm": {
+          "title": {
+            "type": "plain_text",
+            "text": "전체 승인 확인"
+          },
+          "text": {
+            "type": "plain_text",
+            "text": f"{len(items)}건의 작업을 모두 승인하시겠습니까?"
+          },
+          "confirm": {
+            "type": "plain_text",
+            "text": "승인"
+          },
+          "deny": {
+            "type": "plain_text",
+            "text": "취소"
+          }
+        }
+      },
+      {
+        "type": "button",
+        "action_id": "approve_selected",
+        "text": {
+          "type": "plain_text",
+          "text": "☑️ 선택 항목 승인",
+          "emoji": True
+        },
+        "value": f"batch:{batch_id}:selected"
+      }
+    ]
+  })
+  delivery.send({"blocks": blocks})
@@ -0,0 +1,226 @@
+# mcp/workflows/slack_delivery.py
+"""
+Slack 웹훅 비동기 전송 큐.
+
+도구 호출은 메시지를 큐에 넣고 바로 반환하며, 백그라운드 스레드 하나가
+커넥션 풀을 재사용하는 requests.Session(타임아웃 적용)으로 전송합니다.
+작업 로그 줄은 SLACK_COALESCE_WINDOW초 동안 모아 한 메시지로 보내고,
+429/5xx 응답이나 네트워크 오류는 Retry-After를 존중하며 지수 백오프로 재시도합니다.
+"""
+import atexit
+import logging
+import os
+import queue
+import threading
+import time
+from collections import deque
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils.metrics import observe_upstream
+from utils.tracing import span, traceparent
+
+logger = logging.getLogger(__name__)
+
+SLACK_QUEUE_MAXSIZE = int(os.getenv("SLACK_QUEUE_MAXSIZE", "1000"))
+SLACK_CONNECT_TIMEOUT = float(os.getenv("SLACK_CONNECT_TIMEOUT", "3"))
+SLACK_READ_TIMEOUT = float(os.getenv("SLACK_READ_TIMEOUT", "10"))
+SLACK_COALESCE_WINDOW = float(os.getenv("SLACK_COALESCE_WINDOW", "2"))
+SLACK_BATCH_MAX_LINES = int(os.getenv("SLACK_BATCH_MAX_LINES", "50"))
+SLACK_MAX_RETRIES = int(os.getenv("SLACK_MAX_RETRIES", "5"))
+_MAX_BACKOFF = 30.0
+_LATENCY_SAMPLES = 512
+
+_MESSAGE = "message"
+_LOG_LINE = "log"
+
+
+class SlackDelivery:
+  """
+  단일 워커 스레드 기반 웹훅 전송 큐.
+  """
+
+  def __init__(self, url_getter, maxsize: int = SLACK_QUEUE_MAXSIZE,
+               window: float = SLACK_COALESCE_WINDOW, max_lines: int = SLACK_BATCH_MAX_LINES):
+    self._url_getter = url_getter
+    self._queue = queue.Queue(maxsize=maxsize)
+    self._window = window
+    self._max_lines = max_lines
+    self._lock = threading.Lock()
+    self._stop = threading.Event()
+    self._thread = None
+    self._session = None
+    self._latencies = deque(maxlen=_LATENCY_SAMPLES)
+    self.enqueued = 0
+    self.sent = 0
+    self.failed = 0
+    self.dropped = 0
+    self.retries = 0
+    self.batched_lines = 0
+    self.last_error = None
+
+  def _http(self) -> requests.Session:
+    if self._session is None:
+      session = requests.Session()
+      session.mount("https://", HTTPAdapter(pool_connections=1, pool_maxsize=2))
+      self._session = session
+    return self._session
+
+  def _ensure_started(self):
+    if self._thread and self._thread.is_alive():
+      return
+    with self._lock:
+      if self._thread and self._thread.is_alive():
+        return
+      self._stop.clear()
+      self._thread = threading.Thread(target=self._run, name="slack-delivery", daemon=True)
+      self._thread.start()
+
+  def _put(self, kind: str, payload) -> bool:
+    self._ensure_started()
+    try:
+      # 워커 스레드에서 보내므로 호출한 쪽의 trace를 함께 넘김
+      self._queue.put_nowait((kind, payload, time.monotonic(), traceparent()))
+    except queue.Full:
+      self.dropped += 1
+      logger.warning("slack delivery queue full, message dropped")
+      return False
+    self.enqueued += 1
+    return True
+
+  def send(self, message: dict) -> bool:
+    """
+    메시지(블록 등 웹훅 JSON)를 큐에 넣습니다. 큐가 가득 차면 버리고 False.
+    """
+    return self._put(_MESSAGE, message)
+
+  def log_line(self, line: str) -> bool:
+    """
+    작업 로그 한 줄을 큐에 넣습니다. 짧은 시간 안의 줄들은 한 메시지로 합쳐 전송됩니다.
+    """
+    return self._put(_LOG_LINE, line)
+
+  def _retry_delay(self, attempt: int, resp) -> float:
+    retry_after = resp.headers.get("Retry-After") if resp is not None else None
+    if retry_after:
+      try:
+        return min(float(retry_after), _MAX_BACKOFF)
+      except ValueError:
+        pass
+    return min(0.5 * (2 ** attempt), _MAX_BACKOFF)
+
+  def _post(self, payload: dict) -> bool:
+    url = self._url_getter()
+    if not url:
+      self.last_error = "SLACK_WEBHOOK_URL is not set"
+      return False
+    for attempt in range(SLACK_MAX_RETRIES + 1):
+      resp = None
+      started = time.perf_counter()
+      try:
+        resp = self._http().post(url, json=payload, timeout=(SLACK_CONNECT_TIMEOUT, SLACK_READ_TIMEOUT))
+        observe_upstream("slack", "webhook", time.perf_counter() - started, resp.status_code >= 400)
+        if resp.status_code < 400:
+          return True
+        self.last_error = f"HTTP {resp.status_code}: {resp.text[:200]}"
+        if resp.status_code != 429 and resp.status_code < 500:
+          return False
+      except requests.RequestException as e:
+        observe_upstream("slack", "webhook", time.perf_counter() - started, True)
+        self.last_error = str(e)
+      if attempt == SLACK_MAX_RETRIES:
+        break
+      self.retries += 1
+      if self._stop.wait(self._retry_delay(attempt, resp)):
+        break
+    return False
+
+  def _deliver(self, payload: dict, enqueued_at: list, trace_context: str = None):
+    with span("slack webhook", kind="client", parent=trace_context, messages=len(enqueued_at)) as s:
+      delivered = self._post(payload)
+      if not delivered:
+        s.set_error(self.last_error)
+    if delivered:
+      self.sent += 1
+      now = time.monotonic()
+      self._latencies.extend(now - t for t in enqueued_at)
+    else:
+      self.failed += 1
+      logger.warning("slack delivery failed: %s", self.last_error)
+
+  def _flush_lines(self, lines: list):
+    if not lines:
+      return
+    text = "[작업 로그] " + lines[0][0] if len(lines) == 1 else "[작업 로그]\n" + "\n".join(l for l, _, _ in lines)
+    self.batched_lines += len(lines)
+    self._deliver({"text": text}, [t for _, t, _ in lines], lines[0][2])
+    lines.clear()
+
+  def _run(self):
+    lines = []
+    deadline = None
+    while True:
+      timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+      try:
+        kind, payload, enqueued_at, trace_context = self._queue.get(timeout=timeout)
+      except queue.Empty:
+        self._flush_lines(lines)
+        deadline = None
+        continue
+      if kind is None:
+        self._flush_lines(lines)
+        self._queue.task_done()
+        return
+      if kind == _LOG_LINE:
+        lines.append((payload, enqueued_at, trace_context))
+        if deadline is None:
+          deadline = time.monotonic() + self._window
+        if len(lines) >= self._max_lines:
+          self._flush_lines(lines)
+          deadline = None
+      else:
+        self._deliver(payload, [enqueued_at], trace_context)
+      self._queue.task_done()
+
+  def stop(self, timeout: float = 5.0):
+    """
+    남은 메시지를 보내고 워커를 종료합니다 (timeout 초까지 대기).
+    """
+    if not (self._thread and self._thread.is_alive()):
+      return
+    try:
+      self._queue.put((None, None, time.monotonic(), None), timeout=timeout)
+    except queue.Full:
+      pass
+    self._thread.join(timeout)
+    # 재시도 대기 중이면 중단
+    self._stop.set()
+
+  def stats(self) -> dict:
+    latencies = sorted(self._latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))] if latencies else 0.0
+    return {
+      "depth": self._queue.qsize(),
+      "enqueued": self.enqueued,
+      "sent": self.sent,
+      "failed": self.failed,
+      "dropped": self.dropped,
+      "retries": self.retries,
+      "batched_lines": self.batched_lines,
+      "latency_avg_ms": round(sum(latencies) / len(latencies) * 1000, 1) if latencies else 0.0,
+      "latency_p95_ms": round(p95 * 1000, 1),
+      "latency_max_ms": round(latencies[-1] * 1000, 1) if latencies else 0.0,
+      "last_error": self.last_error,
+    }
+
+
+delivery = SlackDelivery(lambda: os.getenv("SLACK_WEBHOOK_URL"))
+atexit.register(delivery.stop)
+
+
+def delivery_stats() -> dict:
+  """
+  Slack 전송 큐 깊이, 처리량, 재시도 수, 지연 시간(큐 적재 -> 전송 완료)을 반환합니다.
+  """
+  return delivery.stats()
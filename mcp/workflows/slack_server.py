@@ -1,41 +1,169 @@
 # mcp/workflows/slack_server.py
+"""
+Slack 승인 버튼 콜백 (ASGI 앱).
 
-from flask import Flask, request, jsonify
-from tools.kubernetes.pods import delete_pod
-from tools.kubernetes.deployments import delete_deployment
-from tools.aws.ec2 import stop_ec2_instance
-from workflows.slack_approval import send_approval_request_with_button, send_result_notification
+MCP SSE 포트(8080)와 분리된 리스너(SLACK_CALLBACK_PORT, 기본 8081)에서 POST /admin-approve를 받습니다.
+MCP 클라이언트는 도구 응답으로 approval_id를 받으므로, 콜백이 같은 포트에 있으면 스스로 승인할 수 있습니다.
+모든 요청은 SLACK_SIGNING_SECRET으로 X-Slack-Signature를 검증한 뒤에만 payload를 읽으며,
+시크릿이 없으면 콜백을 거부합니다. 버튼 값은 저장소의 대기(PENDING) 승인 id 또는 묶음 id만 받습니다.
+요청은 저장소 조회만 하고 바로 응답해 Slack의 3초 응답 기한을 지키며,
+승인된 작업은 같은 프로세스의 도구 스레드 풀에서 실행되므로 MCP 도구와 같은
+Kubernetes/AWS 클라이언트(커넥션 풀)를 그대로 사용합니다.
+"""
+import hashlib
+import hmac
 import json
+import logging
+import os
+import time
+from urllib.parse import parse_qs
 
-app = Flask(__name__)
-
-@app.route("/admin-approve", methods=["POST"])
-def admin_approve():
-  # 슬랙은 payload를 form-urlencoded로 보냄	
-  if request.content_type and request.content_type.startswith("application/x-www-form-urlencoded"):
-    payload = json.loads(request.form["payload"])
-  else:
-    payload = request.json
-
-  # 슬랙에서 온 버튼 value 파싱
-  value = payload["actions"][0]["value"]  # 예: "pod|nginx-test|default|파드 삭제"
-  resource_type, resource_name, namespace, action = value.split("|")
-  result = None
-
-  if resource_type == "pod":
-    result = delete_pod(namespace=namespace, pod_name=resource_name)
-  elif resource_type == "deployment":
-    result = delete_deployment(namespace=namespace, name=resource_name)
-  elif resource_type == "ec2":
-    result = stop_ec2_instance(instance_id=resource_name)
-  else:
-    result = {"status": "error", "message": "알 수 없는 리소스 타입"}
-
-  # 승인 결과 알림 전송
-  if result and result.get("status") == "success":
-    send_result_notification(action, payload["user"]["username"])
-
-  return jsonify(result)
-
-if __name__ == "__main__":
-  app.run(host="0.0.0.0", port=8081)
\ No newline at end of file
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from utils.aio import submit_background
+from utils.logger import audit_log
+from utils.tracing import span
+from workflows.approval_store import PENDING, approval_store, execute_approved
+from workflows.slack_approval import send_result_notification
+
+logger = logging.getLogger(__name__)
+
+SLACK_SIGNING_SECRET = os.getenv("SLACK_SIGNING_SECRET", "")
+SLACK_CALLBACK_PORT = int(os.getenv("SLACK_CALLBACK_PORT", "8081"))
+# 재전송 공격 방지: 요청 타임스탬프 허용 오차(초, Slack 권장값)
+_MAX_SKEW = 300
+
+
+def verify_signature(body: bytes, timestamp: str, signature: str, secret: str = None, now: float = None):
+  """
+  Slack 요청 서명(v0=HMAC-SHA256(secret, "v0:<timestamp>:<body>"))을 검증합니다.
+  통과하면 None, 실패하면 사유 문자열을 반환합니다.
+  """
+  secret = SLACK_SIGNING_SECRET if secret is None else secret
+  if not secret:
+    return "SLACK_SIGNING_SECRET이 설정되지 않았습니다"
+  if not timestamp or not signature:
+    return "서명 헤더가 없습니다"
+  try:
+    skew = abs((time.time() if now is None else now) - int(timestamp))
+  except ValueError:
+    return "잘못된 타임스탬프"
+  if skew > _MAX_SKEW:
+    return "만료된 요청"
+  base = b"v0:" + timestamp.encode("ascii", "replace") + b":" + body
+  expected = "v0=" + hmac.new(secret.encode("utf-8"), base, hashlib.sha256).hexdigest()
+  if not hmac.compare_digest(expected, signature):
+    return "서명 불일치"
+  return None
+
+
+def _status(result):
+  return result.get("status") if isinstance(result, dict) else None
+
+
+def _run_approved(approval_id: str, actions: dict, admin: str):
+  record = approval_store.get(approval_id) or {}
+  # 승인을 요청한 도구 호출의 trace를 이어서 실행 (요청 ~ 승인 ~ 실행이 한 trace)
+  with span("approval.execute", parent=record.get("trace_context"),
+            **{"approval.id": approval_id, "approval.action": record.get("action") or "", "approval.approver": admin}) as s:
+    result = execute_approved(approval_id, actions, approver=admin)
+    status = _status(result)
+    s.set_attribute("approval.result", str(status))
+  record = approval_store.get(approval_id) or record
+  action = record.get("action_name") or record.get("action") or "승인 요청"
+  if status != "already_processed":
+    audit_log(admin, action, "승인",
+              resource_type=record.get("resource_type"), resource_name=record.get("resource_name"),
+              namespace=record.get("namespace"), approval_id=approval_id, result_status=status)
+  if status == "success":
+    send_result_notification(action, admin)
+
+
+def _payload(request: Request, body: bytes) -> dict:
+  # 슬랙은 payload를 form-urlencoded로 보냄 (python-multipart 없이 직접 파싱)
+  if request.headers.get("content-type", "").startswith("application/x-www-form-urlencoded"):
+    return json.loads(parse_qs(body.decode("utf-8"))["payload"][0])
+  return json.loads(body or b"{}")
+
+
+def _selected_ids(payload: dict) -> set:
+  selected = set()
+  for block in (payload.get("state") or {}).get("values", {}).values():
+    for element in block.values():
+      if element.get("type") == "checkboxes":
+        selected.update(option["value"] for option in element.get("selected_options") or [])
+  return selected
+
+
+def _approve_batch(value: str, payload: dict, actions: dict, admin: str):
+  """
+  "batch:<batch_id>:all|selected" 버튼: 묶음의 대기 요청(또는 체크한 요청)을 병렬로 실행합니다.
+  """
+  _, batch_id, mode = value.split(":", 2)
+  if mode not in ("all", "selected"):
+    return JSONResponse({"status": "error", "message": f"잘못된 묶음 버튼 값: {value}"}, status_code=400)
+  records = [r for r in approval_store.batch(batch_id) if r["status"] == PENDING]
+  if mode == "selected":
+    selected = _selected_ids(payload)
+    if not selected:
+      return JSONResponse({"status": "error", "message": "승인할 항목을 선택하세요"})
+    records = [r for r in records if r["id"] in selected]
+  if not records:
+    return JSONResponse({"status": "already_processed", "batch_id": batch_id})
+  # 항목별로 도구 스레드 풀에 넘겨 동시에 실행 (각 항목의 중복 실행 방지는 claim이 담당)
+  for record in records:
+    submit_background(_run_approved, record["id"], actions, admin)
+  return JSONResponse({"status": "accepted", "batch_id": batch_id,
+                       "approval_ids": [r["id"] for r in records]})
+
+
+def approval_endpoint(actions: dict):
+  """
+  actions: {action 이름: 실행 함수} (main.py의 approval_required가 등록한 함수)
+  """
+  async def admin_approve(request: Request):
+    # 서명 검증 전에는 payload를 해석하지 않음
+    body = await request.body()
+    error = verify_signature(body, request.headers.get("x-slack-request-timestamp"),
+                             request.headers.get("x-slack-signature"))
+    if error:
+      logger.warning("rejected approval callback from %s: %s", request.client.host if request.client else "?", error)
+      return JSONResponse({"status": "error", "message": f"인증 실패: {error}"}, status_code=401)
+    try:
+      payload = _payload(request, body)
+      clicked = payload["actions"][0]
+      admin = payload["user"]["username"]
+    except (KeyError, IndexError, ValueError) as e:
+      return JSONResponse({"status": "error", "message": f"잘못된 요청: {e}"}, status_code=400)
+    # 묶음 메시지의 체크박스 선택도 콜백으로 오지만 버튼을 누를 때까지는 무시
+    if "value" not in clicked:
+      return JSONResponse({"status": "ignored"})
+    value = clicked["value"]
+
+    if value.startswith("batch:"):
+      return _approve_batch(value, payload, actions, admin)
+
+    # 버튼 값은 저장소의 승인 id만 받음 (리소스를 직접 담던 이전 "pod|이름|ns|작업" 형식은 거부)
+    # 저장소 조회만 하고 즉시 응답, 실행은 백그라운드에서 (중복 실행 방지는 claim이 담당)
+    record = approval_store.get(value)
+    if record is None:
+      return JSONResponse({"status": "error", "message": f"승인 요청을 찾을 수 없습니다: {value}"})
+    if record["status"] != PENDING:
+      return JSONResponse({"status": "already_processed", "approval_id": value,
+                           "approval_status": record["status"]})
+    submit_background(_run_approved, value, actions, admin)
+    return JSONResponse({"status": "accepted", "approval_id": value, "action": record.get("action_name")})
+
+  return admin_approve
+
+
+def approval_app(actions: dict, path: str = "/admin-approve") -> Starlette:
+  """
+  승인 콜백만 제공하는 ASGI 앱. MCP SSE 앱과 다른 포트(SLACK_CALLBACK_PORT)로 실행합니다.
+  """
+  if not SLACK_SIGNING_SECRET:
+    logger.warning("SLACK_SIGNING_SECRET is not set; all approval callbacks will be rejected")
+  return Starlette(routes=[Route(path, approval_endpoint(actions), methods=["POST"])])